@@ -0,0 +1,369 @@
+"""Headless benchmarks for Cat Companion's hot paths
+
+Runs the companion under Qt's offscreen platform in a throwaway working
+directory, writes the results as JSON and compares them with a stored
+baseline. Typical use:
+
+    python benchmarks/bench_companion.py                    # run and compare
+    python benchmarks/bench_companion.py --update-baseline  # accept these numbers
+"""
+import time
+
+PROCESS_STARTED = time.perf_counter()  # Cold start is measured from here
+
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "bench_output.json")
+ASSETS = ("cat.gif", "notification.mp3", "purr.mp3")
+
+# Metric name -> True when a bigger number is better
+METRICS = {
+    "cold_start_ms": False,
+    "idle_cpu_percent": False,
+    "idle_wakeups_per_second": False,
+    "idle_particle_wakeups": False,
+    "particle_storm_frame_p50_ms": False,
+    "particle_storm_frame_p95_ms": False,
+    "particle_storm_repainted_kpixels_per_frame": False,
+    "drag_resize_per_second": True,
+    "record_stats_p50_us": False,
+    "record_stats_p95_us": False,
+    "record_stats_on_disk_p95_us": False,
+    "stats_flush_ms": False,
+    "rss_after_simulated_use_mb": False,
+}
+
+def prepare_environment(workdir):
+    """Offscreen Qt, stubbed Windows APIs and a scratch copy of the app's assets"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    # The media keys go through win32api; record them instead of sending them
+    try:
+        import win32api  # noqa: F401
+        import win32con  # noqa: F401
+    except ImportError:
+        win32api = types.ModuleType("win32api")
+        win32api.key_events = []
+        win32api.keybd_event = lambda *args: win32api.key_events.append(args)
+        win32con = types.ModuleType("win32con")
+        win32con.KEYEVENTF_KEYUP = 0x0002
+        sys.modules["win32api"] = win32api
+        sys.modules["win32con"] = win32con
+
+    # Settings, stats and caches all live next to the working directory
+    for asset in ASSETS:
+        source = os.path.join(REPO_ROOT, asset)
+        if os.path.exists(source):
+            shutil.copy(source, workdir)
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+
+def percentile(samples, fraction):
+    # Nearest-rank, same as the in-app frame profiler
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))]
+
+def current_rss_mb():
+    # Resident set size of this process, where the platform lets us see it
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return None
+
+def run_event_loop(seconds):
+    """Block in a real event loop, so the measurement adds no polling wakeups of its own"""
+    from PyQt6.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+def warm_frame_cache(app, window, timeout=60.0):
+    """Play the GIF through at the window's size until it is served from the mapped disk cache"""
+    gif = window.gif
+    size, device_pixel_ratio = window.cat_label.size(), window.devicePixelRatioF()
+    key = (size.width(), size.height(), device_pixel_ratio)
+    # The first loop learns the frame count; frames go to disk as they are rendered once it is known
+    for _ in range(2):
+        index = 0
+        while gif.mapped_frames(key) is None and gif.has_frame(index):
+            gif.scaled_frame(index, size, device_pixel_ratio)
+            index += 1
+    deadline = time.perf_counter() + timeout
+    while gif.mapped.get(key) is None and time.perf_counter() < deadline:
+        app.processEvents()
+    return gif.mapped.get(key) is not None
+
+def wait_for_first_paint(app, window, timeout=10.0):
+    """Spin the event loop until the companion's window has painted once"""
+    from PyQt6.QtCore import QEvent, QObject
+
+    class PaintWatcher(QObject):
+        painted = False
+
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Type.Paint:
+                self.painted = True
+            return False
+
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+    window.show()
+    deadline = time.perf_counter() + timeout
+    while not watcher.painted and time.perf_counter() < deadline:
+        app.processEvents()
+    window.removeEventFilter(watcher)
+    return watcher.painted
+
+def cold_start_child():
+    """Run in a fresh interpreter: process start to first painted frame"""
+    workdir = tempfile.mkdtemp(prefix="cat-bench-")
+    try:
+        prepare_environment(workdir)
+        from PyQt6.QtWidgets import QApplication
+        import cat_companion
+
+        app = QApplication(sys.argv[:1])
+        window = cat_companion.CatCompanion()
+        painted = wait_for_first_paint(app, window)
+        elapsed_ms = (time.perf_counter() - PROCESS_STARTED) * 1000
+        window.stats_writer.shutdown()
+        print(json.dumps({"cold_start_ms": elapsed_ms if painted else None}))
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def bench_cold_start(runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--cold-start-child"],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if result["cold_start_ms"] is not None:
+            samples.append(result["cold_start_ms"])
+    return {"cold_start_ms": statistics.median(samples) if samples else None}
+
+def bench_idle(app, window, cat_companion, seconds):
+    # Steady state: the GIF plays from the frame cache, as it does from the second launch on
+    if not warm_frame_cache(app, window):
+        print("Frame cache did not warm up; the idle numbers include decoding")
+    run_event_loop(1.0)
+    cat_companion.instrumentation.set_enabled(True)
+    particle_wakeups = window.repaint_summary()["particle_wakeups"]
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    run_event_loop(seconds)
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    wakeups = cat_companion.instrumentation.wakeups_per_second()
+    cat_companion.instrumentation.set_enabled(False)
+    return {
+        "idle_cpu_percent": cpu / wall * 100,
+        "idle_wakeups_per_second": wakeups,
+        "idle_particle_wakeups": window.repaint_summary()["particle_wakeups"] - particle_wakeups,
+    }
+
+def bench_particle_storm(app, window, frames):
+    # Keep the particle store at its budget and time each simulation step plus paint
+    from PyQt6.QtCore import QPoint
+    center = window.cat_label.geometry().center()
+    samples = []
+    repainted_before = window.repaint_summary()["repainted_pixels_total"]
+    for frame in range(frames):
+        for offset in range(0, 40, 5):
+            window.create_heart_particles(QPoint(center.x() + offset - 20, center.y()))
+        started = time.perf_counter()
+        window.update_particles()
+        window.repaint()
+        samples.append((time.perf_counter() - started) * 1000)
+    repainted = window.repaint_summary()["repainted_pixels_total"] - repainted_before
+    window.click_particles.clear()
+    window.particle_timer.stop()
+    app.processEvents()
+    return {
+        "particle_storm_frame_p50_ms": percentile(samples, 0.50),
+        "particle_storm_frame_p95_ms": percentile(samples, 0.95),
+        "particle_storm_repainted_kpixels_per_frame": repainted / frames / 1000,
+    }
+
+def bench_drag_resize(app, window, steps):
+    # Sweep the window through a drag the way the resize handle does: fast frames, then one smooth one
+    from PyQt6.QtCore import QSize
+    start_width, start_height = window.width(), window.height()
+    window.is_resizing = True
+    started = time.perf_counter()
+    for step in range(steps):
+        grow = step % 100
+        window.pending_resize = QSize(start_width + grow, start_height + grow)
+        window.apply_pending_resize()
+        app.processEvents()
+    elapsed = time.perf_counter() - started
+    window.is_resizing = False
+    window.resize(start_width, start_height)
+    window.show_gif_frame()
+    app.processEvents()
+    return {"drag_resize_per_second": steps / elapsed}
+
+def bench_record_stats(app, window, calls):
+    # A logged drink as the GUI thread sees it, then until its journal append is on disk
+    samples = []
+    on_disk = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        window.increment_water_count()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+        window.stats_writer.pending.result()
+        on_disk.append((time.perf_counter() - started) * 1_000_000)
+    started = time.perf_counter()
+    window.stats_writer.flush()
+    flush_ms = (time.perf_counter() - started) * 1000
+    return {
+        "record_stats_p50_us": percentile(samples, 0.50),
+        "record_stats_p95_us": percentile(samples, 0.95),
+        "record_stats_on_disk_p95_us": percentile(on_disk, 0.95),
+        "stats_flush_ms": flush_ms,
+    }
+
+def bench_simulated_use(app, window, hours):
+    """Replay a day-in-the-life event mix and report the resident set afterwards"""
+    from PyQt6.QtCore import QPoint
+    center = window.cat_label.geometry().center()
+    for hour in range(hours):
+        # Two reminders, a handful of media keys and pets per simulated hour
+        for _ in range(2):
+            window.show_reminder()
+        for action in (window.media_next, window.media_play_pause, window.media_volume_up):
+            action()
+        for _ in range(5):
+            window.create_heart_particles(center + QPoint(hour % 20, 0))
+            window.show_custom_notification(f"😺 pet {hour}")
+        while window.click_particles:
+            window.update_particles()
+        app.processEvents()
+    window.stats_writer.flush()
+    run_event_loop(0.5)
+    return {"rss_after_simulated_use_mb": current_rss_mb()}
+
+def run_in_process(args):
+    workdir = tempfile.mkdtemp(prefix="cat-bench-")
+    try:
+        prepare_environment(workdir)
+        from PyQt6.QtWidgets import QApplication
+        import cat_companion
+
+        app = QApplication(sys.argv[:1])
+        window = cat_companion.CatCompanion()
+        wait_for_first_paint(app, window)
+
+        # Sounds would only add device noise to the numbers
+        window.media_player.play = lambda: None
+        window.purr_player.play = lambda: None
+
+        results = {}
+        results.update(bench_idle(app, window, cat_companion, args.idle_seconds))
+        results.update(bench_particle_storm(app, window, args.storm_frames))
+        results.update(bench_drag_resize(app, window, args.resize_steps))
+        results.update(bench_record_stats(app, window, args.record_calls))
+        results.update(bench_simulated_use(app, window, args.simulated_hours))
+
+        window.stats_writer.shutdown()
+        window.close()
+        return results
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def compare(results, baseline, tolerance):
+    """Print each metric against the baseline; returns the names that regressed"""
+    regressions = []
+    print(f"{'metric':<32}{'current':>12}{'baseline':>12}{'change':>10}")
+    for name, higher_is_better in METRICS.items():
+        current = results.get(name)
+        previous = baseline.get(name)
+        if current is None or not previous:
+            print(f"{name:<32}{_format(current):>12}{_format(previous):>12}{'-':>10}")
+            continue
+        change = (current - previous) / previous
+        worse = -change if higher_is_better else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<32}{_format(current):>12}{_format(previous):>12}{change:>+10.1%}{flag}")
+    return regressions
+
+def _format(value):
+    return "-" if value is None else f"{value:.2f}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write this run's results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="stored results to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="allowed slowdown before flagging, as a fraction")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit non-zero when a metric regressed")
+    parser.add_argument("--cold-start-runs", type=int, default=3)
+    parser.add_argument("--idle-seconds", type=float, default=10.0)
+    parser.add_argument("--storm-frames", type=int, default=300)
+    parser.add_argument("--resize-steps", type=int, default=500)
+    parser.add_argument("--record-calls", type=int, default=1000)
+    parser.add_argument("--simulated-hours", type=int, default=24)
+    parser.add_argument("--cold-start-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_start_child:
+        cold_start_child()
+        return 0
+
+    results = bench_cold_start(args.cold_start_runs)
+    results.update(run_in_process(args))
+    report = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated at {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to store one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,39 +1,69 @@
+import time
+
+STARTED = time.perf_counter()  # Startup phases are timed from here
+
 import sys
 import os
 import json
-import win32api
-import win32con
+import atexit
+import signal
+import socket
+import tempfile
+import base64
+import glob
+import hashlib
+import heapq
+import math
+import mmap
+import sqlite3
+import struct
 import random
+from array import array
+from collections import OrderedDict, deque
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from itertools import accumulate, compress, groupby, repeat
+from operator import add
+from PyQt6 import sip
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QLabel, QMenu, 
-                           QSystemTrayIcon, QWidget, QDialog, QVBoxLayout,
-                           QPushButton, QFileDialog, QLineEdit, QSpinBox,
-                           QFormLayout, QCheckBox, QColorDialog, QMessageBox,
-                           QHBoxLayout, QGroupBox)
-from PyQt6.QtCore import Qt, QTimer, QSize, QPropertyAnimation, QEasingCurve, QUrl, QPoint, QRectF, QTime, QPointF
-from PyQt6.QtGui import QIcon, QMovie, QAction, QColor, QPainter, QPainterPath, QPen, QBrush, QCursor, QShortcut, QKeySequence, QPixmap, QImage
-from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PyQt6.QtMultimediaWidgets import QVideoWidget
-
-class SettingsDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.parent = parent
-        self.setWindowTitle("Settings")
-        self.setMinimumWidth(400)
-        self.setMinimumHeight(600)  # Increased height for stats
-        
-        # Set pink theme for dialog
-        self.setStyleSheet(f"""
-            QDialog {{
+                           QSystemTrayIcon, QWidget, QPushButton, QHBoxLayout)
+from PyQt6.QtCore import Qt, QObject, QEvent, QSocketNotifier, pyqtSignal, QTimer, QAbstractAnimation, QSize, QPropertyAnimation, QVariantAnimation, QEasingCurve, QUrl, QPoint, QRect, QRectF, QTime, QDate, QDateTime, QPointF
+from PyQt6.QtGui import QIcon, QImageReader, QAction, QColor, QPainter, QPainterPath, QPen, QBrush, QCursor, QShortcut, QKeySequence, QPixmap, QImage, QFont, QFontMetrics, QStaticText, QTransform
+
+class Theme:
+    """The whole app's styling as one stylesheet, generated once per theme colour
+    and installed on the QApplication; widgets opt in through their object names"""
+    _compiled = {}
+
+    def __init__(self, color):
+        self.color = color
+        self.stylesheet = self.build(color)
+
+    @classmethod
+    def for_color(cls, color):
+        theme = cls._compiled.get(color)
+        if theme is None:
+            theme = cls._compiled[color] = cls(color)
+        return theme
+
+    def install(self, app):
+        app.setStyleSheet(self.stylesheet)
+
+    @staticmethod
+    def build(color):
+        return f"""
+            /* Settings dialog */
+            QDialog#settingsDialog {{
                 background-color: #FFF0F5;
             }}
-            QLabel {{
-                color: {parent.theme_color};
+            #settingsDialog QLabel {{
+                color: {color};
                 font-size: 12px;
                 font-weight: bold;
             }}
-            QPushButton {{
-                background-color: {parent.theme_color};
+            #settingsDialog QPushButton {{
+                background-color: {color};
                 color: white;
                 border-radius: 8px;
                 padding: 8px 16px;
@@ -41,403 +71,98 @@ class SettingsDialog(QDialog):
                 font-weight: bold;
                 min-width: 100px;
             }}
-            QPushButton:hover {{
+            #settingsDialog QPushButton:hover {{
                 background-color: #FF1493;
             }}
-            QLineEdit, QSpinBox {{
-                border: 2px solid {parent.theme_color};
+            #settingsDialog QPushButton#cancelButton {{
+                background-color: #FFB6C1;
+                color: white;
+            }}
+            #settingsDialog QPushButton#cancelButton:hover {{
+                background-color: #FF69B4;
+            }}
+            #settingsDialog QLineEdit, #settingsDialog QSpinBox {{
+                border: 2px solid {color};
                 border-radius: 8px;
                 padding: 6px;
                 background-color: white;
                 color: #333;
                 font-size: 12px;
             }}
-            QLineEdit:focus, QSpinBox:focus {{
+            #settingsDialog QLineEdit:focus, #settingsDialog QSpinBox:focus {{
                 border: 2px solid #FF1493;
             }}
-            QCheckBox {{
-                color: {parent.theme_color};
+            #settingsDialog QCheckBox {{
+                color: {color};
                 font-size: 12px;
                 font-weight: bold;
             }}
-            QCheckBox::indicator {{
+            #settingsDialog QCheckBox::indicator {{
                 width: 18px;
                 height: 18px;
-                border: 2px solid {parent.theme_color};
+                border: 2px solid {color};
                 border-radius: 4px;
             }}
-            QCheckBox::indicator:checked {{
-                background-color: {parent.theme_color};
+            #settingsDialog QCheckBox::indicator:checked {{
+                background-color: {color};
             }}
-            QSpinBox::up-button, QSpinBox::down-button {{
+            #settingsDialog QSpinBox::up-button, #settingsDialog QSpinBox::down-button {{
                 width: 20px;
                 border: none;
-                background-color: {parent.theme_color};
+                background-color: {color};
                 border-radius: 4px;
             }}
-            QSpinBox::up-button:hover, QSpinBox::down-button:hover {{
+            #settingsDialog QSpinBox::up-button:hover, #settingsDialog QSpinBox::down-button:hover {{
                 background-color: #FF1493;
             }}
-            QGroupBox {{
-                border: 2px solid {parent.theme_color};
+            #settingsDialog QGroupBox {{
+                border: 2px solid {color};
                 border-radius: 8px;
                 margin-top: 1em;
                 padding-top: 10px;
-                color: {parent.theme_color};
+                color: {color};
                 font-weight: bold;
             }}
-            QGroupBox::title {{
+            #settingsDialog QGroupBox::title {{
                 subcontrol-origin: margin;
                 left: 10px;
                 padding: 0 3px;
             }}
-        """)
-        
-        # Create main layout
-        main_layout = QVBoxLayout()
-        main_layout.setSpacing(20)
-        main_layout.setContentsMargins(20, 20, 20, 20)
-        
-        # Create form layout for settings
-        form_layout = QFormLayout()
-        form_layout.setSpacing(15)
-        form_layout.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
-        
-        # Add title
-        title_label = QLabel("Cat Companion Settings")
-        title_label.setStyleSheet(f"""
-            font-size: 18px;
-            font-weight: bold;
-            color: {parent.theme_color};
-            padding-bottom: 10px;
-        """)
-        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        main_layout.addWidget(title_label)
-        
-        # Create personalization group
-        personalization_group = QGroupBox("Personalization")
-        personalization_layout = QFormLayout()
-        
-        # Cat name
-        self.cat_name = QLineEdit()
-        self.cat_name.setText(parent.cat_name)
-        self.cat_name.setPlaceholderText("Enter your cat's name")
-        personalization_layout.addRow("Cat's Name:", self.cat_name)
-        
-        # Theme color
-        color_layout = QHBoxLayout()
-        self.theme_color_button = QPushButton()
-        self.theme_color_button.setFixedSize(30, 30)
-        self.theme_color = parent.theme_color
-        self.update_color_button()
-        self.theme_color_button.clicked.connect(self.choose_color)
-        color_layout.addWidget(self.theme_color_button)
-        personalization_layout.addRow("Theme Color:", color_layout)
-        
-        personalization_group.setLayout(personalization_layout)
-        main_layout.addWidget(personalization_group)
-        
-        # Create reminder group
-        reminder_group = QGroupBox("Reminders")
-        reminder_layout = QFormLayout()
-        
-        # Reminder interval
-        interval_layout = QHBoxLayout()
-        self.interval_spinbox = QSpinBox()
-        self.interval_spinbox.setRange(1, 240)
-        self.interval_spinbox.setValue(parent.reminder_interval // 60000)  # Convert ms to minutes
-        self.interval_spinbox.setSuffix(" minutes")
-        interval_layout.addWidget(self.interval_spinbox)
-        reminder_layout.addRow("Reminder Interval:", interval_layout)
-        
-        # Custom reminder message
-        self.reminder_message = QLineEdit()
-        self.reminder_message.setText(parent.reminder_message)
-        self.reminder_message.setPlaceholderText("Enter a custom reminder message")
-        reminder_layout.addRow("Custom Message:", self.reminder_message)
-        
-        reminder_group.setLayout(reminder_layout)
-        main_layout.addWidget(reminder_group)
-        
-        # Create customization group
-        customization_group = QGroupBox("Customization")
-        customization_layout = QFormLayout()
-        
-        # Custom GIF selector
-        gif_layout = QHBoxLayout()
-        self.gif_path = QLineEdit()
-        self.gif_path.setText(parent.gif_path)
-        self.gif_path.setReadOnly(True)
-        
-        browse_gif_button = QPushButton("Browse...")
-        browse_gif_button.clicked.connect(self.browse_gif)
-        gif_layout.addWidget(self.gif_path)
-        gif_layout.addWidget(browse_gif_button)
-        customization_layout.addRow("Custom GIF:", gif_layout)
-        
-        # Custom Sound selector
-        sound_layout = QHBoxLayout()
-        self.sound_path = QLineEdit()
-        self.sound_path.setText(parent.sound_path)
-        self.sound_path.setReadOnly(True)
-        
-        browse_sound_button = QPushButton("Browse...")
-        browse_sound_button.clicked.connect(self.browse_sound)
-        sound_layout.addWidget(self.sound_path)
-        sound_layout.addWidget(browse_sound_button)
-        customization_layout.addRow("Custom Sound:", sound_layout)
-        
-        customization_group.setLayout(customization_layout)
-        main_layout.addWidget(customization_group)
-        
-        # Create options group
-        options_group = QGroupBox("Options")
-        options_layout = QVBoxLayout()
-        
-        # Start with Windows option
-        self.start_with_windows = QCheckBox("Start with Windows")
-        self.start_with_windows.setChecked(parent.start_with_windows)
-        options_layout.addWidget(self.start_with_windows)
-        
-        options_group.setLayout(options_layout)
-        main_layout.addWidget(options_group)
-        
-        # Add stats group
-        stats_group = QGroupBox("Your Stats")
-        stats_layout = QVBoxLayout()
-        
-        # Daily stats
-        daily_stats = QLabel(
-            f"<h3>Today's Progress</h3>"
-            f"Water count: {parent.stats['daily']['water_count']}<br>"
-            f"Songs played: {parent.stats['daily']['songs_played']}<br>"
-            f"Last water: {parent.stats['daily']['last_water_time'].toString('hh:mm:ss') if isinstance(parent.stats['daily']['last_water_time'], QTime) else 'Never'}"
-        )
-        daily_stats.setStyleSheet("""
-            QLabel {
-                color: #333;
-                font-size: 12px;
-                padding: 10px;
-            }
-        """)
-        
-        # Weekly stats
-        weekly_stats = QLabel(
-            f"<h3>Weekly Progress</h3>"
-            f"Current streak: {parent.stats['weekly']['streak']} days<br>"
-            f"Best day: {parent.stats['weekly']['best_day']} drinks<br>"
-            f"Average daily: {sum(parent.stats['weekly']['water_count']) / 7:.1f} drinks<br>"
-            f"Total songs this week: {sum(parent.stats['weekly']['songs_played'])}"
-        )
-        weekly_stats.setStyleSheet("""
-            QLabel {
+            #settingsDialog QLabel#statsLabel {{
                 color: #333;
                 font-size: 12px;
                 padding: 10px;
-            }
-        """)
-        
-        # Total stats
-        total_stats = QLabel(
-            f"<h3>Total Progress</h3>"
-            f"Total water count: {parent.stats['total']['water_count']}<br>"
-            f"Total songs played: {parent.stats['total']['songs_played']}<br>"
-            f"Days used: {parent.stats['total']['days_used']}"
-        )
-        total_stats.setStyleSheet("""
-            QLabel {
-                color: #333;
-                font-size: 12px;
-                padding: 10px;
-            }
-        """)
-        
-        # Achievements
-        achievements = QLabel(
-            f"<h3>Achievements</h3>"
-            f"{'🏆' if parent.stats['achievements']['first_sip'] else '🔒'} First Sip<br>"
-            f"{'🏆' if parent.stats['achievements']['hydration_hero'] else '🔒'} Hydration Hero<br>"
-            f"{'🏆' if parent.stats['achievements']['consistent_companion'] else '🔒'} Consistent Companion<br>"
-            f"{'🏆' if parent.stats['achievements']['music_master'] else '🔒'} Music Master"
-        )
-        achievements.setStyleSheet("""
-            QLabel {
-                color: #333;
-                font-size: 12px;
-                padding: 10px;
-            }
-        """)
-        
-        stats_layout.addWidget(daily_stats)
-        stats_layout.addWidget(weekly_stats)
-        stats_layout.addWidget(total_stats)
-        stats_layout.addWidget(achievements)
-        stats_group.setLayout(stats_layout)
-        main_layout.addWidget(stats_group)
-        
-        # Add stretch to push buttons to bottom
-        main_layout.addStretch()
-        
-        # Add buttons at the bottom
-        button_layout = QHBoxLayout()
-        
-        # Cancel button
-        cancel_button = QPushButton("Cancel")
-        cancel_button.clicked.connect(self.reject)
-        cancel_button.setStyleSheet("""
-            QPushButton {
-                background-color: #FFB6C1;
-                color: white;
-            }
-            QPushButton:hover {
-                background-color: #FF69B4;
-            }
-        """)
-        
-        # Save button
-        save_button = QPushButton("Save")
-        save_button.clicked.connect(self.save_settings)
-        
-        button_layout.addWidget(cancel_button)
-        button_layout.addWidget(save_button)
-        main_layout.addLayout(button_layout)
-        
-        self.setLayout(main_layout)
-    
-    def update_color_button(self):
-        self.theme_color_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {self.theme_color};
-                border-radius: 15px;
-                border: 2px solid white;
-            }}
-            QPushButton:hover {{
-                border: 2px solid #FF1493;
             }}
-        """)
-    
-    def choose_color(self):
-        color = QColorDialog.getColor(QColor(self.theme_color), self)
-        if color.isValid():
-            self.theme_color = color.name()
-            self.update_color_button()
-    
-    def browse_gif(self):
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select GIF", "", "GIF Files (*.gif)"
-        )
-        if file_path:
-            self.gif_path.setText(file_path)
-    
-    def browse_sound(self):
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Sound", "", "Sound Files (*.mp3 *.wav)"
-        )
-        if file_path:
-            self.sound_path.setText(file_path)
-    
-    def save_settings(self):
-        self.parent.reminder_interval = self.interval_spinbox.value() * 60000  # Convert to ms
-        self.parent.reminder_message = self.reminder_message.text()
-        self.parent.gif_path = self.gif_path.text()
-        self.parent.sound_path = self.sound_path.text()
-        self.parent.start_with_windows = self.start_with_windows.isChecked()
-        self.parent.theme_color = self.theme_color
-        self.parent.cat_name = self.cat_name.text()
-        
-        # Update reminder timer
-        self.parent.reminder_timer.stop()
-        self.parent.reminder_timer.start(self.parent.reminder_interval)
-        
-        # Update GIF if changed
-        if self.parent.current_gif_path != self.parent.gif_path:
-            self.parent.load_gif()
-        
-        # Update sound if changed
-        if self.parent.current_sound_path != self.parent.sound_path:
-            self.parent.load_sound()
-        
-        # Update startup registry
-        self.parent.update_startup_registry()
-        
-        # Update theme
-        self.parent.apply_theme()
-        
-        # Save settings to file
-        self.parent.save_settings()
-        
-        # Show confirmation message
-        self.parent.show_custom_notification("✨ Settings saved successfully!", duration=2000)
-        
-        self.accept()
-
-class AboutDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("About")
-        self.setFixedSize(350, 200)
-        
-        # Apply pink theme
-        self.setStyleSheet(f"""
-            QDialog {{
+            
+            /* About and diagnostics dialogs */
+            QDialog#aboutDialog, QDialog#diagnosticsDialog {{
                 background-color: #FFF0F5;
             }}
-            QLabel {{
-                color: {parent.theme_color};
+            #aboutDialog QLabel, #diagnosticsDialog QLabel {{
+                color: {color};
             }}
-        """)
-        
-        layout = QVBoxLayout()
-        
-        # About information
-        about_text = QLabel(
-            f"<h2>Cat Companion</h2>"
-            f"<p>Version 1.1</p>"
-            f"<p>Created by {parent.creator_name}</p>"
-            f"<p>A cute companion to remind you to stay hydrated!</p>"
-        )
-        about_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        about_text.setWordWrap(True)
-        
-        ok_button = QPushButton("OK")
-        ok_button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {parent.theme_color};
+            #aboutDialog QPushButton, #diagnosticsDialog QPushButton {{
+                background-color: {color};
                 color: white;
                 border-radius: 5px;
                 padding: 5px 10px;
                 border: none;
             }}
-            QPushButton:hover {{
+            #aboutDialog QPushButton:hover, #diagnosticsDialog QPushButton:hover {{
                 background-color: #FF1493;
             }}
-        """)
-        ok_button.clicked.connect(self.accept)
-        
-        layout.addWidget(about_text)
-        layout.addWidget(ok_button, alignment=Qt.AlignmentFlag.AlignCenter)
-        
-        self.setLayout(layout)
-
-class AchievementsDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Achievements")
-        self.setMinimumWidth(400)
-        self.setMinimumHeight(500)
-        
-        # Apply pink theme
-        self.setStyleSheet(f"""
-            QDialog {{
+            
+            /* Achievements dialog */
+            QDialog#achievementsDialog {{
                 background-color: #FFF0F5;
             }}
-            QLabel {{
-                color: {parent.theme_color};
+            #achievementsDialog QLabel {{
+                color: {color};
                 font-size: 12px;
                 font-weight: bold;
             }}
-            QPushButton {{
-                background-color: {parent.theme_color};
+            #achievementsDialog QPushButton {{
+                background-color: {color};
                 color: white;
                 border-radius: 8px;
                 padding: 8px 16px;
@@ -445,89 +170,2177 @@ class AchievementsDialog(QDialog):
                 font-weight: bold;
                 min-width: 100px;
             }}
-            QPushButton:hover {{
+            #achievementsDialog QPushButton:hover {{
                 background-color: #FF1493;
             }}
-        """)
-        
-        layout = QVBoxLayout()
-        layout.setSpacing(20)
-        layout.setContentsMargins(20, 20, 20, 20)
-        
-        # Add title
-        title_label = QLabel("Your Achievements")
-        title_label.setStyleSheet(f"""
-            font-size: 18px;
-            font-weight: bold;
-            color: {parent.theme_color};
-            padding-bottom: 10px;
-        """)
-        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(title_label)
-        
-        # Create achievements list
-        achievements = [
-            {
-                "title": "First Sip",
-                "description": "Take your first sip with your cat companion",
-                "icon": "🏆" if parent.stats["achievements"]["first_sip"] else "🔒"
-            },
-            {
-                "title": "Hydration Hero",
-                "description": "Drink water 8+ times in a day",
-                "icon": "🏆" if parent.stats["achievements"]["hydration_hero"] else "🔒"
-            },
-            {
-                "title": "Consistent Companion",
-                "description": "Maintain a 7-day streak of drinking water",
-                "icon": "🏆" if parent.stats["achievements"]["consistent_companion"] else "🔒"
-            },
-            {
-                "title": "Music Master",
-                "description": "Play 50 songs with your cat companion",
-                "icon": "🏆" if parent.stats["achievements"]["music_master"] else "🔒"
-            }
-        ]
-        
-        # Add each achievement
-        for achievement in achievements:
-            achievement_widget = QWidget()
-            achievement_layout = QHBoxLayout()
-            achievement_layout.setSpacing(10)
-            
-            # Icon
-            icon_label = QLabel(achievement["icon"])
-            icon_label.setStyleSheet("font-size: 24px;")
-            achievement_layout.addWidget(icon_label)
-            
-            # Text
-            text_widget = QWidget()
-            text_layout = QVBoxLayout()
-            text_layout.setSpacing(5)
-            
-            title = QLabel(achievement["title"])
-            title.setStyleSheet("font-size: 14px; font-weight: bold;")
+            #achievementsDialog QLabel#achievementIcon {{
+                font-size: 24px;
+            }}
+            #achievementsDialog QLabel#achievementTitle {{
+                font-size: 14px;
+                font-weight: bold;
+            }}
+            #achievementsDialog QLabel#achievementDescription {{
+                font-size: 12px;
+                color: #666;
+            }}
             
-            description = QLabel(achievement["description"])
-            description.setStyleSheet("font-size: 12px; color: #666;")
-            description.setWordWrap(True)
+            /* Dialog titles */
+            QLabel#dialogTitle {{
+                font-size: 18px;
+                font-weight: bold;
+                color: {color};
+                padding-bottom: 10px;
+            }}
             
-            text_layout.addWidget(title)
-            text_layout.addWidget(description)
-            text_widget.setLayout(text_layout)
+            /* Context menu */
+            QMenu#catContextMenu {{
+                background-color: #FFF0F5;
+                border: 1px solid {color};
+                border-radius: 8px;
+                padding: 5px;
+            }}
+            QMenu#catContextMenu::item {{
+                padding: 8px 30px 8px 30px;
+                color: {color};
+                border-radius: 4px;
+            }}
+            QMenu#catContextMenu::item:selected {{
+                background-color: {color};
+                color: white;
+            }}
             
-            achievement_layout.addWidget(text_widget)
-            achievement_widget.setLayout(achievement_layout)
-            layout.addWidget(achievement_widget)
+            /* Companion window */
+            QLabel#catLabel {{
+                border-radius: 15px;
+            }}
+            #mediaControls QPushButton {{
+                background-color: transparent;
+                border: none;
+                border-radius: 6px;
+                padding: 6px;
+            }}
+            #mediaControls QPushButton:hover {{
+                background-color: rgba(255, 192, 203, 0.3);
+            }}
+        """
+
+class StartupProfile:
+    """Phase-by-phase startup timings, printed when run with --startup-profile"""
+
+    def __init__(self):
+        self.enabled = False
+        self.last = STARTED
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("Startup profile:")
+        for phase, elapsed_ms in self.phases:
+            print(f"  {phase:<24}{elapsed_ms:8.1f} ms")
+        print(f"  {'total':<24}{(self.last - STARTED) * 1000:8.1f} ms")
+
+startup_profile = StartupProfile()
+
+class SoundEffect:
+    """A sound that only creates its media player the first time it is played"""
+
+    def __init__(self, volume=0.5):
+        self.volume = volume
+        self.path = None
+        self.player = None
+        self.audio_output = None
+
+    def setSource(self, path):
+        self.path = path
+        if self.player is not None:
+            self.player.setSource(QUrl.fromLocalFile(path))
+
+    def play(self):
+        if self.player is None:
+            self.create_player()
+        self.player.play()
+
+    def stop(self):
+        if self.player is not None:
+            self.player.stop()
+
+    def create_player(self):
+        # QtMultimedia is slow to load, so it waits for the first sound
+        from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+        self.player = QMediaPlayer()
+        self.audio_output = QAudioOutput()
+        self.player.setAudioOutput(self.audio_output)
+        self.audio_output.setVolume(self.volume)
+        if self.path is not None:
+            self.player.setSource(QUrl.fromLocalFile(self.path))
+
+class MediaKeys:
+    """Presses system media keys, loading the platform backend on first use"""
+    PREVIOUS = 0xB1  # VK_MEDIA_PREV_TRACK
+    PLAY_PAUSE = 0xB3  # VK_MEDIA_PLAY_PAUSE
+    NEXT = 0xB0  # VK_MEDIA_NEXT_TRACK
+    VOLUME_UP = 0xAF  # VK_VOLUME_UP
+    VOLUME_DOWN = 0xAE  # VK_VOLUME_DOWN
+    MUTE = 0xAD  # VK_VOLUME_MUTE
+
+    def __init__(self):
+        self.send = None
+
+    def press(self, key):
+        if self.send is None:
+            self.send = self.load_backend()
+        self.send(key)
+
+    @staticmethod
+    def load_backend():
+        try:
+            import win32api
+            import win32con
+        except ImportError as e:
+            print(f"Error loading media keys: {e}")
+            return lambda key: None
+        
+        def send(key):
+            win32api.keybd_event(key, 0, 0, 0)
+            win32api.keybd_event(key, 0, win32con.KEYEVENTF_KEYUP, 0)
+        return send
+
+class ParticleStore:
+    """Heart particles kept as parallel arrays, oldest first"""
+    GRAVITY = 0.1
+    FADE = 0.02
+
+    def __init__(self, budget=256):
+        self.budget = budget
+        self.x = array('d')
+        self.y = array('d')
+        self.vx = array('d')
+        self.vy = array('d')
+        self.opacity = array('d')
+        self.size = array('d')
+
+    def __len__(self):
+        return len(self.opacity)
+
+    def columns(self):
+        return (self.x, self.y, self.vx, self.vy, self.opacity, self.size)
+
+    def spawn(self, x, y, count=8):
+        for _ in range(count):
+            self.x.append(x)
+            self.y.append(y)
+            self.vx.append(random.uniform(-2, 2))  # Random horizontal velocity
+            self.vy.append(random.uniform(-4, -2))  # Upward velocity
+            self.opacity.append(1.0)
+            self.size.append(random.uniform(15, 25))  # Random size
+        
+        # Drop the oldest particles when over budget
+        overflow = len(self) - self.budget
+        if overflow > 0:
+            for column in self.columns():
+                del column[:overflow]
+
+    def step(self):
+        # Advance every particle in one pass per column
+        self.vy = array('d', map(add, self.vy, repeat(self.GRAVITY)))
+        self.x = array('d', map(add, self.x, self.vx))
+        self.y = array('d', map(add, self.y, self.vy))
+        self.opacity = array('d', map(add, self.opacity, repeat(-self.FADE)))
+        
+        # Compact away dead particles, keeping the survivors in age order
+        alive = [o > 0 for o in self.opacity]
+        if not all(alive):
+            self.x, self.y, self.vx, self.vy, self.opacity, self.size = (
+                array('d', compress(column, alive)) for column in self.columns()
+            )
+        return len(self)
+
+    def clear(self):
+        for column in self.columns():
+            del column[:]
+
+    def __iter__(self):
+        return zip(self.x, self.y, self.opacity, self.size)
+
+    def bounds(self):
+        # Rectangle covering every heart, with a little room for antialiasing
+        if not self:
+            return QRectF()
+        pad = max(self.size) / 2 + 2
+        left = min(self.x) - pad
+        top = min(self.y) - 2
+        right = max(self.x) + pad
+        bottom = max(self.y) + 2 * pad
+        return QRectF(left, top, right - left, bottom - top)
+
+class RateCounter:
+    """Counts events in one-second buckets over a short sliding window"""
+
+    def __init__(self, window=5):
+        self.window = window
+        self.buckets = deque(maxlen=window + 1)
+        self.total = 0
+
+    def add(self, amount=1):
+        now = int(time.monotonic())
+        if self.buckets and self.buckets[-1][0] == now:
+            self.buckets[-1][1] += amount
+        else:
+            self.buckets.append([now, amount])
+        self.total += amount
+
+    def rate(self):
+        # Average per second over the last completed seconds
+        now = int(time.monotonic())
+        counted = sum(count for second, count in self.buckets if now - self.window <= second < now)
+        return counted / self.window
+
+class WakeupInstrumentation:
+    """Opt-in counters for how often each timer source wakes the process and how long it runs"""
+
+    def __init__(self):
+        self.enabled = False
+        self.sources = {}
+
+    def set_enabled(self, enabled):
+        # Every recording session starts from a clean slate
+        if enabled and not self.enabled:
+            self.sources = {}
+        self.enabled = enabled
+
+    def wrap(self, source, callback):
+        def instrumented(*args):
+            if not self.enabled:
+                return callback(*args)
+            started = time.perf_counter()
+            try:
+                return callback(*args)
+            finally:
+                self.record(source, (time.perf_counter() - started) * 1000)
+        return instrumented
+
+    def record(self, source, elapsed_ms):
+        entry = self.sources.get(source)
+        if entry is None:
+            entry = self.sources[source] = {"wakeups": RateCounter(), "calls": 0, "total_ms": 0.0, "max_ms": 0.0}
+        entry["wakeups"].add()
+        entry["calls"] += 1
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+
+    def wakeups_per_second(self):
+        return sum(entry["wakeups"].rate() for entry in self.sources.values())
+
+    def summary(self):
+        # Busiest sources first
+        summary = {
+            source: {
+                "wakeups_per_second": entry["wakeups"].rate(),
+                "calls": entry["calls"],
+                "total_ms": entry["total_ms"],
+                "mean_ms": entry["total_ms"] / entry["calls"],
+                "max_ms": entry["max_ms"],
+            }
+            for source, entry in self.sources.items()
+        }
+        return dict(sorted(summary.items(), key=lambda item: item[1]["wakeups_per_second"], reverse=True))
+
+    def dump(self, path, **extra):
+        report = {
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "enabled": self.enabled,
+            "wakeups_per_second": self.wakeups_per_second(),
+            "sources": self.summary(),
+            **extra,
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+# Shared by every timer owner; recording is off until switched on from the context menu
+instrumentation = WakeupInstrumentation()
+
+class FrameProfiler:
+    """Rolling frame-time samples for painting, resizing and GIF timing, summarised as percentiles"""
+    SAMPLES = 600  # About ten seconds of frames at 60 FPS
+
+    def __init__(self):
+        self.enabled = False
+        self.samples = {}
+        self.last_gif_frame = None
+
+    def set_enabled(self, enabled):
+        if enabled and not self.enabled:
+            self.samples = {}
+            self.last_gif_frame = None
+        self.enabled = enabled
+
+    def record(self, name, elapsed_ms):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.SAMPLES)
+        samples.append(elapsed_ms)
+
+    def gif_frame(self, index, delays):
+        # Jitter is how far the real interval strayed from the delay the GIF asked for
+        now = time.perf_counter()
+        if self.last_gif_frame is not None:
+            last_index, last_time = self.last_gif_frame
+            if index == last_index + 1 or (index == 0 and last_index > 0):
+                self.record("gif_jitter", (now - last_time) * 1000 - delays[last_index])
+        self.last_gif_frame = (index, now)
+
+    def reset_gif(self):
+        # Pauses are not jitter
+        self.last_gif_frame = None
+
+    @staticmethod
+    def percentile(ordered, fraction):
+        # Nearest-rank percentile of an already sorted list
+        return ordered[max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))]
+
+    def summary(self):
+        summary = {}
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            summary[name] = {
+                "count": len(ordered),
+                "p50": self.percentile(ordered, 0.50),
+                "p95": self.percentile(ordered, 0.95),
+                "p99": self.percentile(ordered, 0.99),
+                "max": ordered[-1],
+            }
+        return summary
+
+class FrameStatsOverlay(QWidget):
+    """Small rolling readout of frame-time percentiles in the cat's bottom-left corner"""
+    REFRESH_MS = 500
+    MARGIN = 8
+    PADDING = 6
+    LABELS = {"paint": "paint", "resize": "resize", "gif_jitter": "gif jitter"}
+
+    def __init__(self, host):
+        super().__init__(host.cat_label)
+        self.host = host
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.hide()
         
-        # Add close button
-        close_button = QPushButton("Close")
-        close_button.clicked.connect(self.accept)
-        layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.text_font = QFont()
+        self.text_font.setFamilies(["Consolas", "Courier New", "monospace"])
+        self.text_font.setPixelSize(10)
+        self.metrics = QFontMetrics(self.text_font)
+        self.lines = []
         
-        self.setLayout(layout)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(instrumentation.wrap("frame_overlay", self.refresh))
+
+    def set_active(self, active):
+        if active:
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.refresh_timer.start()
+        else:
+            self.refresh_timer.stop()
+            self.hide()
+
+    def refresh(self):
+        summary = self.host.frame_profiler.summary()
+        lines = ["ms          p50    p95    p99"]
+        for name, label in self.LABELS.items():
+            entry = summary.get(name)
+            if entry is None:
+                lines.append(f"{label:<10}     -")
+            else:
+                lines.append(f"{label:<10}{entry['p50']:>6.1f} {entry['p95']:>6.1f} {entry['p99']:>6.1f}")
+        if lines != self.lines:
+            self.lines = lines
+            self.arrange()
+            self.update()
+
+    def arrange(self):
+        width = max(self.metrics.horizontalAdvance(line) for line in self.lines or [""]) + 2 * self.PADDING
+        height = self.metrics.lineSpacing() * len(self.lines) + 2 * self.PADDING
+        self.setGeometry(self.MARGIN, self.host.cat_label.height() - height - self.MARGIN, width, height)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 150))
+        painter.drawRoundedRect(QRectF(self.rect()), 6, 6)
+        painter.setPen(QColor(Qt.GlobalColor.white))
+        painter.setFont(self.text_font)
+        y = self.PADDING + self.metrics.ascent()
+        for line in self.lines:
+            painter.drawText(self.PADDING, y, line)
+            y += self.metrics.lineSpacing()
+
+class HeartSprites:
+    """Hearts pre-rasterised once per theme colour into a single atlas pixmap"""
+    MIN_SIZE = 15
+    MAX_SIZE = 25
+    PADDING = 1
+
+    def __init__(self):
+        self.color = None
+        self.device_pixel_ratio = None
+        self.atlas = None
+        self.source_rects = {}
+
+    @staticmethod
+    def heart_path(x, y, size):
+        # Heart hanging from (x, y), size wide and tall
+        path = QPainterPath()
+        path.moveTo(x, y + size / 4)
+        path.cubicTo(
+            x, y, 
+            x - size / 2, y,
+            x - size / 2, y + size / 4
+        )
+        path.cubicTo(
+            x - size / 2, y + size / 2,
+            x, y + size * 3/4,
+            x, y + size
+        )
+        path.cubicTo(
+            x, y + size * 3/4,
+            x + size / 2, y + size / 2,
+            x + size / 2, y + size / 4
+        )
+        path.cubicTo(
+            x + size / 2, y,
+            x, y,
+            x, y + size / 4
+        )
+        return path
+
+    def rebuild(self, color, device_pixel_ratio=1.0):
+        self.color = color
+        self.device_pixel_ratio = device_pixel_ratio
+        self.source_rects = {}
+        
+        # Lay one heart per size bucket out side by side
+        cell = self.MAX_SIZE + 2 * self.PADDING
+        buckets = range(self.MIN_SIZE, self.MAX_SIZE + 1)
+        self.atlas = QPixmap(int(cell * len(buckets) * device_pixel_ratio), int(cell * device_pixel_ratio))
+        self.atlas.setDevicePixelRatio(device_pixel_ratio)
+        self.atlas.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(self.atlas)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        brush = QBrush(QColor(color))
+        for index, size in enumerate(buckets):
+            left = index * cell
+            painter.fillPath(self.heart_path(left + self.PADDING + size / 2, self.PADDING, size), brush)
+            # Source rects are in device pixels
+            self.source_rects[size] = QRectF(
+                left * device_pixel_ratio, 0,
+                (size + 2 * self.PADDING) * device_pixel_ratio,
+                (size + 2 * self.PADDING) * device_pixel_ratio
+            )
+        painter.end()
+
+    def draw(self, painter, particles, color, device_pixel_ratio=1.0):
+        if self.atlas is None or color != self.color or device_pixel_ratio != self.device_pixel_ratio:
+            self.rebuild(color, device_pixel_ratio)
+        
+        scale = 1.0 / device_pixel_ratio
+        fragments = sip.array(QPainter.PixmapFragment, len(particles))
+        for index, (x, y, opacity, size) in enumerate(particles):
+            bucket = min(self.MAX_SIZE, max(self.MIN_SIZE, round(size)))
+            fragments[index] = QPainter.PixmapFragment.create(
+                QPointF(x, y + bucket / 2),  # Fragments are positioned by their centre
+                self.source_rects[bucket],
+                scale, scale, 0, opacity
+            )
+        painter.drawPixmapFragments(fragments, self.atlas)
+
+class MediaIcons:
+    """Media control icons rasterised once per theme colour and device pixel ratio"""
+    SIZE = 20
+    PATHS = {
+        "previous": "M6 6h2v12H6V6zm3.5 6l7.5-6v12l-7.5-6z",
+        "play": "M8 5v14l11-7z",
+        "pause": "M6 19h4V5H6v14zm8-14v14h4V5h-4z",
+        "next": "M16 6h2v12h-2V6zM6 6l7.5 6L6 18V6z",
+        "volume_down": "M3 9v6h4l5 5V4L7 9H3zm13.5 3c0-1.77-1.02-3.29-2.5-4.03v8.05c1.48-.73 2.5-2.25 2.5-4.02z",
+        "volume_up": "M3 9v6h4l5 5V4L7 9H3zm13.5 3c0-1.77-1.02-3.29-2.5-4.03v8.05c1.48-.73 2.5-2.25 2.5-4.02zM14 3.23v2.06c2.89.86 5 3.54 5 6.71s-2.11 5.85-5 6.71v2.06c4.01-.91 7-4.49 7-8.77s-2.99-7.86-7-8.77z",
+        "mute": "M3 9v6h4l5 5V4L7 9H3zm7-4.17v2.51l3-3v-2.51l-3 3zm0 15.34l3 3v-2.51l-3-3v2.51zM14 3.23v2.06c2.89.86 5 3.54 5 6.71s-2.11 5.85-5 6.71v2.06c4.01-.91 7-4.49 7-8.77s-2.99-7.86-7-8.77z",
+    }
+
+    def __init__(self):
+        self.icons = {}
+
+    def rasterise(self, name, color, device_pixel_ratio):
+        # Render straight at device resolution so the icon stays crisp on high-DPI screens
+        pixels = round(self.SIZE * device_pixel_ratio)
+        svg = f"""
+            <svg width="{pixels}" height="{pixels}" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
+                <path d="{self.PATHS[name]}" fill="{color}"/>
+            </svg>
+        """
+        pixmap = QPixmap.fromImage(QImage.fromData(svg.encode()))
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        return QIcon(pixmap)
+
+    def icon(self, name, color, device_pixel_ratio=1.0):
+        key = (name, color, device_pixel_ratio)
+        icon = self.icons.get(key)
+        if icon is None:
+            # Only the current colour and ratio are worth keeping around
+            if any(cached[1:] != key[1:] for cached in self.icons):
+                self.icons.clear()
+            icon = self.icons[key] = self.rasterise(name, color, device_pixel_ratio)
+        return icon
+
+class NotificationManager(QWidget):
+    """Overlay notifications queued by priority and painted straight onto the cat"""
+    PRIORITIES = {"achievement": 0, "reminder": 1, "info": 2}
+    POOL_SIZE = 2
+    MAX_QUEUED = 8
+    FADE_MS = 500
+    SPACING = 6
+    PADDING_X = 24
+    PADDING_Y = 12
+    RADIUS = 15
+    BACKGROUNDS = {"achievement": QColor(255, 215, 0, 200), "info": QColor(255, 192, 203, 180)}
+    TEXT_CACHE_SIZE = 32
+
+    def __init__(self, host):
+        # One transparent overlay above the cat does all the drawing
+        super().__init__(host.cat_label)
+        self.host = host
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.hide()
+        
+        self.text_font = QFont()
+        self.text_font.setFamilies(["Segoe UI", "Arial", "sans-serif"])
+        self.text_font.setPixelSize(14)
+        self.text_font.setBold(True)
+        self.metrics = QFontMetrics(self.text_font)
+        self.text_cache = OrderedDict()  # (text, width) -> laid out QStaticText
+        
+        self.queue = []  # Heap of (priority, sequence, notification)
+        self.sequence = 0
+        self.slots = []  # Created on demand, never more than POOL_SIZE
+        self.paused = False  # While the cat cannot be seen nothing is shown and nothing times out
+        
+        # Bursts from one event are queued before anything is shown, so they can coalesce
+        self.pump_timer = QTimer(self)
+        self.pump_timer.setSingleShot(True)
+        self.pump_timer.setInterval(0)
+        self.pump_timer.timeout.connect(instrumentation.wrap("notification_pump", self.pump))
+
+    def notify(self, text, kind="info", duration=3000):
+        # Repeats of a message already showing or waiting are dropped
+        if any(slot["notification"] and slot["notification"]["text"] == text for slot in self.slots):
+            return
+        if any(queued["text"] == text for _, _, queued in self.queue):
+            return
+        self.enqueue({"kind": kind, "text": text, "duration": duration, "achievements": []})
+
+    def achievement(self, title, message, duration=5000):
+        # Achievements unlocked together are merged into one notification
+        for _, _, queued in self.queue:
+            if queued["kind"] == "achievement":
+                queued["achievements"].append((title, message))
+                queued["text"] = self.achievement_text(queued["achievements"])
+                return
+        achievements = [(title, message)]
+        self.enqueue({"kind": "achievement", "text": self.achievement_text(achievements),
+                      "duration": duration, "achievements": achievements})
+
+    @staticmethod
+    def achievement_text(achievements):
+        if len(achievements) == 1:
+            title, message = achievements[0]
+            return f"🏆 {title}\n{message}"
+        titles = ", ".join(title for title, _ in achievements)
+        return f"🏆 {len(achievements)} achievements unlocked!\n{titles}"
+
+    def enqueue(self, notification):
+        heapq.heappush(self.queue, (self.PRIORITIES[notification["kind"]], self.sequence, notification))
+        self.sequence += 1
+        
+        # Keep the queue bounded by dropping the least important, newest entry
+        if len(self.queue) > self.MAX_QUEUED:
+            self.queue.remove(max(self.queue, key=lambda entry: entry[:2]))
+            heapq.heapify(self.queue)
+        if not self.paused:
+            self.pump_timer.start()
+
+    def pump(self):
+        while self.queue and not self.paused:
+            slot = self.free_slot()
+            if slot is None:
+                return
+            _, _, notification = heapq.heappop(self.queue)
+            self.show_notification(slot, notification)
+
+    def free_slot(self):
+        for slot in self.slots:
+            if slot["notification"] is None:
+                return slot
+        if len(self.slots) < self.POOL_SIZE:
+            slot = self.create_slot()
+            self.slots.append(slot)
+            return slot
+        return None
+
+    def create_slot(self):
+        fade = QVariantAnimation(self)
+        fade.setDuration(self.FADE_MS)
+        hold = QTimer(self)
+        hold.setSingleShot(True)
+        
+        slot = {"fade": fade, "hold": hold, "hold_remaining": None, "notification": None, "opacity": 0.0,
+                "text": None, "rect": QRectF()}
+        fade.valueChanged.connect(instrumentation.wrap("notification_fade", lambda value: self.set_opacity(slot, value)))
+        fade.finished.connect(lambda: self.fade_finished(slot))
+        hold.timeout.connect(instrumentation.wrap("notification_hold", lambda: self.fade_out(slot)))
+        return slot
+
+    def static_text(self, text, max_width):
+        key = (text, max_width)
+        static_text = self.text_cache.get(key)
+        if static_text is not None:
+            self.text_cache.move_to_end(key)
+            return static_text
+        
+        # Lay the text out once; wrap only when it doesn't fit the cat
+        natural_width = max(self.metrics.horizontalAdvance(line) for line in text.split("\n"))
+        static_text = QStaticText(text)
+        static_text.setTextFormat(Qt.TextFormat.PlainText)
+        static_text.setTextWidth(min(natural_width, max_width))
+        static_text.prepare(QTransform(), self.text_font)
+        
+        self.text_cache[key] = static_text
+        if len(self.text_cache) > self.TEXT_CACHE_SIZE:
+            self.text_cache.popitem(last=False)
+        return static_text
+
+    def show_notification(self, slot, notification):
+        slot["notification"] = notification
+        slot["opacity"] = 0.0
+        self.arrange()
+        self.show()
+        self.raise_()
+        
+        # Fade in
+        fade = slot["fade"]
+        fade.stop()
+        fade.setStartValue(0.0)
+        fade.setEndValue(1.0)
+        fade.setEasingCurve(QEasingCurve.Type.OutCubic)
+        fade.start()
+        slot["hold"].start(notification["duration"])
+
+    def fade_out(self, slot):
+        fade = slot["fade"]
+        fade.stop()
+        fade.setStartValue(slot["opacity"])
+        fade.setEndValue(0.0)
+        fade.setEasingCurve(QEasingCurve.Type.InCubic)
+        fade.start()
+
+    def set_opacity(self, slot, opacity):
+        slot["opacity"] = opacity
+        self.update(slot["rect"].toAlignedRect().adjusted(-1, -1, 1, 1))
+
+    def fade_finished(self, slot):
+        if slot["fade"].endValue() != 0.0:
+            return
+        slot["notification"] = None
+        self.update(slot["rect"].toAlignedRect().adjusted(-1, -1, 1, 1))
+        self.arrange()
+        self.pump()
+        if not any(slot["notification"] for slot in self.slots):
+            self.hide()
+
+    def arrange(self):
+        # Cover the cat and stack visible notifications at its top centre
+        cat_label = self.host.cat_label
+        if self.geometry() != cat_label.rect():
+            self.setGeometry(cat_label.rect())
+        max_text_width = cat_label.width() - 40 - 2 * self.PADDING_X  # 20px padding on each side
+        y = 10  # 10px from top
+        for slot in self.slots:
+            if slot["notification"] is None:
+                continue
+            text = self.static_text(slot["notification"]["text"], max(max_text_width, 1))
+            size = text.size()
+            width = size.width() + 2 * self.PADDING_X
+            height = size.height() + 2 * self.PADDING_Y
+            rect = QRectF((cat_label.width() - width) / 2, y, width, height)
+            if rect != slot["rect"] or text is not slot["text"]:
+                self.update(slot["rect"].toAlignedRect().united(rect.toAlignedRect()).adjusted(-1, -1, 1, 1))
+                slot["rect"] = rect
+                slot["text"] = text
+            y += height + self.SPACING
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self.text_font)
+        for slot in self.slots:
+            if slot["notification"] is None or slot["opacity"] <= 0.0:
+                continue
+            rect = slot["rect"]
+            if not rect.intersects(QRectF(event.rect())):
+                continue
+            kind = "achievement" if slot["notification"]["kind"] == "achievement" else "info"
+            painter.setOpacity(slot["opacity"])
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(self.BACKGROUNDS[kind])
+            painter.drawRoundedRect(rect, self.RADIUS, self.RADIUS)
+            painter.setPen(QColor(Qt.GlobalColor.white))
+            painter.drawStaticText(QPointF(rect.x() + self.PADDING_X, rect.y() + self.PADDING_Y), slot["text"])
+
+    def animations(self):
+        return [slot["fade"] for slot in self.slots]
+
+    def set_paused(self, paused):
+        """Freeze hold timers and the queue; fades are paused with the other animations"""
+        if paused == self.paused:
+            return
+        self.paused = paused
+        for slot in self.slots:
+            hold = slot["hold"]
+            if paused and hold.isActive():
+                slot["hold_remaining"] = hold.remainingTime()
+                hold.stop()
+            elif not paused and slot["hold_remaining"] is not None:
+                hold.start(slot["hold_remaining"])  # The rest of its time on screen
+                slot["hold_remaining"] = None
+        if paused:
+            self.pump_timer.stop()
+        elif self.queue:
+            self.pump_timer.start()
+
+    def clear(self):
+        self.queue.clear()
+        for slot in self.slots:
+            slot["hold"].stop()
+            slot["hold_remaining"] = None
+            slot["fade"].stop()
+            slot["notification"] = None
+        self.hide()
+
+class FrameCache:
+    """Display-scaled GIF frames kept on disk, keyed by content hash and size, and memory-mapped back"""
+    MAGIC = b"CATFRAME"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIIIIIIId")  # magic, version, source w/h, width, height, bytes per line, frames, dpr
+    ALIGNMENT = 64
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-cache")
+
+    @staticmethod
+    def content_hash(path):
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def entry_path(self, content_hash, width, height, device_pixel_ratio):
+        return os.path.join(self.directory, f"{content_hash}_{width}x{height}@{device_pixel_ratio:g}.frames")
+
+    def data_offset(self, frame_count):
+        offset = self.HEADER.size + 4 * frame_count
+        return (offset + self.ALIGNMENT - 1) // self.ALIGNMENT * self.ALIGNMENT
+
+    def read_header(self, f):
+        header = f.read(self.HEADER.size)
+        if len(header) != self.HEADER.size:
+            return None
+        fields = self.HEADER.unpack(header)
+        if fields[0] != self.MAGIC or fields[1] != self.VERSION:
+            return None
+        delays = array('I')
+        delays.fromfile(f, fields[7])
+        if sys.byteorder != "little":
+            delays.byteswap()
+        return fields, list(delays)
+
+    def describe(self, content_hash):
+        """Frame count, delays and source size from any cached size of this GIF, without decoding"""
+        for path in glob.glob(os.path.join(glob.escape(self.directory), f"{content_hash}_*.frames")):
+            try:
+                with open(path, "rb") as f:
+                    entry = self.read_header(f)
+            except (OSError, EOFError):
+                continue
+            if entry is not None:
+                fields, delays = entry
+                return {"source_size": QSize(fields[2], fields[3]), "delays": delays}
+        return None
+
+    def open(self, content_hash, width, height, device_pixel_ratio):
+        path = self.entry_path(content_hash, width, height, device_pixel_ratio)
+        try:
+            with open(path, "rb") as f:
+                entry = self.read_header(f)
+                if entry is None:
+                    return None
+                fields, delays = entry
+                _, _, _, _, frame_width, frame_height, bytes_per_line, frame_count, dpr = fields
+                offset = self.data_offset(frame_count)
+                if os.fstat(f.fileno()).st_size != offset + frame_count * frame_height * bytes_per_line:
+                    return None  # Torn or truncated write
+                
+                # Copy-on-write mapping: pages stay shared with the page cache and other processes
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            os.utime(path)  # Most recently used entries survive pruning
+        except (OSError, EOFError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Error opening frame cache: {e}")
+            return None
+        return MappedFrames(mapping, offset, frame_width, frame_height, bytes_per_line, dpr, delays)
+
+    def store(self, content_hash, source_size, width, height, device_pixel_ratio, delays, images):
+        """Write rendered frames atomically; returns the mapped result or None"""
+        writer = FrameCacheWriter(self, content_hash, source_size, width, height, device_pixel_ratio, delays)
+        for index, image in enumerate(images):
+            writer.write(index, image)
+        return writer.finish()
+
+    def prune(self, keep=None):
+        # Entries left half-written by an earlier run are never finished
+        for path in glob.glob(os.path.join(glob.escape(self.directory), "*.tmp")):
+            try:
+                if time.time() - os.path.getmtime(path) > 3600:
+                    os.unlink(path)
+            except OSError:
+                pass
+        
+        # Drop the least recently used entries until the directory fits its budget
+        entries = []
+        for path in glob.glob(os.path.join(glob.escape(self.directory), "*.frames")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        in_use = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)  # On POSIX, processes that still map it keep their pages
+                total -= size
+            except PermissionError:
+                in_use += 1  # Windows refuses while any process has it mapped; retried on the next store
+            except OSError:
+                pass
+        if in_use and total > self.max_bytes:
+            print(f"Frame cache over budget: {in_use} entries still mapped, removed later")
+
+class FrameCacheWriter:
+    """One cache entry filled a frame at a time, in any order, then moved into place; used from one thread"""
+
+    def __init__(self, cache, content_hash, source_size, width, height, device_pixel_ratio, delays):
+        self.cache = cache
+        self.key = (content_hash, width, height, device_pixel_ratio)
+        self.path = cache.entry_path(*self.key)
+        self.source_size = QSize(source_size)
+        self.width = width
+        self.height = height
+        self.bytes_per_line = width * 4
+        self.device_pixel_ratio = device_pixel_ratio
+        self.delays = list(delays)
+        self.offset = cache.data_offset(len(self.delays))
+        self.written = set()
+        self.file = None  # Opened on the first frame, so creating a writer costs no I/O
+        self.temp_path = None
+        self.failed = False
+
+    def open(self):
+        os.makedirs(self.cache.directory, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=self.cache.directory, suffix=".tmp")
+        self.file = os.fdopen(fd, "wb")
+        self.file.write(FrameCache.HEADER.pack(FrameCache.MAGIC, FrameCache.VERSION, self.source_size.width(),
+                                               self.source_size.height(), self.width, self.height,
+                                               self.bytes_per_line, len(self.delays), self.device_pixel_ratio))
+        packed_delays = array('I', self.delays)
+        if sys.byteorder != "little":
+            packed_delays.byteswap()
+        packed_delays.tofile(self.file)
+        self.file.truncate(self.offset + len(self.delays) * self.height * self.bytes_per_line)
+
+    def write(self, index, image):
+        if self.failed or index in self.written:
+            return
+        try:
+            if self.file is None:
+                self.open()
+            image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+            if image.width() != self.width or image.height() != self.height:
+                raise ValueError("frame size does not match the cache entry")
+            bits = image.constBits()
+            bits.setsize(image.sizeInBytes())
+            data = bytes(bits)
+            self.file.seek(self.offset + index * self.height * self.bytes_per_line)
+            if image.bytesPerLine() == self.bytes_per_line:
+                self.file.write(data)
+            else:
+                for row in range(self.height):
+                    start = row * image.bytesPerLine()
+                    self.file.write(data[start:start + self.bytes_per_line])
+            self.written.add(index)
+        except (OSError, ValueError) as e:
+            print(f"Error writing frame cache: {e}")
+            self.abort()
+            self.failed = True
+
+    def finish(self):
+        """Move the entry into place once every frame is in; returns the mapped result or None"""
+        if self.failed or self.file is None or len(self.written) != len(self.delays):
+            self.abort()
+            return None
+        try:
+            self.file.close()
+            self.file = None
+            try:
+                os.replace(self.temp_path, self.path)
+            except PermissionError:
+                # Windows will not replace a file another process has mapped; that copy is just as good
+                if not os.path.exists(self.path):
+                    raise
+                os.unlink(self.temp_path)
+            self.temp_path = None
+        except OSError as e:
+            print(f"Error writing frame cache: {e}")
+            self.abort()
+            return None
+        self.cache.prune(keep=self.path)
+        return self.cache.open(*self.key)
+
+    def abort(self):
+        try:
+            if self.file is not None:
+                self.file.close()
+            if self.temp_path is not None and os.path.exists(self.temp_path):
+                os.unlink(self.temp_path)
+        except OSError as e:
+            print(f"Error removing frame cache temp file: {e}")
+        self.file = None
+        self.temp_path = None
+
+class MappedFrames:
+    """Frames of one cache entry, handed out as images over the mapped file without copying"""
+
+    def __init__(self, mapping, offset, width, height, bytes_per_line, device_pixel_ratio, delays):
+        self.mapping = mapping
+        self.pixmaps = {}
+        self.address = int(sip.voidptr(mapping))
+        self.offset = offset
+        self.width = width
+        self.height = height
+        self.bytes_per_line = bytes_per_line
+        self.device_pixel_ratio = device_pixel_ratio
+        self.delays = delays
+
+    def __len__(self):
+        return len(self.delays)
+
+    def image(self, index):
+        # The image only borrows the mapping; self must outlive it
+        start = self.offset + index * self.height * self.bytes_per_line
+        return QImage(sip.voidptr(self.address + start), self.width, self.height,
+                      self.bytes_per_line, QImage.Format.Format_ARGB32_Premultiplied)
+
+    def pixmap(self, index):
+        # Raster pixmaps keep pointing into the mapping, so caching them costs no heap
+        pixmap = self.pixmaps.get(index)
+        if pixmap is None:
+            pixmap = self.pixmaps[index] = QPixmap.fromImage(self.image(index))
+            pixmap.setDevicePixelRatio(self.device_pixel_ratio)
+        return pixmap
+
+class GifWriter:
+    """Minimal animated GIF encoder: every frame is complete and carries its own palette"""
+    TRANSPARENT_MASK = bytes(0xFF if alpha < 128 else 0 for alpha in range(256))
+
+    def __init__(self, width, height, loop_count=-1, encode=None):
+        self.encode = encode or self.lzw_encode  # Called with (indices, min_code_size)
+        self.data = bytearray(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+        # Same convention as QImageReader.loopCount(): -1 loops forever, 0 plays once
+        if loop_count != 0:
+            self.data += b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", max(loop_count, 0)) + b"\x00"
+        self.frames = 0
+
+    def add_frame(self, image, delay_ms):
+        image = image.convertToFormat(QImage.Format.Format_ARGB32)
+        width, height = image.width(), image.height()
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        alpha = bytes(bits)[3::4] if sys.byteorder == "little" else bytes(bits)[0::4]
+        mask = alpha.translate(self.TRANSPARENT_MASK)  # 0xFF where the pixel shows through
+        transparent = b"\xff" in mask
+        
+        # Qt picks the palette; a see-through frame keeps the last slot for transparency
+        opaque = image.convertToFormat(QImage.Format.Format_RGB32)
+        indexed = opaque.convertToFormat(QImage.Format.Format_Indexed8)
+        colors = indexed.colorTable()
+        if transparent:
+            if len(colors) > 255:
+                colors = colors[:255]
+                indexed = opaque.convertToFormat(QImage.Format.Format_Indexed8, colors)
+            colors = colors + [0] * (256 - len(colors))
+        bits = indexed.constBits()
+        bits.setsize(indexed.sizeInBytes())
+        data = bytes(bits)
+        stride = indexed.bytesPerLine()
+        if stride != width:
+            data = b"".join(data[row * stride:row * stride + width] for row in range(height))
+        if transparent:
+            data = (int.from_bytes(data, "little") | int.from_bytes(mask, "little")).to_bytes(len(data), "little")
+        
+        table_bits = max(1, (len(colors) - 1).bit_length())
+        palette = bytearray()
+        for color in colors:
+            palette += bytes(((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF))
+        palette += b"\0" * (3 * (1 << table_bits) - len(palette))
+        
+        # Restore-to-background disposal, so frames never depend on each other
+        delay = max(1, round(delay_ms / 10))
+        flags = (2 << 2) | (1 if transparent else 0)
+        self.data += struct.pack("<BBBBHBB", 0x21, 0xF9, 4, flags, delay, 255 if transparent else 0, 0)
+        self.data += struct.pack("<BHHHHB", 0x2C, 0, 0, width, height, 0x80 | (table_bits - 1))
+        self.data += palette
+        
+        min_code_size = max(2, table_bits)
+        compressed = self.encode(data, min_code_size)
+        self.data.append(min_code_size)
+        for start in range(0, len(compressed), 255):
+            block = compressed[start:start + 255]
+            self.data.append(len(block))
+            self.data += block
+        self.data.append(0)
+        self.frames += 1
+
+    def finish(self):
+        return bytes(self.data + b";")
+
+    @staticmethod
+    def lzw_encode(indices, min_code_size):
+        clear_code = 1 << min_code_size
+        end_code = clear_code + 1
+        output = bytearray()
+        code_size = min_code_size + 1
+        table = {}
+        next_code = end_code + 1
+        bit_buffer = clear_code
+        bit_count = code_size
+        
+        prefix = indices[0]
+        for index in indices[1:]:
+            key = prefix << 8 | index
+            code = table.get(key)
+            if code is not None:
+                prefix = code
+                continue
+            bit_buffer |= prefix << bit_count
+            bit_count += code_size
+            while bit_count >= 8:
+                output.append(bit_buffer & 0xFF)
+                bit_buffer >>= 8
+                bit_count -= 8
+            if next_code < 4096:
+                table[key] = next_code
+                if next_code == 1 << code_size:
+                    code_size += 1
+                next_code += 1
+            else:
+                # The code table is full: start a fresh one
+                bit_buffer |= clear_code << bit_count
+                bit_count += code_size
+                table = {}
+                code_size = min_code_size + 1
+                next_code = end_code + 1
+            prefix = index
+        
+        for code in (prefix, end_code):
+            bit_buffer |= code << bit_count
+            bit_count += code_size
+        while bit_count > 0:
+            output.append(bit_buffer & 0xFF)
+            bit_buffer >>= 8
+            bit_count -= 8
+        return bytes(output)
+
+class AssetStore(QObject):
+    """GIFs and sounds copied into an app-managed folder, named by content hash and optimised once on import"""
+    imported = pyqtSignal(str, str, object)  # source path, stored path, savings report
+    importFailed = pyqtSignal(str, str)  # source path, error message
+    TRAY_SIZES = (16, 24, 32, 48, 64)
+
+    def __init__(self, directory, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.closed = False
+        self.futures = []
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset-import")
+        self.encoder = None  # Process for the LZW encoding, started on the first GIF that needs it
+
+    def is_managed(self, path):
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(self.directory)
+
+    def import_async(self, path, max_size=None):
+        """Import on the worker thread; a GIF is downsampled to fit max_size"""
+        self.submit(self.run_import, path, max_size)
+
+    def collect_async(self, referenced):
+        """Delete stored files no longer referenced by any setting"""
+        self.submit(self.collect, {os.path.abspath(path) for path in referenced if path})
+
+    def submit(self, task, *args):
+        if self.closed:
+            return
+        self.futures = [future for future in self.futures if not future.done()]
+        self.futures.append(self.executor.submit(task, *args))
+
+    def run_import(self, path, max_size):
+        try:
+            if os.path.splitext(path)[1].lower() == ".gif":
+                stored, report = self.import_gif(path, max_size)
+            else:
+                stored, report = self.import_file(path)
+            self.imported.emit(path, stored, report)
+        except Exception as e:
+            self.importFailed.emit(path, str(e))
+
+    def shutdown(self):
+        self.closed = True  # Abandons an import in progress; nothing half-written is kept
+        for future in self.futures:
+            future.cancel()  # Queued work is dropped by hand; cancel_futures needs Python 3.9
+        self.executor.shutdown(wait=False)
+        if self.encoder is not None:
+            self.encoder.shutdown(wait=False)
+
+    def collect(self, referenced):
+        # Blobs are named by content hash, and tray icons by the hash of the GIF they were cut from
+        keep = {os.path.splitext(os.path.basename(path))[0] for path in referenced if self.is_managed(path)}
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name == os.path.basename(self.index_path) or name.endswith(".tmp"):
+                continue
+            stem = os.path.splitext(name)[0].split("_tray")[0]
+            if stem not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError as e:
+                    print(f"Error removing unused asset: {e}")
+        
+        # Index entries for removed files would only be re-imported anyway
+        index = self.read_index()
+        kept = {key: entry for key, entry in index.items()
+                if os.path.exists(os.path.join(self.directory, entry["file"]))}
+        if kept != index:
+            self.write_atomic(self.index_path, json.dumps(kept).encode())
+
+    def read_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write_atomic(self, path, data):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def store_blob(self, data, extension):
+        path = os.path.join(self.directory, hashlib.sha1(data).hexdigest() + extension)
+        if not os.path.exists(path):  # Same content, same file
+            self.write_atomic(path, data)
+        return path
+
+    def import_file(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        stored = self.store_blob(data, os.path.splitext(path)[1].lower())
+        return stored, {"source_path": path, "source_bytes": len(data), "stored_bytes": len(data)}
+
+    def encode_out_of_process(self, indices, min_code_size):
+        # Pure-Python LZW would hold the GIL for seconds; in its own process the GUI keeps running
+        if self.encoder is None:
+            self.encoder = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self.encoder.submit(GifWriter.lzw_encode, indices, min_code_size).result()
+
+    def duplicate_frames(self, path):
+        """Frames that repeat the one before, found without encoding anything"""
+        reader = QImageReader(path)
+        duplicates = 0
+        previous = None
+        while True:
+            if self.closed:
+                raise RuntimeError("import cancelled")
+            image = reader.read()
+            if image.isNull():
+                return duplicates
+            image = image.convertToFormat(QImage.Format.Format_ARGB32)
+            bits = image.constBits()
+            bits.setsize(image.sizeInBytes())
+            pixels = bytes(bits)
+            duplicates += pixels == previous
+            previous = pixels
+
+    def import_gif(self, path, max_size):
+        source_hash = FrameCache.content_hash(path)
+        key = source_hash if max_size is None else f"{source_hash}_{max_size.width()}x{max_size.height()}"
+        index = self.read_index()
+        entry = index.get(key)
+        if entry and os.path.exists(os.path.join(self.directory, entry["file"])):
+            return os.path.join(self.directory, entry["file"]), dict(entry["report"], source_path=path)
+        
+        reader = QImageReader(path)
+        source_size = reader.size()
+        if not reader.canRead() or not source_size.isValid():
+            raise ValueError(f"Cannot decode {path}")
+        target_size = source_size
+        if max_size is not None and (source_size.width() > max_size.width() or source_size.height() > max_size.height()):
+            target_size = source_size.scaled(max_size, Qt.AspectRatioMode.KeepAspectRatio)
+        
+        # Re-encoding is only worth it when the decoded frames shrink: smaller, or fewer of them
+        source_bytes = os.path.getsize(path)
+        if target_size == source_size and not self.duplicate_frames(path):
+            return self.store_unchanged(path, key, index, source_size, source_bytes)
+        
+        # Frames are written as they are decoded; only the previous one is held for the duplicate check
+        writer = GifWriter(target_size.width(), target_size.height(), reader.loopCount(),
+                           encode=self.encode_out_of_process)
+        source_frames = 0
+        pending = None  # [pixels, image, delay]
+        while True:
+            if self.closed:
+                raise RuntimeError("import cancelled")
+            image = reader.read()
+            if image.isNull():
+                break
+            delay = reader.nextImageDelay()
+            source_frames += 1
+            image = image.convertToFormat(QImage.Format.Format_ARGB32)
+            if image.size() != target_size:
+                image = image.scaled(target_size, Qt.AspectRatioMode.IgnoreAspectRatio,
+                                     Qt.TransformationMode.SmoothTransformation)
+            bits = image.constBits()
+            bits.setsize(image.sizeInBytes())
+            pixels = bytes(bits)
+            if pending is not None and pending[0] == pixels:
+                pending[2] += delay if delay > 0 else 100  # A repeated frame just holds the last one longer
+                continue
+            if pending is not None:
+                writer.add_frame(pending[1], pending[2])
+            pending = [pixels, image, delay if delay > 0 else 100]
+        if pending is None:
+            raise ValueError(f"Cannot decode {path}")
+        writer.add_frame(pending[1], pending[2])
+        
+        # Kept even when the file grows a little: playback memory is what the import is for
+        data = writer.finish()
+        stored = self.store_blob(data, ".gif")
+        report = self.gif_report(source_bytes, len(data), source_size, target_size, source_frames, writer.frames)
+        return self.record_import(key, index, stored, report, path)
+
+    def store_unchanged(self, path, key, index, source_size, source_bytes):
+        with open(path, "rb") as f:
+            data = f.read()
+        stored = self.store_blob(data, ".gif")
+        frames = QImageReader(path).imageCount()
+        report = self.gif_report(source_bytes, source_bytes, source_size, source_size, frames, frames)
+        return self.record_import(key, index, stored, report, path)
+
+    @staticmethod
+    def gif_report(source_bytes, stored_bytes, source_size, stored_size, source_frames, stored_frames):
+        return {
+            "source_bytes": source_bytes,
+            "stored_bytes": stored_bytes,
+            "source_size": [source_size.width(), source_size.height()],
+            "stored_size": [stored_size.width(), stored_size.height()],
+            "source_frames": source_frames,
+            "stored_frames": stored_frames,
+            "source_memory": source_size.width() * source_size.height() * 4 * source_frames,
+            "stored_memory": stored_size.width() * stored_size.height() * 4 * stored_frames,
+        }
+
+    def record_import(self, key, index, stored, report, path):
+        index[key] = {"file": os.path.basename(stored), "report": report}
+        self.write_atomic(self.index_path, json.dumps(index).encode())
+        return stored, dict(report, source_path=path)
+
+    def tray_icon(self, gif_path, content_hash=None):
+        """Small still icons cut from the GIF's first frame, cached beside the assets"""
+        icon = QIcon()
+        try:
+            content_hash = content_hash or FrameCache.content_hash(gif_path)
+            paths = [os.path.join(self.directory, f"{content_hash}_tray{size}.png") for size in self.TRAY_SIZES]
+            if not all(os.path.exists(path) for path in paths):
+                image = QImageReader(gif_path).read()
+                if image.isNull():
+                    return icon
+                os.makedirs(self.directory, exist_ok=True)
+                for size, path in zip(self.TRAY_SIZES, paths):
+                    scaled = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio,
+                                          Qt.TransformationMode.SmoothTransformation)
+                    canvas = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+                    canvas.fill(Qt.GlobalColor.transparent)
+                    painter = QPainter(canvas)
+                    painter.drawImage((size - scaled.width()) // 2, (size - scaled.height()) // 2, scaled)
+                    painter.end()
+                    canvas.save(path, "PNG")
+            for size, path in zip(self.TRAY_SIZES, paths):
+                icon.addFile(path, QSize(size, size))
+        except OSError as e:
+            print(f"Error creating tray icon: {e}")
+        return icon
+
+class GifAnimation(QObject):
+    """GIF playback that decodes each frame once and caches display-sized copies"""
+    frameChanged = pyqtSignal(int)
+    prepared = pyqtSignal(object)  # Emitted with the animation once prepare() is done, from its thread
+    variantStored = pyqtSignal(object, object)  # Size key and its mapped frames, from the frame cache thread
+
+    def __init__(self, path, max_cache_bytes=64 * 1024 * 1024, corner_radius=15, disk_cache=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.max_cache_bytes = max_cache_bytes
+        self.corner_radius = corner_radius
+        self.reader = QImageReader(path)
+        self.frame_size = QSize()
+        self.error = None
+        self.frames = OrderedDict()  # Decoded source frames by index, least recently used first
+        self.next_index = 0  # Frame the reader decodes next
+        self.delays = []  # Declared delay of each frame in milliseconds
+        self.frame_count = None  # Known once every frame is decoded, or from the disk cache
+        self.frames_decoded = 0
+        self.frames_rendered = 0
+        self.current_frame = -1
+        self.loop_count = -1  # Extra plays after the first; -1 loops forever
+        self.loops_played = 0
+        self.finished = False
+        self.superseded = False  # Set from the GUI thread when a newer pick replaces this one before it is ready
+        
+        # Display-sized copies keyed by (width, height, device pixel ratio), least recently used first;
+        # together with the source frames they stay under max_cache_bytes
+        self.variants = OrderedDict()
+        self.variant_bytes = {}
+        self.cache_bytes = 0
+        
+        # Sizes already on disk are served straight from the mapped cache file
+        self.disk_cache = disk_cache
+        self.content_hash = None
+        self.mapped = {}
+        self.storing = set()  # Size keys being written by the frame cache thread
+        self.writer = None  # Entry the current size streams into, a frame at a time as it is rendered
+        self.writer_key = None
+        self.writer_frames = set()
+        self.variantStored.connect(self.variant_stored)
+        
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(instrumentation.wrap("gif_frame", self.next_frame))
+
+    def prepare(self, frames=1):
+        """Hash the file and decode the first frames; may run on a worker thread before playback starts"""
+        if self.superseded:
+            self.error = "Superseded by a newer GIF"
+            self.prepared.emit(self)
+            return
+        try:
+            self.frame_size = self.reader.size()
+            self.loop_count = self.reader.loopCount()
+            if self.disk_cache is not None:
+                try:
+                    self.content_hash = self.disk_cache.content_hash(self.path)
+                except OSError as e:
+                    print(f"Error hashing GIF: {e}")
+            
+            # A cached copy tells us the frame count and delays without decoding anything
+            cached = self.disk_cache.describe(self.content_hash) if self.content_hash else None
+            if cached is not None:
+                self.delays = cached["delays"]
+                self.frame_count = len(self.delays)
+                if not self.frame_size.isValid():
+                    self.frame_size = cached["source_size"]
+            # Otherwise decode the first frames up front so callers know if the file is usable
+            else:
+                while self.next_index < frames and not self.superseded and self.decode_next():
+                    pass
+                if self.frames and not self.frame_size.isValid():
+                    self.frame_size = self.frames[0].size()
+            if not self.isValid():
+                self.error = f"Cannot decode {self.path}"
+        except Exception as e:
+            self.error = str(e)
+        self.prepared.emit(self)
+
+    def isValid(self):
+        return bool(self.frames) or bool(self.frame_count)
+
+    def decode_next(self):
+        if self.reader is None:
+            return False
+        image = self.reader.read()
+        if image.isNull():
+            self.reader = None  # Every frame has been decoded
+            self.frame_count = self.next_index
+            return False
+        delay = self.reader.nextImageDelay()
+        image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+        self.frames[self.next_index] = image
+        self.cache_bytes += image.sizeInBytes()
+        if self.next_index >= len(self.delays):
+            self.delays.append(delay if delay > 0 else 100)
+        self.next_index += 1
+        self.frames_decoded += 1
+        if not self.reader.canRead():
+            self.reader = None
+            self.frame_count = self.next_index
+        return True
+
+    def source_frame(self, index):
+        source = self.frames.get(index)
+        if source is not None:
+            self.frames.move_to_end(index)
+            return source
+        if index < self.next_index and index < (self.frame_count or self.next_index):
+            # The reader is past a frame that was dropped; GIF frames build on each other, so start over
+            self.reader = QImageReader(self.path)
+            self.next_index = 0
+        while self.next_index <= index and self.decode_next():
+            if self.next_index - 1 != index:
+                self.drop_source(self.next_index - 1)  # Only decoded to get to index
+        return self.frames.get(index)
+
+    def drop_source(self, index):
+        source = self.frames.pop(index, None)
+        if source is not None:
+            self.cache_bytes -= source.sizeInBytes()
+
+    def start(self):
+        if not self.timer.isActive() and not self.finished:
+            self.next_frame()
+
+    def stop(self):
+        self.timer.stop()
+        self.current_frame = -1
+        self.loops_played = 0
+        self.finished = False
+
+    def setPaused(self, paused):
+        if paused:
+            self.timer.stop()
+        elif self.current_frame >= 0 and not self.timer.isActive() and not self.finished:
+            self.timer.start(self.delays[self.current_frame])
+
+    def has_frame(self, index):
+        if self.frame_count is not None:
+            return index < self.frame_count
+        return self.source_frame(index) is not None
+
+    def next_frame(self):
+        index = self.current_frame + 1
+        if not self.has_frame(index):
+            # Honour the GIF's own loop count, resting on the last frame once it is used up
+            if 0 <= self.loop_count <= self.loops_played:
+                self.finished = True
+                return
+            self.loops_played += 1
+            index = 0  # Loop back to the start
+        self.current_frame = index
+        self.frameChanged.emit(index)
+        self.timer.start(self.delays[index])
+
+    def scaled_frame(self, index, size, device_pixel_ratio=1.0, smooth=True):
+        if size.isEmpty():
+            return None
+        key = (size.width(), size.height(), device_pixel_ratio)
+        
+        # Sizes cached on disk skip decoding and scaling entirely
+        if smooth:
+            mapped = self.mapped_frames(key)
+            if mapped is not None:
+                self.release_sources()
+                return mapped.pixmap(index) if index < len(mapped) else None
+        
+        # Fast previews are not worth keeping around
+        if not smooth:
+            source = self.source_frame(index)
+            if source is None:
+                return None
+            pixmap = self.render_frame(source, size, device_pixel_ratio, smooth)
+            self.evict()
+            return pixmap
+        
+        variant = self.variants.get(key)
+        if variant is None:
+            variant = self.variants[key] = {}
+            self.variant_bytes[key] = 0
+        self.variants.move_to_end(key)
+        
+        pixmap = variant.get(index)
+        if pixmap is None:
+            source = self.source_frame(index)
+            if source is None:
+                return None
+            pixmap = self.render_frame(source, size, device_pixel_ratio, smooth)
+            self.drop_source(index)  # Playback needs the display size; another size decodes it again
+            variant[index] = pixmap
+            frame_bytes = pixmap.width() * pixmap.height() * 4
+            self.variant_bytes[key] += frame_bytes
+            self.cache_bytes += frame_bytes
+            self.evict()
+        
+        # Every frame goes to disk as it is rendered; once all are there the size plays from the mapped file
+        self.stream_frame(key, index, pixmap)
+        return pixmap
+
+    def release_sources(self):
+        # The full-size decodes are only needed to render a new size; they are decoded again if one comes
+        for index in list(self.frames):
+            self.drop_source(index)
+        if self.frame_count is not None:
+            self.reader = None
+
+    def mapped_frames(self, key):
+        if key in self.mapped:
+            return self.mapped[key]
+        mapped = None
+        if self.content_hash is not None:
+            width, height, device_pixel_ratio = key
+            mapped = self.disk_cache.open(self.content_hash, round(width * device_pixel_ratio),
+                                          round(height * device_pixel_ratio), device_pixel_ratio)
+        self.mapped[key] = mapped  # Misses are remembered too, until the size gets stored
+        return mapped
+
+    def stream_frame(self, key, index, pixmap):
+        # The entry layout needs the frame count, known once the first loop has been decoded
+        if self.content_hash is None or self.frame_count is None or key in self.storing:
+            return
+        if self.writer_key != key:
+            self.abandon_writes()
+            self.writer = FrameCacheWriter(self.disk_cache, self.content_hash, self.frame_size, pixmap.width(),
+                                           pixmap.height(), key[2], self.delays[:self.frame_count])
+            self.writer_key = key
+            # Frames rendered before the count was known are written first
+            for cached_index, cached in self.variants.get(key, {}).items():
+                self.write_frame(cached_index, cached)
+        self.write_frame(index, pixmap)
+        if len(self.writer_frames) == self.frame_count:
+            self.storing.add(key)
+            self.disk_cache.executor.submit(self.write_variant, key, self.writer)
+            self.writer = None
+            self.writer_key = None
+            self.writer_frames = set()
+
+    def write_frame(self, index, pixmap):
+        if index not in self.writer_frames:
+            # Raster pixmaps hand over their pixels without copying; the write happens off the GUI thread
+            self.writer_frames.add(index)
+            self.disk_cache.executor.submit(self.writer.write, index, pixmap.toImage())
+
+    def abandon_writes(self):
+        """Drop a size that was only partly written, e.g. after a resize or when this animation is replaced"""
+        if self.writer is not None:
+            self.disk_cache.executor.submit(self.writer.abort)
+        self.writer = None
+        self.writer_key = None
+        self.writer_frames = set()
+
+    def write_variant(self, key, writer):
+        # Runs on the frame cache thread
+        mapped = writer.finish()
+        try:
+            self.variantStored.emit(key, mapped)
+        except RuntimeError:
+            pass  # The animation was replaced while the frames were being written
+
+    def variant_stored(self, key, mapped):
+        self.storing.discard(key)
+        if mapped is None:
+            self.content_hash = None  # Keep playing from memory rather than rewriting every frame
+            return
+        
+        # The mapped file replaces the heap copies
+        self.mapped[key] = mapped
+        if key in self.variants:
+            del self.variants[key]
+            self.cache_bytes -= self.variant_bytes.pop(key)
+
+    def render_frame(self, source, size, device_pixel_ratio, smooth):
+        self.frames_rendered += 1
+        mode = Qt.TransformationMode.SmoothTransformation if smooth else Qt.TransformationMode.FastTransformation
+        width = round(size.width() * device_pixel_ratio)
+        height = round(size.height() * device_pixel_ratio)
+        scaled = source.scaled(width, height, Qt.AspectRatioMode.IgnoreAspectRatio, mode)
+        
+        # Apply the rounded corners the cat label is styled with
+        image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        radius = self.corner_radius * device_pixel_ratio
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(0, 0, width, height), radius, radius)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, smooth)
+        painter.fillPath(path, QBrush(scaled))
+        painter.end()
+        
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        return pixmap
+
+    def work_done(self):
+        """Frames decoded plus frames scaled so far"""
+        return self.frames_decoded + self.frames_rendered
+
+    def evict(self):
+        # Full-size sources go first, then the least recently used rendered frames, the current size included
+        while self.cache_bytes > self.max_cache_bytes and self.frames:
+            self.drop_source(next(iter(self.frames)))
+        while self.cache_bytes > self.max_cache_bytes and self.variants:
+            key, variant = next(iter(self.variants.items()))
+            if not variant:
+                del self.variants[key]
+                del self.variant_bytes[key]
+                continue
+            pixmap = variant.pop(next(iter(variant)))  # Re-rendered on demand
+            frame_bytes = pixmap.width() * pixmap.height() * 4
+            self.variant_bytes[key] -= frame_bytes
+            self.cache_bytes -= frame_bytes
+
+class SessionMonitor(QObject):
+    """Reports when the user session is locked or unlocked"""
+    lockedChanged = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.locked = False
+
+    def set_locked(self, locked):
+        if locked != self.locked:
+            self.locked = locked
+            self.lockedChanged.emit(locked)
+
+    def attach(self, window):
+        # Platforms without a backend never report a lock; tests drive set_locked directly
+        pass
+
+    def handle_native_message(self, message, wparam):
+        pass
+
+class WindowsSessionMonitor(SessionMonitor):
+    """Session lock notifications from WTSRegisterSessionNotification"""
+    WM_WTSSESSION_CHANGE = 0x02B1
+    WTS_SESSION_LOCK = 0x7
+    WTS_SESSION_UNLOCK = 0x8
+    NOTIFY_FOR_THIS_SESSION = 0
+
+    def attach(self, window):
+        try:
+            import ctypes
+            ctypes.windll.wtsapi32.WTSRegisterSessionNotification(int(window.winId()), self.NOTIFY_FOR_THIS_SESSION)
+        except Exception as e:
+            print(f"Error registering for session notifications: {e}")
+
+    def handle_native_message(self, message, wparam):
+        if message == self.WM_WTSSESSION_CHANGE:
+            if wparam == self.WTS_SESSION_LOCK:
+                self.set_locked(True)
+            elif wparam == self.WTS_SESSION_UNLOCK:
+                self.set_locked(False)
+
+class StatsWriter(QObject):
+    """Write-behind persistence for stats: an append-only event journal plus
+    debounced, atomic snapshots that compact it, all written off the GUI thread"""
+
+    def __init__(self, path, snapshot, journal_path=None, debounce_ms=2000,
+                 compact_bytes=64 * 1024, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.snapshot = snapshot  # Returns a plain-JSON copy of the stats
+        self.journal_path = journal_path or os.path.splitext(path)[0] + ".journal"
+        self.journal_file = None  # Only touched on the writer thread
+        self.journal_bytes = 0
+        self.compact_bytes = compact_bytes
+        self.seq = 0  # Sequence number of the last journaled event
+        self.dirty = False
+        self.pending = None
+        self.writes = 0
+        self.closed = False
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats-writer")
+        
+        # The first change opens the debounce window; later ones just ride along
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(instrumentation.wrap("stats_write_behind", self.write_behind))
+
+    def mark_dirty(self):
+        self.dirty = True
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def append(self, event):
+        # One small append per change; the snapshot only catches up on compaction
+        self.seq += 1
+        event["seq"] = self.seq
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        self.journal_bytes += len(line.encode())
+        self.submit(self.append_line, line)
+        if self.journal_bytes >= self.compact_bytes:
+            self.compact()
+
+    def append_line(self, line):
+        try:
+            if self.journal_file is None:
+                self.journal_file = open(self.journal_path, "a", encoding="utf-8")
+            self.journal_file.write(line)
+            self.journal_file.flush()
+        except Exception as e:
+            print(f"Error appending to stats journal: {e}")
+
+    def read_snapshot(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def snapshot_mtime(self):
+        return os.path.getmtime(self.path)
+
+    def read_journal(self, after_seq=0):
+        """Events journaled after the snapshot with sequence number after_seq"""
+        events = []
+        self.seq = after_seq
+        self.journal_bytes = 0
+        if not os.path.exists(self.journal_path):
+            return events
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                self.journal_bytes += len(line.encode())
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue  # Torn final append from a crash
+                if event.get("seq", 0) > after_seq:
+                    events.append(event)
+                    self.seq = max(self.seq, event["seq"])
+        return events
+
+    def compact(self):
+        self.dirty = True
+        self.write_behind()
+
+    def submit(self, task, *args):
+        if self.closed:
+            task(*args)  # Late changes after shutdown are written in place
+        else:
+            self.pending = self.executor.submit(task, *args)
+
+    def write_behind(self):
+        if not self.dirty:
+            return
+        data = self.snapshot()
+        data["journal_seq"] = self.seq
+        self.dirty = False
+        self.journal_bytes = 0
+        self.submit(self.write_snapshot, data)
+
+    def write_snapshot(self, data):
+        # Everything journaled so far is folded into this snapshot, so the journal can start over
+        if self.write_atomic(data):
+            try:
+                if self.journal_file is not None:
+                    self.journal_file.close()
+                self.journal_file = open(self.journal_path, "w", encoding="utf-8")
+            except Exception as e:
+                print(f"Error truncating stats journal: {e}")
+
+    def write_atomic(self, data):
+        # Write next to the target and rename over it so readers never see a torn file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix=".stats-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            self.writes += 1
+            return True
+        except Exception as e:
+            print(f"Error saving stats: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
+
+    def flush(self):
+        # Write anything outstanding and wait until it is on disk
+        try:
+            self.timer.stop()
+        except RuntimeError:
+            pass  # Qt side already torn down during interpreter exit
+        if self.dirty:
+            self.write_behind()
+        if self.pending is not None:
+            self.pending.result()
+            self.pending = None
+
+    def final_flush(self):
+        """Last write on the way out, done in the calling thread; safe after executors have shut down"""
+        try:
+            if self.pending is not None:
+                self.pending.result()  # Whatever the writer thread already had
+        except Exception as e:
+            print(f"Error saving stats: {e}")
+        self.pending = None
+        self.closed = True  # submit() now writes in place
+        self.flush()
+
+    def shutdown(self, final_snapshot=True):
+        # Fold the journal into a final snapshot on the way out
+        if final_snapshot:
+            self.compact()
+        self.flush()
+        self.submit(self.close_files)
+        self.closed = True
+        self.executor.shutdown(wait=True)
+
+    def close_files(self):
+        if self.journal_file is not None:
+            self.journal_file.close()
+            self.journal_file = None
+
+class SqliteStatsStore(StatsWriter):
+    """Optional SQLite backend: every event is an indexed row and the latest snapshot
+    lives in its own table. Events are inserted in batches, one transaction per batch,
+    on the writer thread; readers get their own short-lived connections (WAL mode)."""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            seq INTEGER PRIMARY KEY,
+            ts INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            type TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 1,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+        CREATE INDEX IF NOT EXISTS events_type_ts ON events (type, ts);
+        CREATE TABLE IF NOT EXISTS snapshot (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            seq INTEGER NOT NULL,
+            data TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path, snapshot, batch_ms=500, batch_size=64, snapshot_events=1000, parent=None):
+        super().__init__(path, snapshot, parent=parent)
+        self.connection = None  # Only touched on the writer thread
+        self.batch = []
+        self.batch_size = batch_size
+        self.snapshot_events = snapshot_events
+        self.events_since_snapshot = 0
+        
+        self.batch_timer = QTimer(self)
+        self.batch_timer.setSingleShot(True)
+        self.batch_timer.setInterval(batch_ms)
+        self.batch_timer.timeout.connect(instrumentation.wrap("stats_batch", self.flush_batch))
+
+    def connect(self):
+        # Only one thread uses a connection at a time: the writer, then the final flush once it has stopped
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(self.SCHEMA)
+        return connection
+
+    def writer_connection(self):
+        if self.connection is None:
+            self.connection = self.connect()
+        return self.connection
+
+    @staticmethod
+    def event_row(event):
+        when = datetime.fromisoformat(event["ts"])
+        return (event["seq"], int(when.timestamp()), when.date().isoformat(),
+                event["type"], event.get("count", 1), json.dumps(event))
+
+    def append(self, event):
+        self.seq += 1
+        event["seq"] = self.seq
+        self.batch.append(event)
+        if len(self.batch) >= self.batch_size:
+            self.flush_batch()
+        elif not self.batch_timer.isActive():
+            self.batch_timer.start()
+        
+        # Snapshot now and then so startup replay stays short
+        self.events_since_snapshot += 1
+        if self.events_since_snapshot >= self.snapshot_events:
+            self.compact()
+
+    def clear(self):
+        # Rows left from an earlier stint on this backend are superseded by a migration
+        self.batch = []
+        self.seq = 0
+        self.submit(self.delete_rows)
+
+    def delete_rows(self):
+        try:
+            connection = self.writer_connection()
+            with connection:
+                connection.execute("DELETE FROM events")
+                connection.execute("DELETE FROM snapshot")
+        except Exception as e:
+            print(f"Error clearing stats events: {e}")
+
+    def import_events(self, events):
+        # Bulk load (used by the stats.json migration) in a single transaction
+        for event in events:
+            self.seq += 1
+            event["seq"] = self.seq
+        self.submit(self.insert_rows, [self.event_row(event) for event in events])
+
+    def flush_batch(self):
+        try:
+            self.batch_timer.stop()
+        except RuntimeError:
+            pass  # Qt side already torn down during interpreter exit
+        if not self.batch:
+            return
+        rows = [self.event_row(event) for event in self.batch]
+        self.batch = []
+        self.submit(self.insert_rows, rows)
+
+    def insert_rows(self, rows):
+        try:
+            connection = self.writer_connection()
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?)", rows)
+        except Exception as e:
+            print(f"Error writing stats events: {e}")
+
+    def write_behind(self):
+        # Queue pending events ahead of the snapshot that includes them
+        self.flush_batch()
+        self.events_since_snapshot = 0
+        super().write_behind()
+
+    def write_snapshot(self, data):
+        try:
+            connection = self.writer_connection()
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO snapshot VALUES (1, ?, ?)",
+                                   (data["journal_seq"], json.dumps(data)))
+            self.writes += 1
+        except Exception as e:
+            print(f"Error saving stats: {e}")
+
+    def flush(self):
+        self.flush_batch()
+        super().flush()
+
+    def close_files(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def read_snapshot(self):
+        if not os.path.exists(self.path):
+            return None
+        connection = self.connect()
+        try:
+            row = connection.execute("SELECT data FROM snapshot WHERE id = 1").fetchone()
+        finally:
+            connection.close()
+        return json.loads(row[0]) if row else None
+
+    def snapshot_mtime(self):
+        return os.path.getmtime(self.path)
+
+    def read_journal(self, after_seq=0):
+        self.seq = after_seq
+        if not os.path.exists(self.path):
+            return []
+        connection = self.connect()
+        try:
+            events = [json.loads(data) for (data,) in connection.execute(
+                "SELECT data FROM events WHERE seq > ? ORDER BY seq", (after_seq,))]
+            self.seq = max(after_seq, connection.execute("SELECT MAX(seq) FROM events").fetchone()[0] or 0)
+        finally:
+            connection.close()
+        return events
+
+    def daily_counts(self, event_type, days=90):
+        """(day, count) pairs for one event type over the last `days` days"""
+        since = int(time.time()) - days * 86400
+        connection = self.connect()
+        try:
+            return connection.execute(
+                "SELECT day, SUM(count) FROM events WHERE type = ? AND ts >= ? GROUP BY day ORDER BY day",
+                (event_type, since)
+            ).fetchall()
+        finally:
+            connection.close()
+
+class StatsHistory:
+    """Per-day water and media counts in compact arrays, plus hour-of-day totals.
+    Days are Julian day numbers; a year of history takes about 3 KB."""
+    KINDS = ("water", "media")
+
+    def __init__(self, start_day=None):
+        self.start_day = start_day if start_day is not None else QDate.currentDate().toJulianDay()
+        self.days = {kind: array('I') for kind in self.KINDS}
+        self.hours = {kind: array('I', [0] * 24) for kind in self.KINDS}
+        # Water records from the old weekly format, which kept no per-day counts before start_day
+        self.streak_before_start = 0  # Days of a streak that ran up to start_day
+        self.best_before_start = 0
+
+    def __len__(self):
+        return len(self.days["water"])
+
+    def ensure_day(self, day):
+        # Grow the columns (at either end) so that `day` has a slot, and return its index
+        if day < self.start_day:
+            padding = array('I', [0]) * (self.start_day - day)
+            for column in self.days.values():
+                column[0:0] = padding
+            self.start_day = day
+        missing = day - self.start_day + 1 - len(self)
+        if missing > 0:
+            for column in self.days.values():
+                column.extend(array('I', [0]) * missing)
+        return day - self.start_day
+
+    def record(self, kind, when, count=1):
+        index = self.ensure_day(when.date().toJulianDay())
+        self.days[kind][index] += count
+        self.hours[kind][when.time().hour()] += count
+
+    def series(self, kind, end_day, count):
+        # `count` days ending at `end_day`, zero-filled outside the recorded range
+        first = end_day - count + 1 - self.start_day
+        values = self.days[kind][max(first, 0):max(end_day + 1 - self.start_day, 0)]
+        before = min(count, max(-first, 0))
+        return [0] * before + values.tolist() + [0] * (count - before - len(values))
+
+    def rolling_average(self, kind, window, end_day, count=1):
+        # Moving averages for the `count` days ending at `end_day`, from one prefix sum
+        prefix = [0] + list(accumulate(self.series(kind, end_day, count + window - 1)))
+        return [(prefix[i + window] - prefix[i]) / window for i in range(count)]
+
+    def streaks(self, kind, end_day):
+        """Current and longest runs of days with at least one event, up to `end_day`"""
+        values = self.series(kind, end_day, max(end_day - self.start_day + 1, 0))
+        runs = [[active, sum(1 for _ in group)] for active, group in groupby(v > 0 for v in values)]
+        if kind == "water" and self.streak_before_start:
+            if runs and runs[0][0]:
+                runs[0][1] += self.streak_before_start
+            else:
+                runs.insert(0, [True, self.streak_before_start])
+        longest = max((length for active, length in runs if active), default=0)
+        current = runs[-1][1] if runs and runs[-1][0] else 0
+        return current, longest
+
+    def best_day(self, kind):
+        column = self.days[kind]
+        best = max(column, default=0)
+        if kind == "water" and self.best_before_start > best:
+            return self.best_before_start, None  # Set before per-day history was kept
+        if not best:
+            return 0, None
+        return best, QDate.fromJulianDay(self.start_day + column.index(best))
+
+    def hour_histogram(self, kind):
+        return self.hours[kind].tolist()
+
+    def to_json(self):
+        def pack(column):
+            if sys.byteorder == "big":
+                column = array('I', column)
+                column.byteswap()
+            return base64.b64encode(column.tobytes()).decode("ascii")
+        return {
+            "start": QDate.fromJulianDay(self.start_day).toString(Qt.DateFormat.ISODate),
+            "days": {kind: pack(column) for kind, column in self.days.items()},
+            "hours": {kind: column.tolist() for kind, column in self.hours.items()},
+            "before_start": {"streak": self.streak_before_start, "best_day": self.best_before_start}
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        history = cls(QDate.fromString(data["start"], Qt.DateFormat.ISODate).toJulianDay())
+        for kind in cls.KINDS:
+            column = array('I')
+            column.frombytes(base64.b64decode(data["days"].get(kind, "")))
+            if sys.byteorder == "big":
+                column.byteswap()
+            history.days[kind] = column
+            history.hours[kind] = array('I', data["hours"].get(kind, [0] * 24))
+        before_start = data.get("before_start", {})
+        history.streak_before_start = before_start.get("streak", 0)
+        history.best_before_start = before_start.get("best_day", 0)
+        # Keep the columns the same length
+        history.ensure_day(history.start_day + max(len(c) for c in history.days.values()) - 1)
+        return history
+
+    @classmethod
+    def from_weekly(cls, stats):
+        # Seed from the old format: seven completed days plus today
+        today = QDate.fromString(stats["daily"]["date"], Qt.DateFormat.ISODate).toJulianDay()
+        history = cls(today - 7)
+        history.days["water"] = array('I', stats["weekly"]["water_count"][-7:] + [stats["daily"]["water_count"]])
+        history.days["media"] = array('I', stats["weekly"]["songs_played"][-7:] + [stats["daily"]["songs_played"]])
+        history.ensure_day(today)
+        
+        # The old streak counted completed days up to yesterday; what is older than the seeded week carries over
+        history.streak_before_start = max(stats["weekly"].get("streak", 0) - 7, 0)
+        history.best_before_start = stats["weekly"].get("best_day", 0)
+        return history
 
 class CatCompanion(QMainWindow):
+    DIALOG_OPEN_TARGET_MS = 100  # Reopening a cached dialog should feel instant
+    STARTUP_SNAPSHOT_PATH = "startup_snapshot.json"
+    STARTUP_FRAME_PATH = "startup_frame.png"
+    STARTUP_SNAPSHOT_VERSION = 1
+    FRAME_CACHE_DIR = "frame_cache"
+    GIF_PRELOAD_FRAMES = 4
+    ASSET_DIR = "assets"
+    BUNDLED_ASSETS = ("cat.gif", "notification.mp3", "purr.mp3")
+
     def __init__(self):
         super().__init__()
         # Initialize default settings
@@ -546,8 +2359,18 @@ class CatCompanion(QMainWindow):
         self.is_dragging = False
         self.is_resizing = False
         self.resize_handle_size = 10
+        self.pending_resize = None
         self.show_media_controls = True
         self.cat_name = "Kitty"  # Default cat name
+        self.particle_budget = 256  # Maximum number of hearts alive at once
+        self.frame_cache_mb = 64  # Memory cap for pre-scaled GIF frames
+        
+        self.stats_backend = "json"  # "json" or "sqlite"
+        self.stats_store_backend = "json"  # The backend holding the latest stats; differs after a switch
+        self.instrumentation_enabled = False  # Count timer wakeups and callback time
+        
+        self.instrumentation = instrumentation
+        self.frame_profiler = FrameProfiler()
         
         # Initialize stats tracking
         self.stats = {
@@ -555,7 +2378,8 @@ class CatCompanion(QMainWindow):
                 "water_count": 0,
                 "songs_played": 0,
                 "start_time": QTime.currentTime(),
-                "last_water_time": None
+                "last_water_time": None,
+                "date": QDate.currentDate().toString(Qt.DateFormat.ISODate)
             },
             "weekly": {
                 "water_count": [0] * 7,  # Last 7 days
@@ -576,13 +2400,14 @@ class CatCompanion(QMainWindow):
             }
         }
         
-        # Load stats from file
-        self.load_stats()
+        # Day-by-day history the weekly summary is derived from
+        self.history = StatsHistory()
         
-        # Setup daily stats reset timer
+        # Setup daily stats reset timer (armed once stats are loaded)
         self.daily_reset_timer = QTimer(self)
-        self.daily_reset_timer.timeout.connect(self.check_daily_reset)
-        self.daily_reset_timer.start(60000)  # Check every minute
+        self.daily_reset_timer.setSingleShot(True)
+        self.daily_reset_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.daily_reset_timer.timeout.connect(instrumentation.wrap("daily_reset_timer", self.check_daily_reset))
         
         # Cute reminder messages
         self.reminder_messages = [
@@ -598,8 +2423,10 @@ class CatCompanion(QMainWindow):
             "🐱 Sending positive vibes and water reminders!"
         ]
         
-        # Load settings if exist
-        self.load_settings()
+        # Heart sprites are rasterised per theme colour by apply_theme
+        self.heart_sprites = HeartSprites()
+        self.media_icons = MediaIcons()
+        self.theme = None
         
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint |
@@ -616,81 +2443,212 @@ class CatCompanion(QMainWindow):
         self.cat_label = QLabel(self.central_widget)
         self.cat_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.cat_label.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.cat_label.setScaledContents(True)  # Enable scaling
-        
-        # Set stylesheet for rounded corners
-        self.cat_label.setStyleSheet("""
-            QLabel {
-                border-radius: 15px;
-            }
-        """)
+        self.cat_label.setScaledContents(False)  # Frames come pre-scaled from the GIF cache
+        
+        self.cat_label.setObjectName("catLabel")  # Rounded corners come from the theme
+        
+        # Animations are suspended whenever the cat cannot actually be seen
+        self.animations_running = True
+        self.gif_work_while_suspended = 0  # Decodes and renders while hidden; should stay at zero
+        self.suspended_gif_work = None
+        self.window_hooks_installed = False
+        self.session_monitor = WindowsSessionMonitor(self) if sys.platform == "win32" else SessionMonitor(self)
+        self.session_monitor.lockedChanged.connect(lambda locked: self.update_animation_state())
+        
+        # Live resizes are applied at most once per display frame
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(16)
+        self.resize_timer.timeout.connect(instrumentation.wrap("resize_timer", self.apply_pending_resize))
+        
+        # Display-scaled frames are kept on disk so later launches skip decoding
+        self.frame_disk_cache = FrameCache(self.FRAME_CACHE_DIR)
+        
+        # Changed GIFs are opened on a worker thread while the current one keeps playing
+        self.gif_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gif-loader")
+        self.pending_gif = None
+        self.gif_future = None
+        
+        # Picked GIFs and sounds are copied in and optimised on a worker thread
+        self.asset_store = AssetStore(self.ASSET_DIR, self)
+        self.pending_imports = []  # Source paths whose imported or importFailed signal has not arrived yet
+        self.asset_store.imported.connect(self.asset_imported)
+        self.asset_store.importFailed.connect(self.asset_import_failed)
+        
+        # Sounds and media keys load their backends the first time they are used
+        self.media_player = SoundEffect()
+        self.purr_player = SoundEffect()
+        self.media_keys = MediaKeys()
+        
+        # Setup reminder timer (started once settings are loaded)
+        self.reminder_timer = QTimer(self)
+        self.reminder_timer.timeout.connect(instrumentation.wrap("reminder_timer", self.show_reminder))
         
-        # Create media controls first
-        self.setup_media_controls()
+        # Dialogs are created on first open and kept alive
+        self.dialogs = {}
+        self.dialog_open_ms = {}
         
-        # Load the cat GIF
-        self.load_gif()
+        # Setup hover animation
+        self.hover_animation = None
+        self.original_pos = None
         
-        # Create system tray icon
-        self.tray_icon = QSystemTrayIcon(self)
-        self.tray_icon.setIcon(QIcon("cat.gif"))
-        self.tray_icon.setVisible(True)
+        # Reminders, pets and achievements are painted by one overlay above the cat
+        self.notifications = NotificationManager(self)
+        self.frame_stats_overlay = FrameStatsOverlay(self)
         
-        # Setup media player for sound
-        self.media_player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.media_player.setAudioOutput(self.audio_output)
+        # Setup click animation (the timer only runs while particles are alive)
+        self.click_particles = ParticleStore(self.particle_budget)
+        self.particle_wakeups = 0
+        self.particle_timer = QTimer(self)
+        self.particle_timer.setInterval(16)  # 60 FPS
+        self.particle_timer.timeout.connect(instrumentation.wrap("particle_timer", self.update_particles))
+        
+        # Only the area the hearts covered last frame and cover now gets repainted
+        self.particle_dirty_rect = QRectF()
+        self.repainted_pixels = RateCounter()
+        startup_profile.mark("window")
+        
+        # Settings, stats and the GIF load in phases; media controls, tray icon and menus come last
+        self.startup_phases = deque([
+            ("settings", self.load_settings_phase),
+            ("stats", self.load_stats_phase),
+            ("gif", self.load_gif),
+        ])
+        self.startup_finished = False
+        self.finish_startup_scheduled = False
+        
+        # With last session's frame on screen the phases can wait until it has been painted
+        self.restored_geometry = self.show_startup_snapshot()
+        if not self.restored_geometry:
+            while self.startup_phases:
+                self.run_startup_phase()
+    
+    def run_startup_phase(self):
+        """Run the next startup phase, handing back to the event loop between phases"""
+        if not self.startup_phases:
+            self.finish_startup()
+            return
+        name, phase = self.startup_phases.popleft()
+        phase()
+        startup_profile.mark(name)
+        if self.finish_startup_scheduled:
+            QTimer.singleShot(0, self.run_startup_phase)
+    
+    def load_settings_phase(self):
+        self.load_settings()
+        self.migrate_assets()
+        instrumentation.set_enabled(self.instrumentation_enabled)
+        if self.particle_budget != self.click_particles.budget:
+            self.click_particles = ParticleStore(self.particle_budget)
         self.load_sound()
-        self.audio_output.setVolume(0.5)
-        
-        # Setup purr sound player
-        self.purr_player = QMediaPlayer()
-        self.purr_audio_output = QAudioOutput()
-        self.purr_player.setAudioOutput(self.purr_audio_output)
         self.load_purr_sound()
-        self.purr_audio_output.setVolume(0.5)
-        
-        # Create context menu
-        self.create_context_menu()
-        
-        # Setup reminder timer
-        self.reminder_timer = QTimer(self)
-        self.reminder_timer.timeout.connect(self.show_reminder)
         self.reminder_timer.start(self.reminder_interval)
-        
-        # Apply theme after all UI elements are created
         self.apply_theme()
+    
+    def load_stats_phase(self):
+        # Stats are written behind on a worker thread, with a final flush on exit
+        self.stats_writer = self.create_stats_store()
+        atexit.register(self.final_stats_flush)  # Covers every exit that skips cleanup_and_exit
+        self.install_shutdown_handlers()
         
-        # Setup hover animation
-        self.hover_animation = None
-        self.original_pos = None
-        
-        # Update startup registry
-        self.update_startup_registry()
+        # Load stats from file
+        self.load_stats()
+        self.arm_daily_reset_timer()  # Fires once, at the next local midnight
+    
+    def show_startup_snapshot(self):
+        """Put last session's window geometry and first frame up straight away"""
+        try:
+            if not os.path.exists(self.STARTUP_SNAPSHOT_PATH):
+                return False
+            with open(self.STARTUP_SNAPSHOT_PATH, "r") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != self.STARTUP_SNAPSHOT_VERSION:
+                return False
+            
+            # Settings saved after the snapshot (a crash skips the one on exit) may name another GIF
+            settings_gif_path = self.gif_path
+            if os.path.exists("settings.json"):
+                with open("settings.json", "r") as f:
+                    settings_gif_path = json.load(f).get("gif_path", settings_gif_path)
+            if not os.path.exists(settings_gif_path):
+                settings_gif_path = "cat.gif"  # What gif_failed falls back to at startup
+            if snapshot["gif_path"] != settings_gif_path:
+                return False
+            
+            # A GIF that changed since the snapshot would flash the wrong cat
+            gif = os.stat(snapshot["gif_path"])
+            if gif.st_mtime != snapshot["gif_mtime"] or gif.st_size != snapshot["gif_size"]:
+                return False
+            
+            # Only restore onto a screen that is still there
+            geometry = QRect(snapshot["x"], snapshot["y"], snapshot["width"], snapshot["height"])
+            if QApplication.screenAt(geometry.center()) is None:
+                return False
+            
+            frame = QPixmap(snapshot["frame"])
+            if frame.isNull():
+                return False
+            frame.setDevicePixelRatio(snapshot["device_pixel_ratio"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error loading startup snapshot: {e}")
+            return False
+        
+        self.show_media_controls = snapshot["show_media_controls"]
+        self.setGeometry(geometry)
+        self.cat_label.setGeometry(0, 0, snapshot["label_width"], snapshot["label_height"])
+        self.cat_label.setPixmap(frame)
+        return True
+    
+    def save_startup_snapshot(self):
+        """Keep the window geometry and the frame on screen for the next launch"""
+        try:
+            frame = self.cat_label.pixmap()
+            if frame is None or frame.isNull() or not os.path.exists(self.current_gif_path):
+                return
+            if not frame.save(self.STARTUP_FRAME_PATH, "PNG"):
+                return
+            
+            gif = os.stat(self.current_gif_path)
+            geometry = self.geometry()
+            snapshot = {
+                "version": self.STARTUP_SNAPSHOT_VERSION,
+                "x": geometry.x(),
+                "y": geometry.y(),
+                "width": geometry.width(),
+                "height": geometry.height(),
+                "label_width": self.cat_label.width(),
+                "label_height": self.cat_label.height(),
+                "show_media_controls": self.show_media_controls,
+                "device_pixel_ratio": frame.devicePixelRatio(),
+                "frame": self.STARTUP_FRAME_PATH,
+                "gif_path": self.current_gif_path,
+                "gif_mtime": gif.st_mtime,
+                "gif_size": gif.st_size,
+            }
+            with open(self.STARTUP_SNAPSHOT_PATH, "w") as f:
+                json.dump(snapshot, f)
+        except Exception as e:
+            print(f"Error saving startup snapshot: {e}")
+    
+    def finish_startup(self):
+        """Build everything the first frame does not need"""
+        if self.startup_finished:
+            return
+        self.startup_finished = True
         
-        # Create notification label with improved styling
-        self.notification_label = QLabel(self)
-        self.notification_label.setStyleSheet(f"""
-            QLabel {{
-                background-color: rgba(255, 192, 203, 180);
-                color: white;
-                padding: 12px 24px;
-                border-radius: 15px;
-                font-size: 14px;
-                font-weight: bold;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }}
-        """)
-        self.notification_label.hide()
+        # Media controls, then the tray icon and its menu
+        self.setup_media_controls()
+        self.update_media_controls_position()
         
-        # Setup click animation
-        self.click_particles = []
-        self.particle_timer = QTimer(self)
-        self.particle_timer.timeout.connect(self.update_particles)
-        self.particle_timer.start(16)  # 60 FPS
+        self.tray_icon = QSystemTrayIcon(self)
+        self.tray_icon.setIcon(self.gif_tray_icon())
+        self.tray_icon.setVisible(True)
+        self.create_context_menu()
+        startup_profile.mark("deferred ui")
         
         # Show welcome message
-        QTimer.singleShot(1000, self.show_welcome_message)
+        QTimer.singleShot(1000, instrumentation.wrap("welcome_message", self.show_welcome_message))
+        startup_profile.report()
     
     def load_settings(self):
         try:
@@ -710,6 +2668,11 @@ class CatCompanion(QMainWindow):
                     self.creator_name = settings.get("creator_name", self.creator_name)
                     self.show_media_controls = settings.get("show_media_controls", self.show_media_controls)
                     self.cat_name = settings.get("cat_name", self.cat_name)
+                    self.particle_budget = settings.get("particle_budget", self.particle_budget)
+                    self.frame_cache_mb = settings.get("frame_cache_mb", self.frame_cache_mb)
+                    self.stats_backend = settings.get("stats_backend", self.stats_backend)
+                    self.stats_store_backend = settings.get("stats_store_backend", self.stats_store_backend)
+                    self.instrumentation_enabled = settings.get("instrumentation", self.instrumentation_enabled)
         except Exception as e:
             print(f"Error loading settings: {e}")
     
@@ -725,40 +2688,171 @@ class CatCompanion(QMainWindow):
                 "theme_color": self.theme_color,
                 "creator_name": self.creator_name,
                 "show_media_controls": self.show_media_controls,
-                "cat_name": self.cat_name
+                "cat_name": self.cat_name,
+                "particle_budget": self.particle_budget,
+                "frame_cache_mb": self.frame_cache_mb,
+                "stats_backend": self.stats_backend,
+                "stats_store_backend": self.stats_store_backend,
+                "instrumentation": self.instrumentation_enabled
             }
             with open("settings.json", "w") as f:
                 json.dump(settings, f)
         except Exception as e:
             print(f"Error saving settings: {e}")
     
-    def load_gif(self):
-        try:
-            if os.path.exists(self.gif_path):
-                if hasattr(self, 'movie'):
-                    self.movie.stop()
-                
-                self.movie = QMovie(self.gif_path)
-                self.cat_label.setMovie(self.movie)
-                self.movie.start()
-                self.current_gif_path = self.gif_path
-                self.update_window_size()
-            else:
-                # Fallback to default
-                if self.gif_path != "cat.gif":
-                    self.gif_path = "cat.gif"
-                    self.load_gif()
-        except Exception as e:
-            print(f"Error loading GIF: {e}")
-            # Fallback to default
-            if self.gif_path != "cat.gif":
-                self.gif_path = "cat.gif"
-                self.load_gif()
+    def load_gif(self, background=False):
+        """Open gif_path; in the background the current animation keeps playing until the new one is ready"""
+        if self.pending_gif is not None and self.pending_gif.path == self.gif_path:
+            return  # Already on its way
+        if not os.path.exists(self.gif_path):
+            self.gif_failed(self.gif_path, f"{self.gif_path} not found")
+            return
+        self.cancel_pending_gif()
+        gif = GifAnimation(self.gif_path, self.frame_cache_mb * 1024 * 1024,
+                           disk_cache=self.frame_disk_cache, parent=self)
+        gif.prepared.connect(self.gif_prepared)
+        self.pending_gif = gif
+        if background:
+            self.gif_future = self.gif_loader.submit(gif.prepare, self.GIF_PRELOAD_FRAMES)
+        else:
+            gif.prepare()
+    
+    def cancel_pending_gif(self):
+        """Drop a pick that has not finished preparing; one already running stops at its next check"""
+        if self.pending_gif is None:
+            return
+        self.pending_gif.superseded = True
+        if self.gif_future is not None and self.gif_future.cancel():
+            self.pending_gif.deleteLater()  # Never started, so prepared will not arrive
+        self.pending_gif = None
+        self.gif_future = None
+    
+    def gif_prepared(self, gif):
+        if gif is not self.pending_gif:
+            gif.deleteLater()
+            return
+        self.pending_gif = None
+        self.gif_future = None
+        if gif.error:
+            gif.deleteLater()
+            self.gif_failed(gif.path, gif.error)
+            return
+        
+        # Swap in one step: the old animation stops the moment the new one starts
+        old_gif = getattr(self, 'gif', None)
+        self.gif = gif
+        self.gif.frameChanged.connect(self.show_gif_frame)
+        self.gif.frameChanged.connect(self.profile_gif_frame)
+        self.frame_profiler.reset_gif()
+        self.current_gif_path = gif.path
+        if hasattr(self, 'tray_icon'):
+            self.tray_icon.setIcon(self.gif_tray_icon())
+        if old_gif is not None:
+            old_gif.stop()
+            old_gif.abandon_writes()
+            old_gif.deleteLater()
+        self.retired_gif = old_gif  # Its mapped frames may still be on the label until the next frame lands
+        self.update_window_size()
+        self.gif.start()
+        if not self.animations_running:
+            self.gif.setPaused(True)
+    
+    def gif_failed(self, path, message):
+        print(f"Error loading GIF: {message}")
+        if hasattr(self, 'gif'):
+            # Keep what is already playing
+            self.gif_path = self.current_gif_path
+            self.save_settings()
+            if self.startup_finished:
+                self.show_custom_notification("⚠️ Couldn't load that GIF, keeping the current one", duration=3000)
+        elif path != "cat.gif":
+            # Nothing on screen yet: fall back to the bundled GIF once
+            self.gif_path = "cat.gif"
+            self.load_gif()
+    
+    def gif_tray_icon(self):
+        content_hash = self.gif.content_hash if hasattr(self, 'gif') else None
+        return self.asset_store.tray_icon(self.current_gif_path, content_hash)
+    
+    def gif_import_size(self):
+        # Largest size the GIF is ever shown at, in device pixels
+        max_width, max_height = self.max_gif_size()
+        device_pixel_ratio = QApplication.primaryScreen().devicePixelRatio()
+        return QSize(int(max_width * device_pixel_ratio), int(max_height * device_pixel_ratio))
+    
+    def import_asset(self, path):
+        """Copy a picked GIF or sound into the asset store; settings follow once it is ready"""
+        # The bundled files ship beside the app and are never copied
+        if not path or path in self.BUNDLED_ASSETS or self.asset_store.is_managed(path) or not os.path.exists(path):
+            return
+        is_gif = os.path.splitext(path)[1].lower() == ".gif"
+        self.pending_imports.append(path)
+        self.asset_store.import_async(path, self.gif_import_size() if is_gif else None)
+    
+    def migrate_assets(self):
+        # Paths from older settings still point outside the store
+        for path in {self.gif_path, self.sound_path, self.purr_sound_path}:
+            self.import_asset(path)
+    
+    def asset_imported(self, source, stored, report):
+        self.pending_imports.remove(source)
+        changed = False
+        for attribute, reload in (("gif_path", lambda: self.load_gif(background=True)),
+                                  ("sound_path", self.load_sound),
+                                  ("purr_sound_path", self.load_purr_sound)):
+            if getattr(self, attribute) == source:
+                setattr(self, attribute, stored)
+                if attribute != "gif_path" or hasattr(self, 'gif'):
+                    reload()  # A GIF not loaded yet picks up the stored copy in its startup phase
+                changed = True
+        
+        # A settings dialog still showing the picked file saves the stored copy instead
+        dialog = self.dialogs.get("settings")
+        if dialog is not None:
+            for field in (dialog.gif_path, dialog.sound_path):
+                if field.text() == source:
+                    field.setText(stored)
+        if changed:
+            self.save_settings()
+        self.collect_assets()
+        
+        if "source_memory" in report and report["stored_memory"] >= report["source_memory"]:
+            print("GIF imported unchanged: it already fits and has no repeated frames")
+        elif "source_memory" in report:
+            message = (f"GIF optimised: {self.format_bytes(report['source_bytes'])} → "
+                       f"{self.format_bytes(report['stored_bytes'])} on disk, "
+                       f"{self.format_bytes(report['source_memory'])} → "
+                       f"{self.format_bytes(report['stored_memory'])} decoded "
+                       f"({report['source_frames'] - report['stored_frames']} duplicate frames dropped)")
+            print(message)
+            if self.startup_finished:
+                self.show_custom_notification(f"✨ {message}", duration=4000)
+    
+    def collect_assets(self):
+        # Until every import has landed, a setting may still name a source whose blob is already stored
+        if self.pending_imports:
+            return
+        self.asset_store.collect_async([self.gif_path, self.current_gif_path, self.sound_path,
+                                        self.current_sound_path, self.purr_sound_path])
+    
+    def asset_import_failed(self, source, message):
+        # The original file stays in use
+        print(f"Error importing {source}: {message}")
+        self.pending_imports.remove(source)
+        self.collect_assets()
+    
+    @staticmethod
+    def format_bytes(size):
+        for unit in ("B", "KB", "MB"):
+            if size < 1024:
+                return f"{size:.0f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
     
     def load_sound(self):
         try:
             if os.path.exists(self.sound_path):
-                self.media_player.setSource(QUrl.fromLocalFile(self.sound_path))
+                self.media_player.setSource(self.sound_path)
                 self.current_sound_path = self.sound_path
             else:
                 # Fallback to default
@@ -775,7 +2869,7 @@ class CatCompanion(QMainWindow):
     def load_purr_sound(self):
         try:
             if os.path.exists(self.purr_sound_path):
-                self.purr_player.setSource(QUrl.fromLocalFile(self.purr_sound_path))
+                self.purr_player.setSource(self.purr_sound_path)
                 self.current_purr_sound_path = self.purr_sound_path
             else:
                 print(f"Purr sound file not found: {self.purr_sound_path}")
@@ -783,13 +2877,10 @@ class CatCompanion(QMainWindow):
             print(f"Error loading purr sound: {e}")
     
     def update_window_size(self):
-        if hasattr(self, 'movie') and self.movie:
-            original_size = self.movie.frameRect().size()
+        if hasattr(self, 'gif') and self.gif:
+            original_size = self.gif.frame_size
             
-            # Get the screen size
-            screen = QApplication.primaryScreen().geometry()
-            max_width = screen.width() * 0.3  # Maximum 30% of screen width
-            max_height = screen.height() * 0.3  # Maximum 30% of screen height
+            max_width, max_height = self.max_gif_size()
             
             # Calculate scale factor to fit within screen bounds while maintaining aspect ratio
             width_scale = max_width / original_size.width()
@@ -808,6 +2899,12 @@ class CatCompanion(QMainWindow):
             if self.show_media_controls:
                 total_height += 40  # Height for media controls
             
+            # A size restored from last session's snapshot wins over the GIF's default
+            if self.restored_geometry:
+                self.restored_geometry = False
+                self.show_gif_frame()
+                return
+            
             # Resize window
             self.resize(scaled_width, total_height)
             
@@ -816,7 +2913,30 @@ class CatCompanion(QMainWindow):
             if self.show_media_controls:
                 self.update_media_controls_position()
     
+    def max_gif_size(self):
+        # Get the screen size
+        screen = QApplication.primaryScreen().geometry()
+        max_width = screen.width() * 0.3  # Maximum 30% of screen width
+        max_height = screen.height() * 0.3  # Maximum 30% of screen height
+        return max_width, max_height
+    
+    def show_gif_frame(self, frame=None):
+        # Serve the current frame from the cache at the label's size
+        if not hasattr(self, 'gif'):
+            return
+        if frame is None:
+            frame = self.gif.current_frame
+        if frame < 0:
+            return
+        # Use cheap nearest-neighbour scaling while the resize handle is held
+        pixmap = self.gif.scaled_frame(frame, self.cat_label.size(), self.devicePixelRatioF(),
+                                       smooth=not self.is_resizing)
+        if pixmap is not None:
+            self.cat_label.setPixmap(pixmap)
+    
     def update_media_controls_position(self):
+        if not hasattr(self, 'media_controls'):
+            return  # Built after the first frame
         if self.show_media_controls:
             # Position media controls directly under the GIF
             self.media_controls.setGeometry(
@@ -830,24 +2950,17 @@ class CatCompanion(QMainWindow):
             self.media_controls.hide()
     
     def apply_theme(self):
-        # Update context menu style
-        self.context_menu.setStyleSheet(f"""
-            QMenu {{
-                background-color: #FFF0F5;
-                border: 1px solid {self.theme_color};
-                border-radius: 8px;
-                padding: 5px;
-            }}
-            QMenu::item {{
-                padding: 8px 30px 8px 30px;
-                color: {self.theme_color};
-                border-radius: 4px;
-            }}
-            QMenu::item:selected {{
-                background-color: {self.theme_color};
-                color: white;
-            }}
-        """)
+        # Re-rasterise the heart sprites in the new colour
+        self.heart_sprites.rebuild(self.theme_color, self.devicePixelRatioF())
+        
+        # Media icons follow the theme colour too
+        self.refresh_media_icons()
+        
+        # Restyle the whole app once, and only when the colour actually changed
+        theme = Theme.for_color(self.theme_color)
+        if theme is not self.theme:
+            self.theme = theme
+            theme.install(QApplication.instance())
     
     def update_startup_registry(self):
         # For Windows only
@@ -872,6 +2985,7 @@ class CatCompanion(QMainWindow):
     
     def create_context_menu(self):
         self.context_menu = QMenu()
+        self.context_menu.setObjectName("catContextMenu")
         
         # Add menu actions
         test_reminder_action = QAction("Test Reminder", self)
@@ -897,6 +3011,25 @@ class CatCompanion(QMainWindow):
         about_action = QAction("About", self)
         about_action.triggered.connect(self.show_about)
         
+        # Diagnostics submenu
+        self.diagnostics_menu = QMenu("Diagnostics", self.context_menu)
+        self.diagnostics_menu.setObjectName("catContextMenu")
+        self.instrumentation_action = QAction("Record Wakeups", self)
+        self.instrumentation_action.setCheckable(True)
+        self.instrumentation_action.setChecked(self.instrumentation_enabled)
+        self.instrumentation_action.triggered.connect(self.toggle_instrumentation)
+        diagnostics_action = QAction("Show Diagnostics", self)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        self.frame_times_action = QAction("Show Frame Times", self)
+        self.frame_times_action.setCheckable(True)
+        self.frame_times_action.triggered.connect(self.toggle_frame_times)
+        dump_diagnostics_action = QAction("Save Diagnostics JSON", self)
+        dump_diagnostics_action.triggered.connect(self.dump_diagnostics)
+        self.diagnostics_menu.addAction(self.instrumentation_action)
+        self.diagnostics_menu.addAction(diagnostics_action)
+        self.diagnostics_menu.addAction(self.frame_times_action)
+        self.diagnostics_menu.addAction(dump_diagnostics_action)
+        
         exit_action = QAction("Exit", self)
         exit_action.triggered.connect(self.cleanup_and_exit)
         
@@ -906,6 +3039,7 @@ class CatCompanion(QMainWindow):
         self.context_menu.addAction(achievements_action)
         self.context_menu.addAction(settings_action)
         self.context_menu.addAction(about_action)
+        self.context_menu.addMenu(self.diagnostics_menu)
         self.context_menu.addAction(exit_action)
         
         # Apply theme to context menu
@@ -933,17 +3067,151 @@ class CatCompanion(QMainWindow):
             else:
                 self.show()
     
+    def showEvent(self, event):
+        super().showEvent(event)
+        window = self.windowHandle()
+        if window is not None and not self.window_hooks_installed:
+            # Exposure and screen changes are only reported on the native window
+            window.installEventFilter(self)
+            window.screenChanged.connect(self.on_screen_changed)
+            self.session_monitor.attach(self)
+            self.window_hooks_installed = True
+        self.update_animation_state()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_animation_state()
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_animation_state()
+    
+    def eventFilter(self, obj, event):
+        if obj is self.windowHandle() and event.type() == QEvent.Type.Expose:
+            self.update_animation_state()
+        return super().eventFilter(obj, event)
+    
+    def nativeEvent(self, event_type, message):
+        if event_type == b"windows_generic_MSG":
+            import ctypes.wintypes
+            msg = ctypes.wintypes.MSG.from_address(int(message))
+            self.session_monitor.handle_native_message(msg.message, msg.wParam)
+            if msg.message == 0x001E:  # WM_TIMECHANGE
+                self.check_daily_reset()
+            elif msg.message == 0x0218 and msg.wParam in (0x7, 0x12):  # WM_POWERBROADCAST: resumed
+                self.check_daily_reset()
+        return super().nativeEvent(event_type, message)
+    
+    def on_screen_changed(self, screen):
+        self.update_animation_state()
+        # The new screen may have a different device pixel ratio
+        self.show_gif_frame()
+        self.refresh_media_icons()
+    
+    def is_actually_visible(self):
+        window = self.windowHandle()
+        return (self.isVisible() and not self.isMinimized()
+                and (window is None or window.isExposed())
+                and not self.session_monitor.locked)
+    
+    def update_animation_state(self):
+        running = self.is_actually_visible()
+        if running == self.animations_running:
+            return
+        self.animations_running = running
+        
+        animations = [getattr(self, 'hover_animation', None)]
+        if hasattr(self, 'notifications'):
+            animations += self.notifications.animations()
+        if running:
+            if self.suspended_gif_work is not None:
+                gif, work = self.suspended_gif_work
+                if gif is getattr(self, 'gif', None):
+                    self.gif_work_while_suspended += gif.work_done() - work
+                self.suspended_gif_work = None
+            
+            # Pick up on the frame we stopped at
+            if hasattr(self, 'gif'):
+                self.gif.setPaused(False)
+            if self.click_particles:
+                self.particle_timer.start()
+            for animation in animations:
+                if animation and animation.state() == QAbstractAnimation.State.Paused:
+                    animation.resume()
+            if hasattr(self, 'notifications'):
+                self.notifications.set_paused(False)
+        else:
+            if hasattr(self, 'gif'):
+                self.gif.setPaused(True)
+                self.suspended_gif_work = (self.gif, self.gif.work_done())
+            self.frame_profiler.reset_gif()
+            self.particle_timer.stop()
+            for animation in animations:
+                if animation and animation.state() == QAbstractAnimation.State.Running:
+                    animation.pause()
+            if hasattr(self, 'notifications'):
+                self.notifications.set_paused(True)
+    
     def contextMenuEvent(self, event):
-        self.context_menu.exec(event.globalPos())
+        if hasattr(self, 'context_menu'):
+            self.context_menu.exec(event.globalPos())
     
     def show_settings(self):
-        dialog = SettingsDialog(self)
-        dialog.exec()
+        from dialogs import SettingsDialog
+        self.open_dialog("settings", SettingsDialog)
     
     def show_about(self):
-        dialog = AboutDialog(self)
+        from dialogs import AboutDialog
+        self.open_dialog("about", AboutDialog)
+    
+    def show_diagnostics(self):
+        from dialogs import DiagnosticsDialog
+        self.open_dialog("diagnostics", DiagnosticsDialog)
+    
+    def toggle_instrumentation(self):
+        self.instrumentation_enabled = self.instrumentation_action.isChecked()
+        instrumentation.set_enabled(self.instrumentation_enabled)
+        self.save_settings()
+    
+    def toggle_frame_times(self):
+        # Frame times are only sampled while the readout is on screen
+        active = self.frame_times_action.isChecked()
+        self.frame_profiler.set_enabled(active)
+        self.frame_stats_overlay.set_active(active)
+    
+    def profile_gif_frame(self, index):
+        if self.frame_profiler.enabled:
+            self.frame_profiler.gif_frame(index, self.gif.delays)
+    
+    def dump_diagnostics(self):
+        try:
+            instrumentation.dump("diagnostics.json", frames=self.frame_profiler.summary(),
+                                 gif_work_while_suspended=self.gif_work_while_suspended,
+                                 repaint=self.repaint_summary())
+            self.show_custom_notification("📊 Diagnostics saved to diagnostics.json", duration=2000)
+        except Exception as e:
+            print(f"Error saving diagnostics: {e}")
+    
+    def open_dialog(self, name, dialog_class):
+        # Dialogs are built once on first use, then only refreshed when reopened
+        started = time.perf_counter()
+        dialog = self.dialogs.get(name)
+        if dialog is None:
+            dialog = self.dialogs[name] = dialog_class(self)
+        else:
+            dialog.refresh()
+        
+        # The first event loop pass inside exec() happens once the dialog is on screen
+        QTimer.singleShot(0, lambda: self.record_dialog_latency(name, started))
         dialog.exec()
     
+    def record_dialog_latency(self, name, started):
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.dialog_open_ms[name] = latency_ms
+        if latency_ms > self.DIALOG_OPEN_TARGET_MS:
+            print(f"{name} dialog took {latency_ms:.0f} ms to open (target {self.DIALOG_OPEN_TARGET_MS} ms)")
+    
     def show_reminder(self):
         # Don't show if paused
         if self.paused:
@@ -956,7 +3224,7 @@ class CatCompanion(QMainWindow):
         self.increment_water_count()
         
         # Show random reminder message with checkmark
-        self.show_custom_notification(f"✅ {random.choice(self.reminder_messages)}")
+        self.show_custom_notification(f"✅ {random.choice(self.reminder_messages)}", kind="reminder")
     
     def show_welcome_message(self):
         current_hour = QTime.currentTime().hour()
@@ -972,62 +3240,31 @@ class CatCompanion(QMainWindow):
             duration=4000
         )
 
-    def show_custom_notification(self, message, duration=3000):
-        self.notification_label.setText(message)
-        self.notification_label.adjustSize()
-        
-        # Calculate maximum width based on GIF width with padding
-        max_width = self.cat_label.width() - 40  # 20px padding on each side
-        if self.notification_label.width() > max_width:
-            self.notification_label.setWordWrap(True)
-            self.notification_label.setFixedWidth(max_width)
-            self.notification_label.adjustSize()
-        
-        # Position notification at the top center with padding
-        self.notification_label.move(
-            self.cat_label.x() + (self.cat_label.width() - self.notification_label.width()) // 2,
-            self.cat_label.y() + 10  # 10px from top
-        )
-        
-        # Show with fade effect
-        self.notification_label.setWindowOpacity(0.0)
-        self.notification_label.show()
-        
-        # Create fade in animation
-        fade_in = QPropertyAnimation(self.notification_label, b"windowOpacity")
-        fade_in.setDuration(500)
-        fade_in.setStartValue(0.0)
-        fade_in.setEndValue(1.0)
-        fade_in.setEasingCurve(QEasingCurve.Type.OutCubic)
-        fade_in.start()
-        
-        # Create fade out animation
-        self.fade_animation = QPropertyAnimation(self.notification_label, b"windowOpacity")
-        self.fade_animation.setDuration(500)
-        self.fade_animation.setEasingCurve(QEasingCurve.Type.InCubic)
-        self.fade_animation.finished.connect(lambda: self.notification_label.hide())
-        
-        # Start fade out after duration
-        QTimer.singleShot(duration, self.start_fade_out)
-
-    def start_fade_out(self):
-        if self.notification_label.isVisible():
-            self.fade_animation.setStartValue(1.0)
-            self.fade_animation.setEndValue(0.0)
-            self.fade_animation.start()
+    def show_custom_notification(self, message, duration=3000, kind="info"):
+        self.notifications.notify(message, kind, duration)
     
     def cleanup_and_exit(self):
         # Stop all timers
         self.reminder_timer.stop()
         
+        # Make sure the last stats changes reach the disk
+        self.stats_writer.shutdown()
+        self.asset_store.shutdown()
+        self.cancel_pending_gif()
+        self.gif_loader.shutdown(wait=False)
+        
+        # Let the next launch show this frame before anything has loaded
+        self.save_startup_snapshot()
+        
         # Stop media player
         self.media_player.stop()
         
         # Stop the GIF animation
-        self.movie.stop()
+        self.gif.stop()
         
         # Hide the tray icon
-        self.tray_icon.hide()
+        if hasattr(self, 'tray_icon'):
+            self.tray_icon.hide()
         
         # Close the window
         self.close()
@@ -1062,6 +3299,8 @@ class CatCompanion(QMainWindow):
                 self.is_resizing = True
                 self.resize_start_pos = event.globalPosition().toPoint()
                 self.resize_start_size = self.size()
+                refresh_rate = self.screen().refreshRate() if self.screen() else 60
+                self.resize_timer.setInterval(max(1, int(1000 / (refresh_rate or 60))))
             else:
                 self.is_dragging = True
                 self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
@@ -1075,8 +3314,8 @@ class CatCompanion(QMainWindow):
             new_height = max(100, self.resize_start_size.height() + delta.y())
             
             # Maintain aspect ratio based on original GIF size
-            if hasattr(self, 'movie') and self.movie:
-                original_size = self.movie.frameRect().size()
+            if hasattr(self, 'gif') and self.gif:
+                original_size = self.gif.frame_size
                 aspect_ratio = original_size.width() / original_size.height()
                 
                 if new_width / new_height > aspect_ratio:
@@ -1084,29 +3323,34 @@ class CatCompanion(QMainWindow):
                 else:
                     new_height = int(new_width / aspect_ratio)
             
-            # Update window size
-            self.resize(new_width, new_height)
-            
-            # Update cat label size
-            self.cat_label.setGeometry(0, 0, new_width, new_height)
-            
-            # Update media controls position if shown
-            if self.show_media_controls:
-                self.update_media_controls_position()
-            
-            self.update()
+            # Coalesce resizes to at most one per display frame; resizeEvent does the layout
+            self.pending_resize = QSize(new_width, new_height)
+            if not self.resize_timer.isActive():
+                self.resize_timer.start()
         elif self.is_dragging and event.buttons() == Qt.MouseButton.LeftButton:
             self.move(event.globalPosition().toPoint() - self.drag_position)
             event.accept()
             
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
+            was_resizing = self.is_resizing
             self.is_dragging = False
             self.is_resizing = False
+            if was_resizing:
+                # Apply the last requested size, then do one high quality rescale
+                self.resize_timer.stop()
+                self.apply_pending_resize()
+                self.show_gif_frame()
             # Update the original position after dragging completes
             self.original_pos = self.pos()
             event.accept()
             
+    def apply_pending_resize(self):
+        if self.pending_resize is not None:
+            size = self.pending_resize
+            self.pending_resize = None
+            self.resize(size)
+            
     def enterEvent(self, event):
         # Check if cursor is in resize handle area
         if (self.width() - self.resize_handle_size <= event.position().x() <= self.width() and
@@ -1139,126 +3383,93 @@ class CatCompanion(QMainWindow):
             self.hover_animation.start()
 
     def paintEvent(self, event):
+        started = time.perf_counter()
+        if not self.finish_startup_scheduled:
+            # Everything else waits until this first frame is on screen
+            self.finish_startup_scheduled = True
+            startup_profile.mark("first frame")
+            QTimer.singleShot(0, self.run_startup_phase)
         super().paintEvent(event)
+        self.repainted_pixels.add(event.rect().width() * event.rect().height())
         
         if self.click_particles:
             painter = QPainter(self)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            
-            for particle in self.click_particles:
-                painter.setOpacity(particle['opacity'])
-                
-                # Draw heart shape
-                path = QPainterPath()
-                size = particle['size']
-                x, y = particle['pos'].x(), particle['pos'].y()
-                
-                path.moveTo(x, y + size / 4)
-                path.cubicTo(
-                    x, y, 
-                    x - size / 2, y,
-                    x - size / 2, y + size / 4
-                )
-                path.cubicTo(
-                    x - size / 2, y + size / 2,
-                    x, y + size * 3/4,
-                    x, y + size
-                )
-                path.cubicTo(
-                    x, y + size * 3/4,
-                    x + size / 2, y + size / 2,
-                    x + size / 2, y + size / 4
-                )
-                path.cubicTo(
-                    x + size / 2, y,
-                    x, y,
-                    x, y + size / 4
-                )
-                
-                painter.fillPath(path, QBrush(QColor(self.theme_color)))
+            self.heart_sprites.draw(painter, self.click_particles, self.theme_color, self.devicePixelRatioF())
+            painter.end()
+        
+        if self.frame_profiler.enabled:
+            self.frame_profiler.record("paint", (time.perf_counter() - started) * 1000)
 
     def create_heart_particles(self, pos):
-        for _ in range(8):  # Create 8 particles
-            particle = {
-                'pos': QPointF(pos.x(), pos.y()),
-                'velocity': QPointF(
-                    random.uniform(-2, 2),  # Random horizontal velocity
-                    random.uniform(-4, -2)  # Upward velocity
-                ),
-                'opacity': 1.0,
-                'size': random.uniform(15, 25)  # Random size
-            }
-            self.click_particles.append(particle)
+        self.click_particles.spawn(pos.x(), pos.y(), 8)  # Create 8 particles
+        self.update_particle_region()
+        
+        # Wake the particle clock up only now that there is something to animate
+        if self.animations_running and not self.particle_timer.isActive():
+            self.particle_timer.start()
 
     def update_particles(self):
+        self.particle_wakeups += 1
         if not self.click_particles:
+            self.particle_timer.stop()
             return
         
-        # Update particles
-        for particle in self.click_particles[:]:
-            # Apply gravity
-            particle['velocity'].setY(particle['velocity'].y() + 0.1)
-            
-            # Update position
-            particle['pos'] += particle['velocity']
-            
-            # Fade out
-            particle['opacity'] -= 0.02
-            
-            if particle['opacity'] <= 0:
-                self.click_particles.remove(particle)
+        # Apply gravity, move, fade out and drop expired particles in one batch
+        self.click_particles.step()
         
-        # Trigger repaint
-        self.update()
+        # Stop the clock once the last particle has expired
+        if not self.click_particles:
+            self.particle_timer.stop()
+        
+        # Repaint only where the hearts were and where they are now
+        self.update_particle_region()
+
+    def update_particle_region(self):
+        new_rect = self.click_particles.bounds()
+        dirty_rect = self.particle_dirty_rect.united(new_rect)
+        if not dirty_rect.isEmpty():
+            self.update(dirty_rect.toAlignedRect())
+        self.particle_dirty_rect = new_rect
+
+    def repaint_summary(self):
+        """Window pixels repainted and particle clock ticks, the numbers dirty-region painting is judged by"""
+        return {
+            "repainted_pixels_per_second": self.repainted_pixels.rate(),
+            "repainted_pixels_total": self.repainted_pixels.total,
+            "particle_wakeups": self.particle_wakeups,
+        }
 
     def media_previous(self):
-        self.increment_songs_played()
-        win32api.keybd_event(0xB1, 0, 0, 0)  # VK_MEDIA_PREV_TRACK
-        win32api.keybd_event(0xB1, 0, win32con.KEYEVENTF_KEYUP, 0)
+        self.increment_songs_played("previous")
+        self.media_keys.press(MediaKeys.PREVIOUS)
 
     def media_play_pause(self):
-        self.increment_songs_played()
+        self.increment_songs_played("play_pause")
         # Toggle between play and pause icons
-        if hasattr(self, 'is_playing') and self.is_playing:
-            self.play_pause_button.setIcon(QIcon(QPixmap.fromImage(QImage.fromData(f"""
-                <svg width="24" height="24" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-                    <path d="M6 19H10V5H6V19Z" fill="{self.theme_color}"/>
-                    <path d="M14 19H18V5H14V19Z" fill="{self.theme_color}"/>
-                </svg>
-            """.encode()))))
-        else:
-            self.play_pause_button.setIcon(QIcon(QPixmap.fromImage(QImage.fromData(f"""
-                <svg width="24" height="24" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-                    <path d="M8 5V19L19 12L8 5Z" fill="{self.theme_color}"/>
-                </svg>
-            """.encode()))))
+        self.play_pause_icon = "pause" if getattr(self, 'is_playing', False) else "play"
+        self.play_pause_button.setIcon(self.media_icon(self.play_pause_icon))
         self.is_playing = not getattr(self, 'is_playing', False)
-        win32api.keybd_event(0xB3, 0, 0, 0)  # VK_MEDIA_PLAY_PAUSE
-        win32api.keybd_event(0xB3, 0, win32con.KEYEVENTF_KEYUP, 0)
+        self.media_keys.press(MediaKeys.PLAY_PAUSE)
 
     def media_next(self):
-        self.increment_songs_played()
-        win32api.keybd_event(0xB0, 0, 0, 0)  # VK_MEDIA_NEXT_TRACK
-        win32api.keybd_event(0xB0, 0, win32con.KEYEVENTF_KEYUP, 0)
+        self.increment_songs_played("next")
+        self.media_keys.press(MediaKeys.NEXT)
 
     def media_volume_up(self):
-        self.increment_songs_played()
-        win32api.keybd_event(0xAF, 0, 0, 0)  # VK_VOLUME_UP
-        win32api.keybd_event(0xAF, 0, win32con.KEYEVENTF_KEYUP, 0)
+        self.increment_songs_played("volume_up")
+        self.media_keys.press(MediaKeys.VOLUME_UP)
 
     def media_volume_down(self):
-        self.increment_songs_played()
-        win32api.keybd_event(0xAE, 0, 0, 0)  # VK_VOLUME_DOWN
-        win32api.keybd_event(0xAE, 0, win32con.KEYEVENTF_KEYUP, 0)
+        self.increment_songs_played("volume_down")
+        self.media_keys.press(MediaKeys.VOLUME_DOWN)
 
     def media_mute(self):
-        self.increment_songs_played()
-        win32api.keybd_event(0xAD, 0, 0, 0)  # VK_VOLUME_MUTE
-        win32api.keybd_event(0xAD, 0, win32con.KEYEVENTF_KEYUP, 0)
+        self.increment_songs_played("mute")
+        self.media_keys.press(MediaKeys.MUTE)
 
     def keyPressEvent(self, event):
         # Handle custom keyboard shortcuts
-        if event.modifiers() == Qt.KeyboardModifier.ControlModifier:
+        if self.startup_finished and event.modifiers() == Qt.KeyboardModifier.ControlModifier:
             if event.key() == Qt.Key.Key_Left:
                 self.media_previous()
             elif event.key() == Qt.Key.Key_Right:
@@ -1290,60 +3501,37 @@ class CatCompanion(QMainWindow):
     def setup_media_controls(self):
         # Create media controls widget with minimal styling
         self.media_controls = QWidget(self)
-        self.media_controls.setStyleSheet(f"""
-            QPushButton {{
-                background-color: transparent;
-                border: none;
-                border-radius: 6px;
-                padding: 6px;
-            }}
-            QPushButton:hover {{
-                background-color: rgba(255, 192, 203, 0.3);
-            }}
-        """)
-        
-        # Create custom SVG icons with dynamic color
-        def create_svg_icon(path_data):
-            return f"""
-                <svg width="20" height="20" viewBox="0 0 24 24" fill="none" xmlns="http://www.w3.org/2000/svg">
-                    <path d="{path_data}" fill="{self.theme_color}"/>
-                </svg>
-            """
-        
-        prev_icon = create_svg_icon("M6 6h2v12H6V6zm3.5 6l7.5-6v12l-7.5-6z")
-        play_icon = create_svg_icon("M8 5v14l11-7z")
-        pause_icon = create_svg_icon("M6 19h4V5H6v14zm8-14v14h4V5h-4z")
-        next_icon = create_svg_icon("M16 6h2v12h-2V6zM6 6l7.5 6L6 18V6z")
-        vol_down_icon = create_svg_icon("M3 9v6h4l5 5V4L7 9H3zm13.5 3c0-1.77-1.02-3.29-2.5-4.03v8.05c1.48-.73 2.5-2.25 2.5-4.02z")
-        vol_up_icon = create_svg_icon("M3 9v6h4l5 5V4L7 9H3zm13.5 3c0-1.77-1.02-3.29-2.5-4.03v8.05c1.48-.73 2.5-2.25 2.5-4.02zM14 3.23v2.06c2.89.86 5 3.54 5 6.71s-2.11 5.85-5 6.71v2.06c4.01-.91 7-4.49 7-8.77s-2.99-7.86-7-8.77z")
-        mute_icon = create_svg_icon("M3 9v6h4l5 5V4L7 9H3zm7-4.17v2.51l3-3v-2.51l-3 3zm0 15.34l3 3v-2.51l-3-3v2.51zM14 3.23v2.06c2.89.86 5 3.54 5 6.71s-2.11 5.85-5 6.71v2.06c4.01-.91 7-4.49 7-8.77s-2.99-7.86-7-8.77z")
+        self.media_controls.setObjectName("mediaControls")
+        
+        # Icons come from the shared cache and are swapped by name
+        self.play_pause_icon = "play"
         
         # Create simple buttons
-        def create_button(icon):
+        def create_button(icon_name):
             button = QPushButton(self.media_controls)
-            button.setIcon(QIcon(QPixmap.fromImage(QImage.fromData(icon.encode()))))
-            button.setIconSize(QSize(20, 20))
+            button.setIcon(self.media_icon(icon_name))
+            button.setIconSize(QSize(MediaIcons.SIZE, MediaIcons.SIZE))
             button.setFixedSize(32, 32)
             button.setCursor(Qt.CursorShape.PointingHandCursor)
             return button
         
         # Create all buttons
-        self.prev_button = create_button(prev_icon)
+        self.prev_button = create_button("previous")
         self.prev_button.clicked.connect(self.media_previous)
         
-        self.play_pause_button = create_button(play_icon)
+        self.play_pause_button = create_button(self.play_pause_icon)
         self.play_pause_button.clicked.connect(self.media_play_pause)
         
-        self.next_button = create_button(next_icon)
+        self.next_button = create_button("next")
         self.next_button.clicked.connect(self.media_next)
         
-        self.vol_down_button = create_button(vol_down_icon)
+        self.vol_down_button = create_button("volume_down")
         self.vol_down_button.clicked.connect(self.media_volume_down)
         
-        self.vol_up_button = create_button(vol_up_icon)
+        self.vol_up_button = create_button("volume_up")
         self.vol_up_button.clicked.connect(self.media_volume_up)
         
-        self.mute_button = create_button(mute_icon)
+        self.mute_button = create_button("mute")
         self.mute_button.clicked.connect(self.media_mute)
         
         # Simple horizontal layout
@@ -1361,35 +3549,26 @@ class CatCompanion(QMainWindow):
         media_layout.addWidget(self.vol_up_button)
         media_layout.addWidget(self.mute_button)
 
+    def media_icon(self, name):
+        return self.media_icons.icon(name, self.theme_color, self.devicePixelRatioF())
+    
+    def refresh_media_icons(self):
+        # Look every button's icon up again for the current colour and pixel ratio
+        if not hasattr(self, 'play_pause_button'):
+            return
+        self.prev_button.setIcon(self.media_icon("previous"))
+        self.play_pause_button.setIcon(self.media_icon(self.play_pause_icon))
+        self.next_button.setIcon(self.media_icon("next"))
+        self.vol_down_button.setIcon(self.media_icon("volume_down"))
+        self.vol_up_button.setIcon(self.media_icon("volume_up"))
+        self.mute_button.setIcon(self.media_icon("mute"))
+
     def load_stats(self):
         try:
-            if os.path.exists("stats.json"):
-                with open("stats.json", "r") as f:
-                    saved_stats = json.load(f)
-                    
-                    # Migrate old stats format to new format if needed
-                    self.migrate_stats_format(saved_stats)
-                    
-                    # Update current stats with saved data
-                    self.stats.update(saved_stats)
-                    
-                    # Convert string times back to QTime objects
-                    if isinstance(self.stats["daily"]["start_time"], str):
-                        self.stats["daily"]["start_time"] = QTime.fromString(self.stats["daily"]["start_time"], "hh:mm:ss")
-                    if isinstance(self.stats["daily"]["last_water_time"], str):
-                        self.stats["daily"]["last_water_time"] = QTime.fromString(self.stats["daily"]["last_water_time"], "hh:mm:ss")
-                    
-                    # Check if we need to reset daily stats
-                    current_time = QTime.currentTime()
-                    if self.stats["daily"]["start_time"]:
-                        # Calculate time difference in seconds
-                        start_secs = self.stats["daily"]["start_time"].msecsSinceStartOfDay() // 1000
-                        current_secs = current_time.msecsSinceStartOfDay() // 1000
-                        if current_secs < start_secs:  # New day
-                            self.reset_daily_stats()
-            else:
-                # Initialize stats file if it doesn't exist
-                self.initialize_stats()
+            if self.stats_store_backend != self.stats_backend:
+                self.migrate_stats_store()
+            
+            if not self.read_stats(self.stats_writer):
                 self.save_stats()
         except Exception as e:
             print(f"Error loading stats: {e}")
@@ -1397,6 +3576,101 @@ class CatCompanion(QMainWindow):
             self.initialize_stats()
             self.save_stats()
 
+    def read_stats(self, store, catch_up=True):
+        """Load the snapshot and journal from store; returns whether a snapshot existed"""
+        saved_stats = store.read_snapshot()
+        snapshot_exists = saved_stats is not None
+        snapshot_seq = 0
+        if snapshot_exists:
+            snapshot_seq = saved_stats.pop("journal_seq", 0)
+            saved_history = saved_stats.pop("history", None)
+            
+            # Migrate old stats format to new format if needed
+            self.migrate_stats_format(saved_stats)
+            
+            # Update current stats with saved data
+            self.stats.update(saved_stats)
+            
+            # Snapshots from before daily dates were tracked belong to the day they were written
+            if "date" not in self.stats["daily"]:
+                written = QDateTime.fromSecsSinceEpoch(int(store.snapshot_mtime()))
+                self.stats["daily"]["date"] = written.date().toString(Qt.DateFormat.ISODate)
+            
+            # Snapshots from before the history store carry only the weekly lists
+            if saved_history:
+                self.history = StatsHistory.from_json(saved_history)
+            else:
+                self.history = StatsHistory.from_weekly(self.stats)
+            
+            # Convert string times back to QTime objects
+            if isinstance(self.stats["daily"]["start_time"], str):
+                self.stats["daily"]["start_time"] = QTime.fromString(self.stats["daily"]["start_time"], "hh:mm:ss")
+            if isinstance(self.stats["daily"]["last_water_time"], str):
+                self.stats["daily"]["last_water_time"] = QTime.fromString(self.stats["daily"]["last_water_time"], "hh:mm:ss")
+        else:
+            # Initialize stats if there is no snapshot yet
+            self.initialize_stats()
+        
+        # Replay the changes journaled since the snapshot was taken
+        for event in store.read_journal(snapshot_seq):
+            self.apply_stats_event(event)
+        
+        # Roll forward over every day that passed while we were not running
+        if catch_up:
+            self.catch_up_days()
+        self.refresh_weekly_stats()
+        return snapshot_exists
+
+    def create_stats_store(self, backend=None):
+        if (backend or self.stats_backend) == "sqlite":
+            return SqliteStatsStore("stats.db", self.serialize_stats, parent=self)
+        return StatsWriter("stats.json", self.serialize_stats, "stats.journal", parent=self)
+
+    def migrate_stats_store(self):
+        """Bring the stats over from the backend used before stats_backend was switched, either way"""
+        target = self.stats_writer
+        source = self.create_stats_store(self.stats_store_backend)
+        try:
+            # Load through the old store so the usual format migration and replay apply
+            if source.read_snapshot() is not None:
+                self.read_stats(source, catch_up=False)  # Rollovers are journaled, and only to the new store
+                self.catch_up_days()
+                if isinstance(target, SqliteStatsStore):
+                    target.clear()
+                    
+                    # The per-day history becomes one aggregated row per day and kind
+                    events = []
+                    for kind in StatsHistory.KINDS:
+                        for index, count in enumerate(self.history.days[kind]):
+                            if count:
+                                day = QDate.fromJulianDay(self.history.start_day + index).toString(Qt.DateFormat.ISODate)
+                                events.append({"type": kind, "ts": f"{day}T12:00:00", "count": count, "migrated": True})
+                    target.import_events(events)
+                target.compact()
+                target.flush()
+        except Exception as e:
+            # Nothing is written or moved; the next launch tries again
+            print(f"Error migrating stats: {e}")
+            self.initialize_stats()
+            return
+        finally:
+            source.shutdown(final_snapshot=False)
+        
+        # The old files stay where they are, so switching back later imports the other way
+        self.stats_store_backend = self.stats_backend
+        self.save_settings()
+
+    def daily_counts(self, event_type, days=90):
+        """Per-day counts of "water" or "media" events over the last `days` days"""
+        if isinstance(self.stats_writer, SqliteStatsStore):
+            return self.stats_writer.daily_counts(event_type, days)
+        today = QDate.currentDate().toJulianDay()
+        counts = self.history.series(event_type, today, days)
+        return [
+            (QDate.fromJulianDay(today - days + 1 + offset).toString(Qt.DateFormat.ISODate), count)
+            for offset, count in enumerate(counts) if count
+        ]
+
     def migrate_stats_format(self, saved_stats):
         """Migrate old stats format to new format"""
         # Ensure daily stats exist
@@ -1458,12 +3732,14 @@ class CatCompanion(QMainWindow):
 
     def initialize_stats(self):
         """Initialize stats with default values"""
+        self.history = StatsHistory()
         self.stats = {
             "daily": {
                 "water_count": 0,
                 "songs_played": 0,
                 "start_time": QTime.currentTime(),
-                "last_water_time": None
+                "last_water_time": None,
+                "date": QDate.currentDate().toString(Qt.DateFormat.ISODate)
             },
             "weekly": {
                 "water_count": [0] * 7,  # Last 7 days
@@ -1484,168 +3760,184 @@ class CatCompanion(QMainWindow):
             }
         }
 
+    def serialize_stats(self):
+        """Copy the stats into plain JSON types, safe to hand to another thread"""
+        def plain(value):
+            if isinstance(value, dict):
+                return {key: plain(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [plain(item) for item in value]
+            if isinstance(value, QTime):
+                return value.toString("hh:mm:ss")
+            return value
+        data = plain(self.stats)
+        data["history"] = self.history.to_json()
+        return data
+
     def save_stats(self):
+        # Mark dirty; the writer coalesces changes and writes them off the GUI thread
+        self.stats_writer.mark_dirty()
+
+    def install_shutdown_handlers(self):
+        # Route SIGINT/SIGTERM through the event loop so stats get flushed before quitting
+        self.signal_sockets = socket.socketpair()
+        for sock in self.signal_sockets:
+            sock.setblocking(False)
         try:
-            # Convert QTime to string for JSON serialization
-            stats_to_save = self.stats.copy()
-            if isinstance(stats_to_save["daily"]["start_time"], QTime):
-                stats_to_save["daily"]["start_time"] = stats_to_save["daily"]["start_time"].toString("hh:mm:ss")
-            if isinstance(stats_to_save["daily"]["last_water_time"], QTime):
-                stats_to_save["daily"]["last_water_time"] = stats_to_save["daily"]["last_water_time"].toString("hh:mm:ss")
-            
-            with open("stats.json", "w") as f:
-                json.dump(stats_to_save, f, indent=4)  # Add indentation for better readability
-        except Exception as e:
-            print(f"Error saving stats: {e}")
+            signal.set_wakeup_fd(self.signal_sockets[1].fileno())
+        except ValueError as e:
+            print(f"Error installing shutdown handlers: {e}")
+            return
+        self.signal_notifier = QSocketNotifier(self.signal_sockets[0].fileno(), QSocketNotifier.Type.Read, self)
+        self.signal_notifier.activated.connect(self.drain_signal_socket)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self.handle_shutdown_signal)
+
+    def drain_signal_socket(self):
+        # Python runs the pending signal handlers as soon as we are back in it
+        try:
+            self.signal_sockets[0].recv(64)
+        except OSError:
+            pass
+
+    def handle_shutdown_signal(self, signum, frame):
+        QApplication.quit()  # The final flush runs at interpreter exit
+    
+    def final_stats_flush(self):
+        # Looked up at exit, since the stats store can be swapped by the SQLite migration
+        self.stats_writer.final_flush()
+
+    def arm_daily_reset_timer(self):
+        now = QDateTime.currentDateTime()
+        midnight = QDateTime(now.date().addDays(1), QTime(0, 0))
+        self.daily_reset_timer.start(max(1000, now.msecsTo(midnight) + 1000))
 
     def check_daily_reset(self):
-        current_time = QTime.currentTime()
-        if isinstance(self.stats["daily"]["start_time"], QTime):
-            # Calculate time difference in seconds
-            start_secs = self.stats["daily"]["start_time"].msecsSinceStartOfDay() // 1000
-            current_secs = current_time.msecsSinceStartOfDay() // 1000
-            if current_secs < start_secs:  # New day
-                self.reset_daily_stats()
-
-    def reset_daily_stats(self):
-        # Update weekly stats
-        self.stats["weekly"]["water_count"].pop(0)  # Remove oldest day
-        self.stats["weekly"]["water_count"].append(self.stats["daily"]["water_count"])
-        
-        self.stats["weekly"]["songs_played"].pop(0)  # Remove oldest day
-        self.stats["weekly"]["songs_played"].append(self.stats["daily"]["songs_played"])
-        
-        # Update streak
-        if self.stats["daily"]["water_count"] > 0:
-            self.stats["weekly"]["streak"] += 1
-        else:
-            self.stats["weekly"]["streak"] = 0
-            
-        # Update best day
-        if self.stats["daily"]["water_count"] > self.stats["weekly"]["best_day"]:
-            self.stats["weekly"]["best_day"] = self.stats["daily"]["water_count"]
+        # Called at midnight, and after clock changes or resume from sleep
+        self.catch_up_days()
+        self.arm_daily_reset_timer()
+
+    def catch_up_days(self):
+        stats_date = QDate.fromString(self.stats["daily"].get("date", ""), Qt.DateFormat.ISODate)
+        if not stats_date.isValid():
+            self.stats["daily"]["date"] = QDate.currentDate().toString(Qt.DateFormat.ISODate)
+            return
+        days = stats_date.daysTo(QDate.currentDate())
+        if days > 0:
+            self.reset_daily_stats(days)
+
+    def record_stats_event(self, event_type, **details):
+        # Apply the change locally, then journal it as one small append
+        # Make sure the change lands on the right day even if the midnight timer was late
+        if event_type != "rollover":
+            self.catch_up_days()
+        
+        event = {
+            "type": event_type,
+            "ts": QDateTime.currentDateTime().toString(Qt.DateFormat.ISODate),
+            **details
+        }
+        self.apply_stats_event(event)
+        self.stats_writer.append(event)
+
+    def apply_stats_event(self, event):
+        """Apply one journaled event to the stats; also used for replay at load"""
+        event_datetime = QDateTime.fromString(event["ts"], Qt.DateFormat.ISODate)
+        event_time = event_datetime.time()
+        if event["type"] == "water":
+            self.stats["daily"]["water_count"] += 1
+            self.stats["total"]["water_count"] += 1
+            self.stats["daily"]["last_water_time"] = event_time
+            self.history.record("water", event_datetime)
+        elif event["type"] == "media":
+            self.stats["daily"]["songs_played"] += 1
+            self.stats["total"]["songs_played"] += 1
+            self.history.record("media", event_datetime)
+        elif event["type"] == "rollover":
+            self.roll_daily_stats(event_datetime)
+        elif event["type"] == "achievement":
+            self.stats["achievements"][event["name"]] = True
+
+    def reset_daily_stats(self, days=1):
+        self.record_stats_event("rollover", days=days)
+
+    def roll_daily_stats(self, rollover_time):
+        # The history already holds every day's counts; make sure the new day has a slot
+        self.history.ensure_day(rollover_time.date().toJulianDay())
         
         # Reset daily stats
         self.stats["daily"] = {
             "water_count": 0,
             "songs_played": 0,
-            "start_time": QTime.currentTime(),
-            "last_water_time": None
+            "start_time": rollover_time.time(),
+            "last_water_time": None,
+            "date": rollover_time.date().toString(Qt.DateFormat.ISODate)
         }
         
         # Update total days used
         self.stats["total"]["days_used"] += 1
         
-        # Save updated stats
-        self.save_stats()
+        self.refresh_weekly_stats()
+
+    def refresh_weekly_stats(self):
+        """Derive the weekly summary from the history instead of patching it by hand"""
+        today = QDate.fromString(self.stats["daily"]["date"], Qt.DateFormat.ISODate).toJulianDay()
+        weekly = self.stats["weekly"]
+        weekly["water_count"] = self.history.series("water", today - 1, 7)
+        weekly["songs_played"] = self.history.series("media", today - 1, 7)
+        weekly["streak"] = self.history.streaks("water", today - 1)[0]
+        weekly["best_day"] = self.history.best_day("water")[0]
+
+    def unlock_achievement(self, name, title, message):
+        if not self.stats["achievements"][name]:
+            self.record_stats_event("achievement", name=name)
+            self.show_achievement(title, message)
 
     def increment_water_count(self):
-        self.stats["daily"]["water_count"] += 1
-        self.stats["total"]["water_count"] += 1
-        self.stats["daily"]["last_water_time"] = QTime.currentTime()
+        self.record_stats_event("water")
         
         # Check achievements
-        if not self.stats["achievements"]["first_sip"]:
-            self.stats["achievements"]["first_sip"] = True
-            self.show_achievement("First Sip", "You took your first sip with your cat companion!")
+        self.unlock_achievement("first_sip", "First Sip", "You took your first sip with your cat companion!")
         
         if self.stats["daily"]["water_count"] >= 8:
-            if not self.stats["achievements"]["hydration_hero"]:
-                self.stats["achievements"]["hydration_hero"] = True
-                self.show_achievement("Hydration Hero", "You drank water 8+ times today!")
+            self.unlock_achievement("hydration_hero", "Hydration Hero", "You drank water 8+ times today!")
         
         if self.stats["weekly"]["streak"] >= 7:
-            if not self.stats["achievements"]["consistent_companion"]:
-                self.stats["achievements"]["consistent_companion"] = True
-                self.show_achievement("Consistent Companion", "7-day streak achieved!")
-        
-        self.save_stats()
+            self.unlock_achievement("consistent_companion", "Consistent Companion", "7-day streak achieved!")
 
-    def increment_songs_played(self):
-        self.stats["daily"]["songs_played"] += 1
-        self.stats["total"]["songs_played"] += 1
+    def increment_songs_played(self, action="play_pause"):
+        self.record_stats_event("media", action=action)
         
         if self.stats["total"]["songs_played"] >= 50:
-            if not self.stats["achievements"]["music_master"]:
-                self.stats["achievements"]["music_master"] = True
-                self.show_achievement("Music Master", "You've played 50 songs!")
-        
-        self.save_stats()
+            self.unlock_achievement("music_master", "Music Master", "You've played 50 songs!")
 
     def show_achievement(self, title, message):
-        # Create achievement notification
-        achievement_label = QLabel(self)
-        achievement_label.setStyleSheet(f"""
-            QLabel {{
-                background-color: rgba(255, 215, 0, 200);
-                color: white;
-                padding: 12px 24px;
-                border-radius: 15px;
-                font-size: 14px;
-                font-weight: bold;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }}
-        """)
-        achievement_label.setText(f"🏆 {title}\n{message}")
-        achievement_label.adjustSize()
-        
-        # Calculate maximum width based on GIF width with padding
-        max_width = self.cat_label.width() - 40  # 20px padding on each side
-        if achievement_label.width() > max_width:
-            achievement_label.setWordWrap(True)
-            achievement_label.setFixedWidth(max_width)
-            achievement_label.adjustSize()
-        
-        # Position at top center with padding
-        achievement_label.move(
-            self.cat_label.x() + (self.cat_label.width() - achievement_label.width()) // 2,
-            self.cat_label.y() + 10  # 10px from top
-        )
-        
-        # Show with fade effect
-        achievement_label.setWindowOpacity(0.0)
-        achievement_label.show()
-        
-        # Create fade in animation
-        fade_in = QPropertyAnimation(achievement_label, b"windowOpacity")
-        fade_in.setDuration(500)
-        fade_in.setStartValue(0.0)
-        fade_in.setEndValue(1.0)
-        fade_in.setEasingCurve(QEasingCurve.Type.OutCubic)
-        fade_in.start()
-        
-        # Create fade out animation
-        fade_out = QPropertyAnimation(achievement_label, b"windowOpacity")
-        fade_out.setDuration(500)
-        fade_out.setEasingCurve(QEasingCurve.Type.InCubic)
-        fade_out.finished.connect(lambda: achievement_label.hide())
-        
-        # Start fade out after longer duration (5000ms = 5 seconds)
-        QTimer.singleShot(5000, lambda: fade_out.start())
+        self.notifications.achievement(title, message)
 
     def show_achievements(self):
-        dialog = AchievementsDialog(self)
-        dialog.exec()
+        from dialogs import AchievementsDialog
+        self.open_dialog("achievements", AchievementsDialog)
 
     def resizeEvent(self, event):
+        started = time.perf_counter()
         super().resizeEvent(event)
         
         # Update cat label size to match window width
         self.cat_label.setGeometry(0, 0, self.width(), self.height() - (40 if self.show_media_controls else 0))
+        self.show_gif_frame()
+        self.notifications.arrange()
+        if self.frame_stats_overlay.isVisible():
+            self.frame_stats_overlay.arrange()
         
         # Update media controls position and size
-        if self.show_media_controls:
-            self.media_controls.setGeometry(
-                0,  # Align with window
-                self.cat_label.height() + 4,  # Small gap after GIF
-                self.width(),  # Full window width
-                36  # Just enough height for the buttons
-            )
-            self.media_controls.show()
-        else:
-            self.media_controls.hide()
+        self.update_media_controls_position()
+        
+        if self.frame_profiler.enabled:
+            self.frame_profiler.record("resize", (time.perf_counter() - started) * 1000)
             
     def update_media_controls_position(self):
+        if not hasattr(self, 'media_controls'):
+            return  # Built after the first frame
         if self.show_media_controls:
             # Position media controls directly under the GIF
             self.media_controls.setGeometry(
@@ -1673,7 +3965,10 @@ class CatCompanion(QMainWindow):
         self.save_settings()
 
 if __name__ == '__main__':
+    startup_profile.enabled = "--startup-profile" in sys.argv
+    startup_profile.mark("imports")
     app = QApplication(sys.argv)
+    startup_profile.mark("qapplication")
     window = CatCompanion()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,454 @@
+"""Settings, about, achievements and diagnostics dialogs, imported the first time one is opened"""
+from PyQt6.QtWidgets import (QLabel, QDialog, QVBoxLayout, QPushButton, QFileDialog,
+                           QLineEdit, QSpinBox, QFormLayout, QCheckBox, QColorDialog,
+                           QHBoxLayout, QGroupBox, QWidget)
+from PyQt6.QtCore import Qt, QTimer, QTime, QDate
+from PyQt6.QtGui import QColor
+
+class SettingsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.setWindowTitle("Settings")
+        self.setMinimumWidth(400)
+        self.setMinimumHeight(600)  # Increased height for stats
+        self.setObjectName("settingsDialog")  # Styled by the application theme
+        
+        # Create main layout
+        main_layout = QVBoxLayout()
+        main_layout.setSpacing(20)
+        main_layout.setContentsMargins(20, 20, 20, 20)
+        
+        # Create form layout for settings
+        form_layout = QFormLayout()
+        form_layout.setSpacing(15)
+        form_layout.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
+        
+        # Add title
+        self.title_label = QLabel("Cat Companion Settings")
+        self.title_label.setObjectName("dialogTitle")
+        self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        main_layout.addWidget(self.title_label)
+        
+        # Create personalization group
+        personalization_group = QGroupBox("Personalization")
+        personalization_layout = QFormLayout()
+        
+        # Cat name
+        self.cat_name = QLineEdit()
+        self.cat_name.setPlaceholderText("Enter your cat's name")
+        personalization_layout.addRow("Cat's Name:", self.cat_name)
+        
+        # Theme color
+        color_layout = QHBoxLayout()
+        self.theme_color_button = QPushButton()
+        self.theme_color_button.setFixedSize(30, 30)
+        self.theme_color_button.clicked.connect(self.choose_color)
+        color_layout.addWidget(self.theme_color_button)
+        personalization_layout.addRow("Theme Color:", color_layout)
+        
+        personalization_group.setLayout(personalization_layout)
+        main_layout.addWidget(personalization_group)
+        
+        # Create reminder group
+        reminder_group = QGroupBox("Reminders")
+        reminder_layout = QFormLayout()
+        
+        # Reminder interval
+        interval_layout = QHBoxLayout()
+        self.interval_spinbox = QSpinBox()
+        self.interval_spinbox.setRange(1, 240)
+        self.interval_spinbox.setSuffix(" minutes")
+        interval_layout.addWidget(self.interval_spinbox)
+        reminder_layout.addRow("Reminder Interval:", interval_layout)
+        
+        # Custom reminder message
+        self.reminder_message = QLineEdit()
+        self.reminder_message.setPlaceholderText("Enter a custom reminder message")
+        reminder_layout.addRow("Custom Message:", self.reminder_message)
+        
+        reminder_group.setLayout(reminder_layout)
+        main_layout.addWidget(reminder_group)
+        
+        # Create customization group
+        customization_group = QGroupBox("Customization")
+        customization_layout = QFormLayout()
+        
+        # Custom GIF selector
+        gif_layout = QHBoxLayout()
+        self.gif_path = QLineEdit()
+        self.gif_path.setReadOnly(True)
+        
+        browse_gif_button = QPushButton("Browse...")
+        browse_gif_button.clicked.connect(self.browse_gif)
+        gif_layout.addWidget(self.gif_path)
+        gif_layout.addWidget(browse_gif_button)
+        customization_layout.addRow("Custom GIF:", gif_layout)
+        
+        # Custom Sound selector
+        sound_layout = QHBoxLayout()
+        self.sound_path = QLineEdit()
+        self.sound_path.setReadOnly(True)
+        
+        browse_sound_button = QPushButton("Browse...")
+        browse_sound_button.clicked.connect(self.browse_sound)
+        sound_layout.addWidget(self.sound_path)
+        sound_layout.addWidget(browse_sound_button)
+        customization_layout.addRow("Custom Sound:", sound_layout)
+        
+        customization_group.setLayout(customization_layout)
+        main_layout.addWidget(customization_group)
+        
+        # Create options group
+        options_group = QGroupBox("Options")
+        options_layout = QVBoxLayout()
+        
+        # Start with Windows option
+        self.start_with_windows = QCheckBox("Start with Windows")
+        options_layout.addWidget(self.start_with_windows)
+        
+        options_group.setLayout(options_layout)
+        main_layout.addWidget(options_group)
+        
+        # Add stats group
+        stats_group = QGroupBox("Your Stats")
+        stats_layout = QVBoxLayout()
+        
+        # Stats labels; their text is filled in by refresh_stats
+        self.daily_stats = QLabel()
+        self.weekly_stats = QLabel()
+        self.total_stats = QLabel()
+        self.achievements = QLabel()
+        for label in (self.daily_stats, self.weekly_stats, self.total_stats, self.achievements):
+            label.setObjectName("statsLabel")
+        
+        stats_layout.addWidget(self.daily_stats)
+        stats_layout.addWidget(self.weekly_stats)
+        stats_layout.addWidget(self.total_stats)
+        stats_layout.addWidget(self.achievements)
+        stats_group.setLayout(stats_layout)
+        main_layout.addWidget(stats_group)
+        
+        # Add stretch to push buttons to bottom
+        main_layout.addStretch()
+        
+        # Add buttons at the bottom
+        button_layout = QHBoxLayout()
+        
+        # Cancel button
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        cancel_button.setObjectName("cancelButton")
+        
+        # Save button
+        save_button = QPushButton("Save")
+        save_button.clicked.connect(self.save_settings)
+        
+        button_layout.addWidget(cancel_button)
+        button_layout.addWidget(save_button)
+        main_layout.addLayout(button_layout)
+        
+        self.setLayout(main_layout)
+        self.refresh()
+    
+    def refresh(self):
+        # Bring a kept-alive dialog up to date without rebuilding its widgets
+        parent = self.parent
+        self.cat_name.setText(parent.cat_name)
+        self.theme_color = parent.theme_color
+        self.update_color_button()
+        self.interval_spinbox.setValue(parent.reminder_interval // 60000)  # Convert ms to minutes
+        self.reminder_message.setText(parent.reminder_message)
+        self.gif_path.setText(parent.gif_path)
+        self.sound_path.setText(parent.sound_path)
+        self.start_with_windows.setChecked(parent.start_with_windows)
+        self.refresh_stats()
+    
+    def refresh_stats(self):
+        parent = self.parent
+        
+        # Daily stats
+        self.daily_stats.setText(
+            f"<h3>Today's Progress</h3>"
+            f"Water count: {parent.stats['daily']['water_count']}<br>"
+            f"Songs played: {parent.stats['daily']['songs_played']}<br>"
+            f"Last water: {parent.stats['daily']['last_water_time'].toString('hh:mm:ss') if isinstance(parent.stats['daily']['last_water_time'], QTime) else 'Never'}"
+        )
+        
+        # Weekly stats, computed in bulk from the history
+        history = parent.history
+        yesterday = QDate.currentDate().toJulianDay() - 1
+        current_streak, longest_streak = history.streaks("water", yesterday)
+        best_day, best_date = history.best_day("water")
+        water_hours = history.hour_histogram("water")
+        self.weekly_stats.setText(
+            f"<h3>Weekly Progress</h3>"
+            f"Current streak: {current_streak} days<br>"
+            f"Longest streak: {longest_streak} days<br>"
+            f"Best day: {best_day} drinks"
+            f"{best_date.toString(' (MMM d, yyyy)') if best_date else ''}<br>"
+            f"Average daily: {history.rolling_average('water', 7, yesterday)[0]:.1f} drinks "
+            f"(30 days: {history.rolling_average('water', 30, yesterday)[0]:.1f})<br>"
+            f"Total songs this week: {sum(history.series('media', yesterday, 7))}<br>"
+            f"Favourite water hour: "
+            f"{f'{water_hours.index(max(water_hours)):02d}:00' if any(water_hours) else 'None yet'}"
+        )
+        
+        # Total stats
+        self.total_stats.setText(
+            f"<h3>Total Progress</h3>"
+            f"Total water count: {parent.stats['total']['water_count']}<br>"
+            f"Total songs played: {parent.stats['total']['songs_played']}<br>"
+            f"Days used: {parent.stats['total']['days_used']}"
+        )
+        
+        # Achievements
+        self.achievements.setText(
+            f"<h3>Achievements</h3>"
+            f"{'🏆' if parent.stats['achievements']['first_sip'] else '🔒'} First Sip<br>"
+            f"{'🏆' if parent.stats['achievements']['hydration_hero'] else '🔒'} Hydration Hero<br>"
+            f"{'🏆' if parent.stats['achievements']['consistent_companion'] else '🔒'} Consistent Companion<br>"
+            f"{'🏆' if parent.stats['achievements']['music_master'] else '🔒'} Music Master"
+        )
+    
+    def update_color_button(self):
+        self.theme_color_button.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {self.theme_color};
+                border-radius: 15px;
+                border: 2px solid white;
+            }}
+            QPushButton:hover {{
+                border: 2px solid #FF1493;
+            }}
+        """)
+    
+    def choose_color(self):
+        color = QColorDialog.getColor(QColor(self.theme_color), self)
+        if color.isValid():
+            self.theme_color = color.name()
+            self.update_color_button()
+    
+    def browse_gif(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select GIF", "", "GIF Files (*.gif)"
+        )
+        if file_path:
+            self.gif_path.setText(file_path)
+    
+    def browse_sound(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Sound", "", "Sound Files (*.mp3 *.wav)"
+        )
+        if file_path:
+            self.sound_path.setText(file_path)
+    
+    def save_settings(self):
+        self.parent.reminder_interval = self.interval_spinbox.value() * 60000  # Convert to ms
+        self.parent.reminder_message = self.reminder_message.text()
+        self.parent.gif_path = self.gif_path.text()
+        self.parent.sound_path = self.sound_path.text()
+        start_with_windows_changed = self.parent.start_with_windows != self.start_with_windows.isChecked()
+        self.parent.start_with_windows = self.start_with_windows.isChecked()
+        self.parent.theme_color = self.theme_color
+        self.parent.cat_name = self.cat_name.text()
+        
+        # Update reminder timer
+        self.parent.reminder_timer.stop()
+        self.parent.reminder_timer.start(self.parent.reminder_interval)
+        
+        # Update GIF if changed
+        if self.parent.current_gif_path != self.parent.gif_path:
+            self.parent.load_gif(background=True)  # The current GIF plays until the new one is ready
+        
+        # Update sound if changed
+        if self.parent.current_sound_path != self.parent.sound_path:
+            self.parent.load_sound()
+        
+        # Copy newly picked files into the asset store; settings switch to the stored copies once ready
+        self.parent.import_asset(self.parent.gif_path)
+        self.parent.import_asset(self.parent.sound_path)
+        
+        # Only touch the startup registry when the choice actually changed
+        if start_with_windows_changed:
+            self.parent.update_startup_registry()
+        
+        # Update theme
+        self.parent.apply_theme()
+        
+        # Save settings to file
+        self.parent.save_settings()
+        
+        # Show confirmation message
+        self.parent.show_custom_notification("✨ Settings saved successfully!", duration=2000)
+        
+        self.accept()
+
+class AboutDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.setWindowTitle("About")
+        self.setFixedSize(350, 200)
+        self.setObjectName("aboutDialog")  # Styled by the application theme
+        
+        layout = QVBoxLayout()
+        
+        # About information
+        self.about_text = QLabel()
+        self.about_text.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.about_text.setWordWrap(True)
+        
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
+        
+        layout.addWidget(self.about_text)
+        layout.addWidget(self.ok_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        
+        self.setLayout(layout)
+        self.refresh()
+    
+    def refresh(self):
+        parent = self.parent
+        self.about_text.setText(
+            f"<h2>Cat Companion</h2>"
+            f"<p>Version 1.1</p>"
+            f"<p>Created by {parent.creator_name}</p>"
+            f"<p>A cute companion to remind you to stay hydrated!</p>"
+        )
+
+class AchievementsDialog(QDialog):
+    ACHIEVEMENTS = [
+        ("first_sip", "First Sip", "Take your first sip with your cat companion"),
+        ("hydration_hero", "Hydration Hero", "Drink water 8+ times in a day"),
+        ("consistent_companion", "Consistent Companion", "Maintain a 7-day streak of drinking water"),
+        ("music_master", "Music Master", "Play 50 songs with your cat companion")
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.setWindowTitle("Achievements")
+        self.setMinimumWidth(400)
+        self.setMinimumHeight(500)
+        self.setObjectName("achievementsDialog")  # Styled by the application theme
+        
+        layout = QVBoxLayout()
+        layout.setSpacing(20)
+        layout.setContentsMargins(20, 20, 20, 20)
+        
+        # Add title
+        self.title_label = QLabel("Your Achievements")
+        self.title_label.setObjectName("dialogTitle")
+        self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.title_label)
+        
+        # Add each achievement; only the icons change between openings
+        self.icon_labels = {}
+        for key, title_text, description_text in self.ACHIEVEMENTS:
+            achievement_widget = QWidget()
+            achievement_layout = QHBoxLayout()
+            achievement_layout.setSpacing(10)
+            
+            # Icon
+            icon_label = QLabel()
+            icon_label.setObjectName("achievementIcon")
+            achievement_layout.addWidget(icon_label)
+            self.icon_labels[key] = icon_label
+            
+            # Text
+            text_widget = QWidget()
+            text_layout = QVBoxLayout()
+            text_layout.setSpacing(5)
+            
+            title = QLabel(title_text)
+            title.setObjectName("achievementTitle")
+            
+            description = QLabel(description_text)
+            description.setObjectName("achievementDescription")
+            description.setWordWrap(True)
+            
+            text_layout.addWidget(title)
+            text_layout.addWidget(description)
+            text_widget.setLayout(text_layout)
+            
+            achievement_layout.addWidget(text_widget)
+            achievement_widget.setLayout(achievement_layout)
+            layout.addWidget(achievement_widget)
+        
+        # Add close button
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignCenter)
+        
+        self.setLayout(layout)
+        self.refresh()
+    
+    def refresh(self):
+        parent = self.parent
+        for key, icon_label in self.icon_labels.items():
+            icon_label.setText("🏆" if parent.stats["achievements"][key] else "🔒")
+
+class DiagnosticsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.setWindowTitle("Diagnostics")
+        self.setMinimumWidth(460)
+        self.setObjectName("diagnosticsDialog")  # Styled by the application theme
+        
+        layout = QVBoxLayout()
+        
+        self.report = QLabel()
+        self.report.setTextFormat(Qt.TextFormat.RichText)
+        
+        buttons = QHBoxLayout()
+        save_button = QPushButton("Save JSON")
+        save_button.clicked.connect(self.parent.dump_diagnostics)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        buttons.addWidget(save_button)
+        buttons.addWidget(close_button)
+        
+        layout.addWidget(self.report)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+        
+        # Keep the numbers live while the dialog is open
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.parent.instrumentation.wrap("diagnostics_view", self.refresh))
+        self.refresh()
+    
+    def refresh(self):
+        instrumentation = self.parent.instrumentation
+        # Repaints and particle ticks are always counted
+        repaint = self.parent.repaint_summary()
+        repaint_line = (f"<p>{repaint['repainted_pixels_per_second']:,.0f} pixels/s repainted "
+                        f"({repaint['repainted_pixels_total']:,} in total), "
+                        f"{repaint['particle_wakeups']} particle clock ticks</p>")
+        if not instrumentation.enabled:
+            self.report.setText(repaint_line + "<p>Wakeup recording is off. Turn on <b>Record Wakeups</b> "
+                                "in the Diagnostics menu to start collecting.</p>")
+            return
+        
+        rows = "".join(
+            f"<tr><td>{source}</td><td align='right'>{entry['wakeups_per_second']:.2f}</td>"
+            f"<td align='right'>{entry['calls']}</td><td align='right'>{entry['mean_ms']:.2f}</td>"
+            f"<td align='right'>{entry['max_ms']:.2f}</td></tr>"
+            for source, entry in instrumentation.summary().items()
+        )
+        self.report.setText(
+            repaint_line +
+            f"<p>{instrumentation.wakeups_per_second():.2f} wakeups/s in total</p>"
+            f"<table cellspacing='6'><tr><th align='left'>Source</th><th>Wakeups/s</th>"
+            f"<th>Calls</th><th>Mean ms</th><th>Max ms</th></tr>{rows}</table>"
+        )
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start()
+    
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
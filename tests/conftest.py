@@ -0,0 +1,44 @@
+"""Shared fixtures: an offscreen QApplication and a companion running in a scratch directory"""
+import os
+import shutil
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS = ("cat.gif", "notification.mp3", "purr.mp3")
+sys.path.insert(0, REPO_ROOT)
+
+def process_events_for(app, seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # Settings, stats and caches are all written relative to the working directory
+    for asset in ASSETS:
+        shutil.copy(os.path.join(REPO_ROOT, asset), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+@pytest.fixture
+def companion(qapp, workdir):
+    import cat_companion
+    window = cat_companion.CatCompanion()
+    window.show()
+    deadline = time.perf_counter() + 10
+    while not window.startup_finished and time.perf_counter() < deadline:
+        qapp.processEvents()
+    yield window
+    window.cleanup_and_exit()
+    qapp.processEvents()
@@ -0,0 +1,62 @@
+from conftest import process_events_for
+
+class CoveredWindow:
+    """Stands in for a window handle hidden behind a full-screen app"""
+    def isExposed(self):
+        return False
+
+def assert_suspended_then_resumed(qapp, companion, suspend, resume):
+    gif = companion.gif
+    process_events_for(qapp, 0.3)
+    assert companion.animations_running
+    
+    suspend()
+    companion.update_animation_state()
+    assert not companion.animations_running
+    work, frame = gif.work_done(), gif.current_frame
+    process_events_for(qapp, 0.5)
+    assert gif.work_done() == work
+    assert gif.current_frame == frame
+    assert not gif.timer.isActive()
+    
+    resume()
+    process_events_for(qapp, 0.1)  # A shown window is exposed on the next event loop pass
+    companion.update_animation_state()
+    assert companion.animations_running
+    assert gif.timer.isActive()
+    process_events_for(qapp, 0.3)
+    assert companion.gif_work_while_suspended == 0
+
+def test_session_lock_stops_gif_work(qapp, companion):
+    monitor = companion.session_monitor
+    assert_suspended_then_resumed(qapp, companion, lambda: monitor.set_locked(True),
+                                  lambda: monitor.set_locked(False))
+
+def test_covered_window_stops_gif_work(qapp, companion, monkeypatch):
+    handle = companion.windowHandle
+    assert_suspended_then_resumed(qapp, companion,
+                                  lambda: monkeypatch.setattr(companion, "windowHandle", CoveredWindow),
+                                  lambda: monkeypatch.setattr(companion, "windowHandle", handle))
+
+def test_hidden_window_stops_gif_work(qapp, companion):
+    assert_suspended_then_resumed(qapp, companion, companion.hide, companion.show)
+
+def test_notifications_wait_while_suspended(qapp, companion):
+    notifications = companion.notifications
+    companion.show_custom_notification("showing", duration=400)
+    process_events_for(qapp, 0.1)
+    hold = notifications.slots[0]["hold"]
+    assert hold.isActive()
+    
+    companion.session_monitor.set_locked(True)
+    companion.show_custom_notification("queued while locked")
+    process_events_for(qapp, 0.6)  # Longer than the hold had left
+    assert not hold.isActive()
+    assert not notifications.pump_timer.isActive()
+    assert notifications.slots[0]["notification"]["text"] == "showing"
+    assert notifications.queue
+    
+    companion.session_monitor.set_locked(False)
+    assert hold.isActive()
+    process_events_for(qapp, 0.1)
+    assert not notifications.queue  # The queued one went to the free slot
@@ -0,0 +1,72 @@
+import os
+import shutil
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QImage, QImageReader
+
+from cat_companion import AssetStore, GifWriter
+from conftest import process_events_for
+
+def write_gif(path, width, height, colors):
+    writer = GifWriter(width, height)
+    for color in colors:
+        image = QImage(width, height, QImage.Format.Format_ARGB32)
+        image.fill(QColor(color))
+        writer.add_frame(image, 100)
+    with open(path, "wb") as f:
+        f.write(writer.finish())
+
+def test_gif_and_sound_imported_together_both_survive(qapp, companion, workdir):
+    write_gif(workdir / "picked.gif", 16, 16, ["red", "blue"])
+    shutil.copy(workdir / "notification.mp3", workdir / "picked.mp3")
+    companion.gif_path = str(workdir / "picked.gif")
+    companion.sound_path = str(workdir / "picked.mp3")
+    companion.import_asset(companion.gif_path)
+    companion.import_asset(companion.sound_path)
+    
+    for _ in range(100):
+        process_events_for(qapp, 0.05)
+        if not companion.pending_imports and all(future.done() for future in companion.asset_store.futures):
+            break
+    
+    for path in (companion.gif_path, companion.sound_path):
+        assert companion.asset_store.is_managed(path)
+        assert os.path.exists(path)
+
+def test_oversized_gif_shrinks_in_memory(qapp, tmp_path):
+    write_gif(tmp_path / "big.gif", 80, 60, ["red", "blue", "green"])
+    store = AssetStore(str(tmp_path / "assets"))
+    try:
+        stored, report = store.import_gif(str(tmp_path / "big.gif"), QSize(40, 40))
+    finally:
+        store.shutdown()
+    
+    assert report["stored_size"] == [40, 30]
+    assert report["stored_memory"] * 4 == report["source_memory"]
+    assert QImageReader(stored).size() == QSize(40, 30)
+    assert QImageReader(stored).imageCount() == 3
+
+def test_repeated_frames_are_dropped(qapp, tmp_path):
+    write_gif(tmp_path / "repeats.gif", 20, 20, ["red", "red", "red", "blue"])
+    store = AssetStore(str(tmp_path / "assets"))
+    try:
+        stored, report = store.import_gif(str(tmp_path / "repeats.gif"), QSize(40, 40))
+    finally:
+        store.shutdown()
+    
+    assert (report["source_frames"], report["stored_frames"]) == (4, 2)
+    assert report["stored_memory"] < report["source_memory"]
+    assert QImageReader(stored).imageCount() == 2
+
+def test_gif_that_already_fits_is_stored_unchanged(qapp, tmp_path):
+    write_gif(tmp_path / "small.gif", 20, 20, ["red", "blue"])
+    store = AssetStore(str(tmp_path / "assets"))
+    try:
+        stored, report = store.import_gif(str(tmp_path / "small.gif"), QSize(40, 40))
+    finally:
+        store.shutdown()
+    
+    assert report["stored_memory"] == report["source_memory"]
+    assert store.encoder is None  # Nothing was re-encoded
+    with open(stored, "rb") as a, open(tmp_path / "small.gif", "rb") as b:
+        assert a.read() == b.read()
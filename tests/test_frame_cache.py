@@ -0,0 +1,80 @@
+import os
+
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QImage
+
+from cat_companion import FrameCache
+
+def frames(width, height, colors):
+    images = []
+    for color in colors:
+        image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor(color))
+        images.append(image)
+    return images
+
+def test_store_maps_frames_back(qapp, tmp_path):
+    cache = FrameCache(str(tmp_path))
+    mapped = cache.store("abc", QSize(40, 30), 20, 15, 1.0, [70, 90], frames(20, 15, ["red", "blue"]))
+    
+    assert mapped is not None
+    assert len(mapped) == 2
+    assert mapped.delays == [70, 90]
+    assert mapped.image(0).pixelColor(5, 5) == QColor("red")
+    assert mapped.image(1).pixelColor(19, 14) == QColor("blue")
+    assert mapped.pixmap(1).devicePixelRatio() == 1.0
+    
+    described = cache.describe("abc")
+    assert described == {"source_size": QSize(40, 30), "delays": [70, 90]}
+
+def test_header_and_alignment(qapp, tmp_path):
+    cache = FrameCache(str(tmp_path))
+    cache.store("abc", QSize(40, 30), 20, 15, 2.0, [70, 90, 110], frames(20, 15, ["red"] * 3))
+    with open(cache.entry_path("abc", 20, 15, 2.0), "rb") as f:
+        fields, delays = cache.read_header(f)
+    
+    assert fields == (FrameCache.MAGIC, FrameCache.VERSION, 40, 30, 20, 15, 80, 3, 2.0)
+    assert delays == [70, 90, 110]
+    assert cache.data_offset(3) % FrameCache.ALIGNMENT == 0
+    assert os.path.getsize(cache.entry_path("abc", 20, 15, 2.0)) == cache.data_offset(3) + 3 * 15 * 80
+
+def test_truncated_entry_is_rejected(qapp, tmp_path):
+    cache = FrameCache(str(tmp_path))
+    cache.store("abc", QSize(40, 30), 20, 15, 1.0, [70, 90], frames(20, 15, ["red", "blue"]))
+    path = cache.entry_path("abc", 20, 15, 1.0)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 1)
+    
+    assert cache.open("abc", 20, 15, 1.0) is None
+
+def test_foreign_file_is_rejected(qapp, tmp_path):
+    cache = FrameCache(str(tmp_path))
+    with open(cache.entry_path("abc", 20, 15, 1.0), "wb") as f:
+        f.write(b"NOTFRAME" + b"\0" * 200)
+    
+    assert cache.open("abc", 20, 15, 1.0) is None
+    assert cache.describe("abc") is None
+
+def test_mismatched_frame_size_is_not_stored(qapp, tmp_path):
+    cache = FrameCache(str(tmp_path))
+    
+    assert cache.store("abc", QSize(40, 30), 20, 15, 1.0, [70], frames(10, 10, ["red"])) is None
+    assert os.listdir(tmp_path) == []
+
+def test_prune_drops_least_recently_used(qapp, tmp_path):
+    entry_bytes = FrameCache(str(tmp_path)).data_offset(1) + 16 * 16 * 4
+    cache = FrameCache(str(tmp_path), max_bytes=2 * entry_bytes)
+    for age, name in enumerate(["old", "middle"]):
+        cache.store(name, QSize(16, 16), 16, 16, 1.0, [100], frames(16, 16, ["red"]))
+        os.utime(cache.entry_path(name, 16, 16, 1.0), (1000 + age, 1000 + age))
+    
+    # The third entry pushes the directory over budget; the oldest goes, the new one stays
+    assert cache.store("new", QSize(16, 16), 16, 16, 1.0, [100], frames(16, 16, ["red"])) is not None
+    remaining = sorted(os.listdir(tmp_path))
+    assert remaining == [os.path.basename(cache.entry_path(name, 16, 16, 1.0)) for name in ("middle", "new")]
+
+def test_prune_keeps_entry_just_written(qapp, tmp_path):
+    cache = FrameCache(str(tmp_path), max_bytes=1)
+    
+    assert cache.store("abc", QSize(16, 16), 16, 16, 1.0, [100], frames(16, 16, ["red"])) is not None
+    assert os.path.exists(cache.entry_path("abc", 16, 16, 1.0))
@@ -0,0 +1,66 @@
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QImage
+
+from cat_companion import FrameCache, GifAnimation, GifWriter
+from conftest import process_events_for
+
+FRAMES = 12
+SIZE = QSize(30, 20)
+FRAME_BYTES = 30 * 20 * 4
+
+def write_gif(path):
+    writer = GifWriter(120, 80)
+    for index in range(FRAMES):
+        image = QImage(120, 80, QImage.Format.Format_ARGB32)
+        image.fill(QColor.fromHsv(index * 30, 255, 255))
+        writer.add_frame(image, 50)
+    with open(path, "wb") as f:
+        f.write(writer.finish())
+    return str(path)
+
+def play(qapp, gif, frames):
+    peak = 0
+    for step in range(frames):
+        assert gif.scaled_frame(step % FRAMES, SIZE) is not None
+        peak = max(peak, gif.cache_bytes)
+        assert gif.cache_bytes <= gif.max_cache_bytes
+    process_events_for(qapp, 0.2)  # Let the frame cache thread hand back the finished entry
+    return peak
+
+def test_sources_and_current_size_stay_under_cap(qapp, tmp_path):
+    gif = GifAnimation(write_gif(tmp_path / "cat.gif"), max_cache_bytes=4 * FRAME_BYTES)
+    gif.prepare()
+    
+    play(qapp, gif, 3 * FRAMES)
+    assert gif.frame_count == FRAMES
+    assert not gif.frames  # Each source goes once its frame is rendered
+    assert len(gif.variants[(30, 20, 1.0)]) <= 4
+
+def test_cache_larger_than_memory_still_reaches_disk(qapp, tmp_path):
+    path = write_gif(tmp_path / "cat.gif")
+    cache = FrameCache(str(tmp_path / "frame_cache"))
+    gif = GifAnimation(path, max_cache_bytes=4 * FRAME_BYTES, disk_cache=cache)
+    gif.prepare()
+    play(qapp, gif, 2 * FRAMES)
+    assert gif.mapped.get((30, 20, 1.0)) is not None
+    
+    # The next launch plays from the mapped file without decoding
+    replay = GifAnimation(path, max_cache_bytes=4 * FRAME_BYTES, disk_cache=cache)
+    replay.prepare()
+    assert play(qapp, replay, FRAMES) == 0
+    assert replay.frames_decoded == 0
+    reference = GifAnimation(path)
+    reference.prepare()
+    assert replay.scaled_frame(3, SIZE).toImage() == reference.scaled_frame(3, SIZE).toImage()
+
+def test_resize_abandons_partial_entry(qapp, tmp_path):
+    cache = FrameCache(str(tmp_path / "frame_cache"))
+    gif = GifAnimation(write_gif(tmp_path / "cat.gif"), disk_cache=cache)
+    gif.prepare()
+    for step in range(FRAMES + 3):
+        gif.scaled_frame(step % FRAMES, SIZE)
+    gif.scaled_frame(3, QSize(40, 30))
+    gif.abandon_writes()
+    cache.executor.submit(lambda: None).result()
+    
+    assert not list((tmp_path / "frame_cache").glob("*.tmp"))
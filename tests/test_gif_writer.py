@@ -0,0 +1,73 @@
+import random
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QColor, QImage, QImageReader
+
+from cat_companion import GifWriter
+
+def read_gif(data):
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    reader = QImageReader(buffer, b"gif")
+    loop_count = reader.loopCount()
+    frames = []
+    while True:
+        image = reader.read()
+        if image.isNull():
+            break
+        delay = reader.nextImageDelay()  # Belongs to the frame just read
+        frames.append((image.convertToFormat(QImage.Format.Format_ARGB32), delay))
+    return frames, loop_count
+
+def solid(width, height, rgba):
+    image = QImage(width, height, QImage.Format.Format_ARGB32)
+    image.fill(QColor(*rgba))
+    return image
+
+def test_frames_round_trip(qapp):
+    writer = GifWriter(8, 6)
+    writer.add_frame(solid(8, 6, (255, 0, 0, 255)), 80)
+    writer.add_frame(solid(8, 6, (0, 0, 255, 255)), 120)
+    frames, loop_count = read_gif(writer.finish())
+    
+    assert writer.frames == 2
+    assert loop_count == -1
+    assert [delay for _, delay in frames] == [80, 120]
+    assert frames[0][0].pixelColor(3, 3) == QColor(255, 0, 0)
+    assert frames[1][0].pixelColor(7, 5) == QColor(0, 0, 255)
+
+def test_transparent_pixels_survive(qapp):
+    image = solid(4, 4, (0, 255, 0, 255))
+    image.setPixelColor(1, 2, QColor(0, 0, 0, 0))
+    writer = GifWriter(4, 4)
+    writer.add_frame(image, 100)
+    (decoded, _), = read_gif(writer.finish())[0]
+    
+    assert decoded.pixelColor(1, 2).alpha() == 0
+    assert decoded.pixelColor(0, 0) == QColor(0, 255, 0)
+
+def test_loop_count_is_written(qapp):
+    for loop_count in (0, 3):
+        writer = GifWriter(2, 2, loop_count)
+        writer.add_frame(solid(2, 2, (0, 0, 0, 255)), 100)
+        assert read_gif(writer.finish())[1] == loop_count
+
+def test_lzw_table_reset_round_trips(qapp):
+    # Noise over 200 colours fills the 4096-entry code table several times
+    rng = random.Random(7)
+    palette = [QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(200)]
+    image = QImage(160, 120, QImage.Format.Format_ARGB32)
+    for y in range(image.height()):
+        for x in range(image.width()):
+            image.setPixelColor(x, y, rng.choice(palette))
+    writer = GifWriter(160, 120)
+    writer.add_frame(image, 100)
+    (decoded, _), = read_gif(writer.finish())[0]
+    
+    assert decoded.size() == image.size()
+    assert decoded == image.convertToFormat(QImage.Format.Format_ARGB32)
+
+def test_lzw_encode_single_index():
+    # Clear, the index and end, each 3 bits wide, packed least significant bit first
+    assert GifWriter.lzw_encode(b"\x01", 2) == bytes([0b01001100, 0b00000001])
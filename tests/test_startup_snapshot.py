@@ -0,0 +1,33 @@
+import json
+
+import cat_companion
+from conftest import process_events_for
+
+def launch(qapp):
+    window = cat_companion.CatCompanion()
+    restored = window.restored_geometry
+    window.show()
+    while not window.startup_finished:
+        qapp.processEvents()
+    process_events_for(qapp, 0.2)
+    window.cleanup_and_exit()
+    qapp.processEvents()
+    return restored
+
+def test_snapshot_restored_when_settings_name_a_missing_gif(qapp, workdir):
+    # Settings carried over from another machine; the bundled cat plays instead
+    with open("settings.json", "w") as f:
+        json.dump({"gif_path": "C:/Users/someone/Desktop/cat.gif"}, f)
+    
+    assert not launch(qapp)
+    assert launch(qapp)
+    assert launch(qapp)
+
+def test_snapshot_skipped_when_settings_name_another_gif(qapp, workdir):
+    assert not launch(qapp)
+    with open("settings.json", "w") as f:
+        json.dump({"gif_path": "other.gif"}, f)
+    with open("other.gif", "wb") as f:
+        f.write(open("cat.gif", "rb").read())
+    
+    assert not launch(qapp)
@@ -0,0 +1,47 @@
+from PyQt6.QtCore import QDate, QDateTime, QTime, Qt
+
+from cat_companion import StatsHistory
+
+TODAY = QDate(2026, 3, 10)
+
+def legacy_stats(streak=40, best_day=25):
+    return {
+        "daily": {"water_count": 2, "songs_played": 0, "date": TODAY.toString(Qt.DateFormat.ISODate)},
+        "weekly": {"water_count": [3, 4, 5, 6, 7, 8, 9], "songs_played": [0] * 7,
+                   "streak": streak, "best_day": best_day},
+    }
+
+def test_legacy_records_survive_the_upgrade():
+    history = StatsHistory.from_weekly(legacy_stats())
+    yesterday = TODAY.toJulianDay() - 1
+    
+    assert history.streaks("water", yesterday) == (40, 40)
+    assert history.best_day("water") == (25, None)
+
+def test_legacy_streak_keeps_growing():
+    history = StatsHistory.from_weekly(legacy_stats())
+    
+    # Today already has drinks, so it extends the run that started before the seeded week
+    assert history.streaks("water", TODAY.toJulianDay()) == (41, 41)
+
+def test_missed_day_ends_legacy_streak_but_not_the_record():
+    history = StatsHistory.from_weekly(legacy_stats())
+    history.record("water", QDateTime(TODAY.addDays(2), QTime(9, 0)))
+    
+    assert history.streaks("water", TODAY.toJulianDay() + 2) == (1, 41)
+
+def test_new_best_day_replaces_legacy_best():
+    history = StatsHistory.from_weekly(legacy_stats(best_day=5))
+    
+    assert history.best_day("water") == (9, TODAY.addDays(-1))
+
+def test_legacy_records_round_trip():
+    history = StatsHistory.from_json(StatsHistory.from_weekly(legacy_stats()).to_json())
+    
+    assert history.streaks("water", TODAY.toJulianDay() - 1) == (40, 40)
+    assert history.best_day("water") == (25, None)
+
+def test_short_legacy_streak_is_not_extended():
+    history = StatsHistory.from_weekly(legacy_stats(streak=3))
+    
+    assert history.streaks("water", TODAY.toJulianDay() - 1) == (7, 7)
@@ -0,0 +1,101 @@
+import json
+import os
+
+from cat_companion import StatsWriter
+
+class Counter:
+    """Minimal stats owner: the snapshot is just a running total"""
+    def __init__(self):
+        self.total = 0
+    
+    def snapshot(self):
+        return {"total": self.total}
+
+def make_writer(tmp_path, counter, **kwargs):
+    return StatsWriter(str(tmp_path / "stats.json"), counter.snapshot, **kwargs)
+
+def add(writer, counter, amount):
+    counter.total += amount
+    writer.append({"type": "water", "amount": amount})
+
+def replay(tmp_path):
+    reader = StatsWriter(str(tmp_path / "stats.json"), dict)
+    snapshot = reader.read_snapshot() or {"total": 0, "journal_seq": 0}
+    events = reader.read_journal(snapshot.get("journal_seq", 0))
+    total = snapshot["total"] + sum(event["amount"] for event in events)
+    reader.shutdown(final_snapshot=False)
+    return total, [event["seq"] for event in events], reader.seq
+
+def test_journal_replays_in_order(qapp, tmp_path):
+    counter = Counter()
+    writer = make_writer(tmp_path, counter)
+    for amount in (1, 2, 3):
+        add(writer, counter, amount)
+    writer.flush()
+    
+    assert replay(tmp_path) == (6, [1, 2, 3], 3)
+    assert not os.path.exists(tmp_path / "stats.json")
+    writer.shutdown(final_snapshot=False)
+
+def test_compaction_folds_earlier_events_only(qapp, tmp_path):
+    counter = Counter()
+    writer = make_writer(tmp_path, counter)
+    add(writer, counter, 1)
+    add(writer, counter, 2)
+    writer.compact()
+    add(writer, counter, 4)  # Queued behind the snapshot, so it lands in the fresh journal
+    writer.flush()
+    
+    with open(tmp_path / "stats.json") as f:
+        assert json.load(f) == {"total": 3, "journal_seq": 2}
+    assert replay(tmp_path) == (7, [3], 3)
+    writer.shutdown(final_snapshot=False)
+
+def test_size_threshold_triggers_compaction(qapp, tmp_path):
+    counter = Counter()
+    writer = make_writer(tmp_path, counter, compact_bytes=100)
+    for _ in range(10):
+        add(writer, counter, 1)
+    writer.flush()
+    
+    assert writer.writes >= 1
+    assert os.path.getsize(tmp_path / "stats.journal") < 100
+    assert replay(tmp_path)[0] == 10
+    writer.shutdown(final_snapshot=False)
+
+def test_events_already_in_snapshot_are_skipped(qapp, tmp_path):
+    # A crash between the snapshot rename and the journal truncation leaves both behind
+    with open(tmp_path / "stats.json", "w") as f:
+        json.dump({"total": 3, "journal_seq": 2}, f)
+    with open(tmp_path / "stats.journal", "w") as f:
+        for seq, amount in ((1, 1), (2, 2), (3, 4)):
+            f.write(json.dumps({"type": "water", "amount": amount, "seq": seq}) + "\n")
+    
+    assert replay(tmp_path) == (7, [3], 3)
+
+def test_torn_final_append_is_ignored(qapp, tmp_path):
+    with open(tmp_path / "stats.journal", "w") as f:
+        f.write(json.dumps({"type": "water", "amount": 1, "seq": 1}) + "\n")
+        f.write('{"type": "water", "amo')
+    
+    assert replay(tmp_path) == (1, [1], 1)
+
+def test_shutdown_writes_final_snapshot(qapp, tmp_path):
+    counter = Counter()
+    writer = make_writer(tmp_path, counter)
+    add(writer, counter, 5)
+    writer.shutdown()
+    
+    with open(tmp_path / "stats.json") as f:
+        assert json.load(f) == {"total": 5, "journal_seq": 1}
+    assert os.path.getsize(tmp_path / "stats.journal") == 0
+
+def test_final_flush_writes_in_place_after_shutdown(qapp, tmp_path):
+    counter = Counter()
+    writer = make_writer(tmp_path, counter)
+    writer.shutdown()
+    add(writer, counter, 2)  # A change that arrives after the executor has gone
+    writer.mark_dirty()
+    writer.final_flush()
+    
+    assert replay(tmp_path) == (2, [], 1)